@@ -0,0 +1,149 @@
+# backend/core/batch_matcher.py
+"""
+Vectorized matching of many business profiles against one ruleset.
+
+Profiles are encoded into NumPy feature columns (one column per condition
+attribute) and the ruleset into per-attribute acceptance tables and threshold
+vectors, so every (profile, rule) pair is evaluated with array comparisons
+instead of a Python loop per profile. Results are identical to calling
+`match_rules` on each profile separately.
+"""
+
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from backend.core.rule_conditions import evaluate_conditions
+from backend.core.ruleset import RuleSet
+
+# Upper bound on the size of one (profiles × rules) boolean block
+MAX_BLOCK_CELLS = 8_000_000
+
+_UNKNOWN_CODE = -1
+
+
+class _BatchPlan:
+    """NumPy encoding of a RuleSet's indexable conditions."""
+
+    def __init__(self, ruleset: RuleSet):
+        self.num_rules = len(ruleset)
+
+        indexed = np.ones(self.num_rules, dtype=bool)
+        indexed[ruleset.residual] = False
+        self.indexed = indexed
+
+        # eq / in: each distinct accepted value gets an integer code per attribute,
+        # and accepts[code, j] tells whether the j-th constrained rule accepts it.
+        # The extra last row (code -1) is the "value not accepted by any rule" row.
+        self.eq: List[tuple] = []
+        for attr, per_rule in ruleset.eq_conditions.items():
+            codes: Dict[Any, int] = {}
+            for accepted in per_rule.values():
+                for val in accepted:
+                    codes.setdefault(val, len(codes))
+            accepts = np.zeros((len(codes) + 1, len(per_rule)), dtype=bool)
+            for j, accepted in enumerate(per_rule.values()):
+                for val in accepted:
+                    accepts[codes[val], j] = True
+            cols = np.fromiter(per_rule.keys(), dtype=np.int64, count=len(per_rule))
+            self.eq.append((attr, codes, cols, accepts))
+
+        # Thresholds: profile value must be ≤ max limits and ≥ min limits
+        self.max = [(attr, *_threshold_vectors(per_rule)) for attr, per_rule in ruleset.max_conditions.items()]
+        self.min = [(attr, *_threshold_vectors(per_rule)) for attr, per_rule in ruleset.min_conditions.items()]
+
+
+def _threshold_vectors(per_rule: Dict[int, Any]) -> tuple:
+    cols = np.fromiter(per_rule.keys(), dtype=np.int64, count=len(per_rule))
+    thresholds = np.fromiter(per_rule.values(), dtype=np.float64, count=len(per_rule))
+    return cols, thresholds
+
+
+_PLANS: "weakref.WeakKeyDictionary[RuleSet, _BatchPlan]" = weakref.WeakKeyDictionary()
+
+
+def _plan_for(ruleset: RuleSet) -> _BatchPlan:
+    plan = _PLANS.get(ruleset)
+    if plan is None:
+        plan = _PLANS[ruleset] = _BatchPlan(ruleset)
+    return plan
+
+
+def _encode_codes(profiles: Sequence[Dict[str, Any]], attr: str, codes: Dict[Any, int]) -> np.ndarray:
+    """Encode one categorical profile attribute using the ruleset's value codes."""
+    encoded = np.full(len(profiles), _UNKNOWN_CODE, dtype=np.int64)
+    for i, profile in enumerate(profiles):
+        try:
+            encoded[i] = codes.get(profile.get(attr), _UNKNOWN_CODE)
+        except TypeError:  # unhashable profile value cannot equal a hashable condition
+            pass
+    return encoded
+
+
+def _encode_numbers(profiles: Sequence[Dict[str, Any]], attr: str) -> np.ndarray:
+    """Encode one numeric profile attribute; missing or non-numeric values become NaN."""
+    encoded = np.full(len(profiles), np.nan, dtype=np.float64)
+    for i, profile in enumerate(profiles):
+        value = profile.get(attr)
+        if isinstance(value, (int, float)):
+            encoded[i] = value
+    return encoded
+
+
+def _applicability(profiles: Sequence[Dict[str, Any]], ruleset: RuleSet, plan: _BatchPlan) -> np.ndarray:
+    """Return a (profiles × rules) boolean matrix of applicable rules."""
+    ok = np.tile(plan.indexed, (len(profiles), 1))
+
+    for attr, codes, cols, accepts in plan.eq:
+        values = _encode_codes(profiles, attr, codes)
+        ok[:, cols] &= accepts[values]
+
+    # NaN compares False, matching "missing value never satisfies a threshold"
+    for attr, cols, thresholds in plan.max:
+        values = _encode_numbers(profiles, attr)
+        ok[:, cols] &= values[:, None] <= thresholds[None, :]
+
+    for attr, cols, thresholds in plan.min:
+        values = _encode_numbers(profiles, attr)
+        ok[:, cols] &= values[:, None] >= thresholds[None, :]
+
+    for pos in ruleset.residual:
+        conditions = ruleset.conditions[pos]
+        for i, profile in enumerate(profiles):
+            ok[i, pos] = evaluate_conditions(profile, conditions)[0]
+
+    return ok
+
+
+def match_rules_batch(
+    profiles: Sequence[Dict[str, Any]],
+    rules: Union[List[Dict[str, Any]], RuleSet],
+    block_size: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Match many business profiles against the same ruleset in vectorized form.
+
+    Args:
+        profiles: Business profile dictionaries.
+        rules: List of compiled rule dictionaries, or a `RuleSet` built from them.
+        block_size: Profiles evaluated per NumPy block (derived from MAX_BLOCK_CELLS by default).
+
+    Returns:
+        One result dictionary per profile, in input order, as returned by `match_rules`.
+    """
+    ruleset = rules if isinstance(rules, RuleSet) else RuleSet(rules)
+    plan = _plan_for(ruleset)
+    profiles = list(profiles)
+
+    if block_size is None:
+        block_size = max(1, MAX_BLOCK_CELLS // max(1, plan.num_rules))
+
+    results = []
+    for start in range(0, len(profiles), block_size):
+        block = profiles[start:start + block_size]
+        ok = _applicability(block, ruleset, plan)
+        for profile, row in zip(block, ok):
+            results.append(ruleset.build_result(profile, np.flatnonzero(row).tolist()))
+
+    return results
@@ -0,0 +1,246 @@
+# backend/core/binary_store.py
+"""
+Compact binary storage for regdocs, compiled rulesets and match files.
+
+Each of these documents is one large list of records (regdoc sections,
+compiled rules, matches) plus a few scalar fields. The binary layout stores
+every record as its own compact UTF-8 JSON blob behind an offset table, so a
+memory-mapped file can hand out single records without parsing the rest:
+
+    magic      4 bytes   b"RSTB"
+    version    u32
+    count      u32       number of records
+    head_len   u32
+    head       head_len bytes: compact JSON {"key": <list field or null>,
+               "document": <document with the list replaced by null>,
+               "ids": [<record id>, ...]}
+    offsets    count × (u64 offset, u32 length), offsets from file start
+    records    concatenated compact JSON blobs
+
+All integers are little-endian. `json_to_binary` / `binary_to_json` convert
+to and from the existing JSON files; `load_document` reads either format.
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"RSTB"
+FORMAT_VERSION = 1
+BINARY_SUFFIX = ".rstb"
+
+_HEADER = struct.Struct("<4sIII")
+_OFFSET = struct.Struct("<QI")
+
+# Which list holds the records, per document shape
+_RECORD_KEYS = ("sections", "matches")
+
+PathLike = Union[str, Path]
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _split(document: Union[Dict[str, Any], List[Any]]) -> Tuple[Optional[str], Any, List[Any]]:
+    """Split a document into (record list key, document without records, records)."""
+    if isinstance(document, list):  # compiled_rules.json
+        return None, None, document
+    for key in _RECORD_KEYS:
+        if isinstance(document.get(key), list):
+            return key, {**document, key: None}, document[key]
+    return None, document, []
+
+
+def _record_id(record: Any) -> Optional[str]:
+    if isinstance(record, dict):
+        for field in ("id", "rule_id"):
+            if field in record:
+                return str(record[field])
+    return None
+
+
+def write_binary(document: Union[Dict[str, Any], List[Any]], path: PathLike) -> Path:
+    """
+    Write a regdoc, compiled ruleset or match result in the binary layout.
+
+    Args:
+        document: The document, as it would be written to JSON.
+        path: Destination file.
+
+    Returns:
+        The destination path.
+    """
+    key, rest, records = _split(document)
+    blobs = [_dumps(record) for record in records]
+    head = _dumps({"key": key, "document": rest, "ids": [_record_id(r) for r in records]})
+
+    offset = _HEADER.size + len(head) + _OFFSET.size * len(blobs)
+    table = bytearray()
+    for blob in blobs:
+        table += _OFFSET.pack(offset, len(blob))
+        offset += len(blob)
+
+    path = Path(path)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(blobs), len(head)))
+        f.write(head)
+        f.write(table)
+        for blob in blobs:
+            f.write(blob)
+    return path
+
+
+def is_binary(path: PathLike) -> bool:
+    """Whether a file starts with the binary store magic."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class BinaryStore:
+    """
+    Memory-mapped reader of a binary store file; records are decoded on access.
+
+    Usage:
+        with BinaryStore("reg.rstb") as store:
+            store.document["docId"], len(store), store[3], store.get("1.2")
+
+    Args:
+        path: Path of the binary file.
+
+    Raises:
+        ValueError: If the file is not in the binary store format.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"❌ Not a binary store file: {self.path}")
+
+        magic, version, count, head_len = _HEADER.unpack_from(self._mm, 0) \
+            if len(self._mm) >= _HEADER.size else (b"", 0, 0, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"❌ Not a binary store file (version {FORMAT_VERSION}): {self.path}")
+
+        head = json.loads(self._mm[_HEADER.size:_HEADER.size + head_len].decode("utf-8"))
+        self.key: Optional[str] = head["key"]
+        self.document: Any = head["document"]
+        self.ids: List[Optional[str]] = head["ids"]
+        self._count = count
+        self._table = _HEADER.size + head_len
+        self._positions: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Any:
+        """Decode the record at `index`."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        offset, length = _OFFSET.unpack_from(self._mm, self._table + index * _OFFSET.size)
+        return json.loads(self._mm[offset:offset + length].decode("utf-8"))
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(self._count):
+            yield self[index]
+
+    def get(self, record_id: str) -> Any:
+        """
+        Decode the first record with the given id (section id, rule id or match rule_id).
+
+        Raises:
+            KeyError: If no record has this id.
+        """
+        if self._positions is None:
+            self._positions = {}
+            for index, rid in enumerate(self.ids):
+                self._positions.setdefault(rid, index)
+        if record_id not in self._positions:
+            raise KeyError(record_id)
+        return self[self._positions[record_id]]
+
+    def materialize(self) -> Union[Dict[str, Any], List[Any]]:
+        """Decode the whole document, identical to the JSON it was converted from."""
+        records = list(self)
+        if self.document is None:
+            return records
+        if self.key is None:
+            return dict(self.document)
+        return {**self.document, self.key: records}
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "BinaryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_document(path: PathLike) -> Union[Dict[str, Any], List[Any]]:
+    """
+    Load a regdoc, compiled ruleset or match file from JSON or the binary layout.
+
+    Args:
+        path: Path of the file (format detected from its first bytes).
+
+    Returns:
+        The decoded document.
+    """
+    if is_binary(path):
+        with BinaryStore(path) as store:
+            return store.materialize()
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def json_to_binary(json_path: PathLike, binary_path: Optional[PathLike] = None) -> Path:
+    """
+    Convert a JSON regdoc / compiled ruleset / match file to the binary layout.
+
+    Args:
+        json_path: Source JSON file.
+        binary_path: Destination (defaults to the source path with BINARY_SUFFIX).
+
+    Returns:
+        The destination path.
+    """
+    json_path = Path(json_path)
+    with open(json_path, encoding="utf-8") as f:
+        document = json.load(f)
+    return write_binary(document, binary_path or json_path.with_suffix(BINARY_SUFFIX))
+
+
+def binary_to_json(binary_path: PathLike, json_path: Optional[PathLike] = None) -> Path:
+    """
+    Convert a binary store file back to JSON (written like the original files, indent=2).
+
+    Args:
+        binary_path: Source binary file.
+        json_path: Destination (defaults to the source path with a .json suffix).
+
+    Returns:
+        The destination path.
+    """
+    binary_path = Path(binary_path)
+    json_path = Path(json_path or binary_path.with_suffix(".json"))
+    with BinaryStore(binary_path) as store:
+        document = store.materialize()
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    return json_path
@@ -0,0 +1,223 @@
+# backend/core/document_registry.py
+"""
+Persistent registry of ingested regulation documents, addressed by doc id and version.
+
+Regulation documents are ingested once (extracted, parsed and indexed) and
+stored as numbered versions:
+
+    <root>/registry.json            {doc_id: {"title", "versions": [...]}}
+    <root>/<doc_id>/v<N>.json       regdoc of version N (+ v<N>.features.json)
+
+Registering a source whose content is identical to the latest version is a
+no-op; changed content becomes version N+1. Writers (the API and CLI / batch
+processes) serialize on a file lock and replace registry.json atomically.
+Pipeline requests reference a document by `doc_id` (and optionally `version`)
+and only match and report against the stored regdoc, loaded through the
+in-memory `REGDOC_REGISTRY`.
+
+Usage:
+    record = DOCUMENT_REGISTRY.register("data/rew/18-07-2022_4.2A.pdf", "reg-4.2A-2022", "בית אוכל")
+    loaded = DOCUMENT_REGISTRY.load("reg-4.2A-2022")          # latest version
+    path = DOCUMENT_REGISTRY.resolve("reg-4.2A-2022", 1)["regdoc_path"]
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from backend.core.binary_store import load_document
+from backend.core.file_cache import file_sha256
+from backend.core.regdoc_features import save_regdoc
+from backend.core.regdoc_ingest import diff_regdocs
+from backend.core.regdoc_registry import REGDOC_REGISTRY, LoadedRegdoc
+from backend.core.regulation_parser import PARSER_VERSION, parse_to_json
+from backend.scripts.extract_regulations import iter_pages
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DOCUMENTS_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "documents"
+REGISTRY_NAME = "registry.json"
+LOCK_NAME = "registry.lock"
+
+# Starts with a letter or digit, so "." / ".." (or hidden names) cannot escape or clutter the root
+_DOC_ID = re.compile(r"^[A-Za-z0-9][\w.\-]*$")
+
+
+class DocumentRegistry:
+    """
+    Registry of regulation documents stored under `root`.
+
+    Args:
+        root: Directory of the registry file and the stored regdoc versions.
+    """
+
+    def __init__(self, root: PathLike = DOCUMENTS_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold the registry lock: a thread lock within this process plus an OS file
+        lock on `registry.lock`, shared with the CLI / batch processes.
+        """
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / LOCK_NAME, "a+b") as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                    else:
+                        f.seek(0)
+                        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.root / REGISTRY_NAME, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, documents: Dict[str, Any]) -> None:
+        """Replace the registry file atomically."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".registry-", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(documents, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.root / REGISTRY_NAME)
+
+    def register(self, source_path: PathLike, doc_id: str, title: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ingest a regulation document as the next version of `doc_id`, unless its content is unchanged.
+
+        Args:
+            source_path: PDF/DOCX source, or an already parsed regdoc (.json / binary store).
+            doc_id: Document identifier (letters, digits, '.', '_' and '-', starting with a letter or digit).
+            title: Document title (defaults to the title of the previous version, else the file stem).
+
+        Returns:
+            The version record, with 'status' "registered" or "unchanged".
+
+        Raises:
+            ValueError: If the doc id is not valid, or a parsed source is not a regdoc (no 'sections').
+            FileNotFoundError: If the source does not exist.
+        """
+        if not _DOC_ID.match(doc_id) or ".." in doc_id:
+            raise ValueError(f"❌ Invalid doc id: {doc_id!r}")
+        source_path = Path(source_path)
+        source_sha256 = file_sha256(source_path)
+
+        with self._locked():
+            documents = self._read()
+            document = documents.setdefault(doc_id, {"title": title or source_path.stem, "versions": []})
+            title = title or document["title"]
+            latest = document["versions"][-1] if document["versions"] else None
+            if (latest and latest["source_sha256"] == source_sha256
+                    and latest["parser_version"] == PARSER_VERSION and latest["title"] == title):
+                logger.info(f"♻️ {doc_id} v{latest['version']} is up to date")
+                return {**latest, "status": "unchanged"}
+
+            if source_path.suffix.lower() in (".pdf", ".docx"):
+                regdoc = parse_to_json(iter_pages(source_path), doc_id=doc_id, title=title)
+            else:
+                loaded = load_document(source_path)
+                if not isinstance(loaded, dict) or not isinstance(loaded.get("sections"), list):
+                    raise ValueError(f"❌ Not a regdoc (no 'sections' list): {source_path}")
+                regdoc = {**loaded, "docId": doc_id, "title": title}
+
+            version = latest["version"] + 1 if latest else 1
+            regdoc_path = self.root / doc_id / f"v{version}.json"
+            regdoc_path.parent.mkdir(parents=True, exist_ok=True)
+            save_regdoc(regdoc, regdoc_path)
+
+            changes = diff_regdocs(load_document(latest["regdoc_path"]) if latest else {}, regdoc)
+            record = {
+                "version": version,
+                "title": title,
+                "source_path": str(source_path.resolve()),
+                "source_sha256": source_sha256,
+                "parser_version": PARSER_VERSION,
+                "regdoc_path": str(regdoc_path),
+                "ingested_at": datetime.now().isoformat(timespec="seconds"),
+                "changes": {key: len(changes[key]) for key in ("added", "removed", "modified")},
+            }
+            document["title"] = title
+            document["versions"].append(record)
+            self._write(documents)
+
+        logger.info(f"✅ Registered {doc_id} v{version}: {regdoc_path}")
+        return {**record, "status": "registered"}
+
+    def resolve(self, doc_id: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Return the record of a document version.
+
+        Args:
+            doc_id: Document identifier.
+            version: Version number (latest if None).
+
+        Returns:
+            The version record (with 'regdoc_path').
+
+        Raises:
+            KeyError: If the document or version is not registered.
+        """
+        document = self._read().get(doc_id)
+        if not document or not document["versions"]:
+            raise KeyError(f"Unknown document: {doc_id}")
+        if version is None:
+            return document["versions"][-1]
+        for record in document["versions"]:
+            if record["version"] == version:
+                return record
+        raise KeyError(f"Unknown version {version} of document {doc_id}")
+
+    def load(self, doc_id: str, version: Optional[int] = None) -> LoadedRegdoc:
+        """
+        Return the parsed, indexed regdoc of a document version from the shared `REGDOC_REGISTRY`.
+
+        Args:
+            doc_id: Document identifier.
+            version: Version number (latest if None).
+
+        Returns:
+            The loaded regdoc.
+
+        Raises:
+            KeyError: If the document or version is not registered.
+        """
+        return REGDOC_REGISTRY.get(self.resolve(doc_id, version)["regdoc_path"])
+
+    def documents(self) -> List[Dict[str, Any]]:
+        """List the registered documents with their title, latest version and all versions."""
+        return [
+            {"doc_id": doc_id, "title": document["title"],
+             "latest_version": document["versions"][-1]["version"], "versions": document["versions"]}
+            for doc_id, document in sorted(self._read().items())
+            if document["versions"]
+        ]
+
+
+DOCUMENT_REGISTRY = DocumentRegistry()
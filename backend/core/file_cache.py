@@ -0,0 +1,177 @@
+# backend/core/file_cache.py
+"""
+Thread-safe in-process cache for objects derived from files on disk.
+
+Each entry is keyed by the absolute file path and remembers the file's
+(mtime, size) signature at load time. A lookup only costs an `os.stat`; the file
+is re-read only when the signature changes, and even then the expensive loader
+is skipped if the content hash turns out to be identical (e.g. a `touch`).
+
+With `max_bytes` set, the cache is bounded: every entry is weighed with
+`sizeof(value)` when loaded and the least recently used entries are evicted
+once the total exceeds the budget.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+class _Entry:
+    __slots__ = ("signature", "digest", "value", "size", "lock")
+
+    def __init__(self):
+        self.signature: Optional[Tuple[int, int]] = None
+        self.digest: Optional[str] = None
+        self.value: Any = None
+        self.size = 0
+        self.lock = threading.Lock()
+
+
+def file_sha256(path: PathLike) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class FileCache:
+    """
+    Cache of `loader(path)` results, revalidated against the file's mtime/size.
+
+    Args:
+        loader: Callable that turns a file path into the cached object.
+        name: Label used in `stats()` output.
+        max_bytes: Memory budget for cached objects (unbounded if None).
+        sizeof: Callable estimating the memory size of a cached object
+            (defaults to the size of the source file).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        name: str = "cache",
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.loader = loader
+        self.name = name
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        # Least recently used first
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+
+    def get(self, path: PathLike) -> Any:
+        """
+        Return the cached object for `path`, loading or reloading it if needed.
+
+        Args:
+            path: Path of the source file.
+
+        Returns:
+            The object produced by the loader for the current file content.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        key = os.path.abspath(path)
+        signature = _signature(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            self._entries.move_to_end(key)
+
+        # Per-entry lock: concurrent requests for the same file wait for a
+        # single load instead of all parsing it in parallel.
+        with entry.lock:
+            if entry.signature == signature:
+                with self._lock:
+                    self._hits += 1
+                return entry.value
+
+            with open(key, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+
+            if entry.digest == digest:
+                # Timestamp changed but the content did not – keep the parsed value
+                entry.signature = signature
+                with self._lock:
+                    self._revalidations += 1
+                return entry.value
+
+            entry.value = self.loader(key)
+            entry.digest = digest
+            entry.signature = signature
+            size = self.sizeof(entry.value) if self.sizeof else len(raw)
+            with self._lock:
+                self._misses += 1
+                if self._entries.get(key) is entry:
+                    self._bytes += size - entry.size
+                    entry.size = size
+                    self._evict(keep=key)
+            return entry.value
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used entries until the cache fits its budget (lock held)."""
+        if self.max_bytes is None:
+            return
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            self._bytes -= entry.size
+            if entry.signature is not None:
+                self._evictions += 1
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """
+        Drop one entry, or the whole cache when no path is given.
+
+        Args:
+            path: Path of the entry to drop (optional).
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                entry = self._entries.pop(os.path.abspath(path), None)
+                if entry is not None:
+                    self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters, the number of cached entries and their size."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": sum(1 for e in self._entries.values() if e.signature is not None),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "revalidations": self._revalidations,
+                "evictions": self._evictions,
+            }
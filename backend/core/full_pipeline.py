@@ -1,16 +1,52 @@
 # backend/core/full_pipeline.py
+"""
+The four-stage regulatory pipeline, run as a stage graph (see stage_graph):
 
+    regulation ─┐
+                ├─> match ──> report
+    profile ────┘
+
+Stages hand their outputs to each other in memory: the profile can be
+passed as a dict, the matches go straight to the report stage and the report
+text is returned to the caller. By default a run checkpoints each stage's
+output under <output_dir>/runs/<run_id>/, so a failed run can be resumed
+(e.g. retry only the LLM report) and run.json records per-stage wall/CPU
+timings; `checkpoint=False` keeps everything in memory.
+
+The legacy match file (<output_dir>/matches/match_<run_id>.json) and report
+file (REPORT_DIR/report_<run_id>.txt) are optional side outputs
+(`save_outputs`), written after the run and never read back by the pipeline.
+
+`arun_pipeline` is the asyncio variant used by the API: extraction, parsing
+and matching run in an executor and the LLM call is awaited, so one event
+loop can keep many report requests in flight. Its side outputs are written
+in the background, after the result has been returned, unless the caller
+needs the files to exist on return (`background_saves=False`).
+"""
+
+import asyncio
+import logging
 import uuid
+from concurrent.futures import Executor
 from datetime import datetime
 from pathlib import Path
 import json
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from pydantic import BaseModel
 
-from backend.core.regulation_parser import parse_to_json
-from backend.core.regulation_parser import convert_to_json
+from backend.core.document_registry import DOCUMENT_REGISTRY
+from backend.core.source_cache import source_cache_for
+from backend.core.stage_graph import Stage, StageFailed, StageGraph, read_run
+from backend.core.matcher_from_regdoc import iter_regdoc_matches
+from backend.core.report_generator import agenerate_llm_report, generate_llm_report
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("regulation", "profile", "match", "report")
+
+REPORT_DIR = Path("C:/Users/eyals/MyProjects/A-Impact/data/report")
 
-from backend.scripts.extract_regulations import extract_text
-from backend.core.matcher import run_full_match
-from backend.core.report_generator import generate_report
 
 def generate_run_id() -> str:
     """Generate a unique run ID based on timestamp and UUID suffix"""
@@ -21,86 +57,296 @@ def load_profile(profile_path: str) -> dict:
     with open(profile_path, encoding="utf-8") as f:
         return json.load(f)
 
-def run_pipeline(profile_path: str, source_doc_path: str, output_dir: str = "data"):
+
+# === Stage outputs ===
+class RegulationOutput(BaseModel):
+    regdoc_path: str
+    doc_id: Optional[str] = None
+    version: Optional[int] = None
+
+
+class ProfileOutput(BaseModel):
+    profile: Dict[str, Any]
+
+
+class MatchOutput(BaseModel):
+    matches: List[Dict[str, Any]]
+
+
+class ReportOutput(BaseModel):
+    report_text: str
+
+
+class PipelineResult(BaseModel):
+    """What a pipeline run returns; the file paths are set when side outputs are saved."""
+    run_id: str
+    profile: Dict[str, Any]
+    matches: List[Dict[str, Any]]
+    report_text: str
+    match_file: Optional[str] = None
+    report_path: Optional[str] = None
+
+
+# === Stages ===
+def regulation_stage(params: Dict[str, Any], deps: Dict[str, BaseModel]) -> RegulationOutput:
+    """Step 1 – Extract and convert the regulation document (skipped if registered or already cached)."""
+    doc_id = params.get("doc_id")
+    if doc_id is not None:
+        record = DOCUMENT_REGISTRY.resolve(doc_id, params.get("version"))
+        print(f"\n📚 Step 1: Using registered regulation {doc_id} v{record['version']}:\n👉 {record['regdoc_path']}")
+        return RegulationOutput(regdoc_path=record["regdoc_path"], doc_id=doc_id, version=record["version"])
+
+    source_doc_path = params["source_doc_path"]
+    print(f"\n🔎 Step 1: Extracting regulation from PDF:\n👉 {source_doc_path}")
+    cached = source_cache_for(Path(params["output_dir"]) / "cache" / "sources").get_or_build(source_doc_path)
+    if cached.hit:
+        print(f"♻️ Using cached regulation JSON: {cached.regdoc_path}")
+    else:
+        print(f"✅ Regulation JSON saved to: {cached.regdoc_path}")
+    return RegulationOutput(regdoc_path=str(cached.regdoc_path))
+
+
+def profile_stage(params: Dict[str, Any], deps: Dict[str, BaseModel]) -> ProfileOutput:
+    """Step 2 – Take the inline user profile, or load it from its file."""
+    if params.get("profile") is not None:
+        profile = params["profile"]
+        print(f"\n👤 Step 2: Using inline user profile")
+    else:
+        print(f"\n👤 Step 2: Loading user profile from:\n👉 {params['profile_path']}")
+        profile = load_profile(params["profile_path"])
+    print(f"✅ Loaded profile with keys: {list(profile.keys())}")
+    return ProfileOutput(profile=profile)
+
+
+def match_stage(params: Dict[str, Any], deps: Dict[str, BaseModel]) -> MatchOutput:
+    """Step 3 – Match the profile against the regulation."""
+    print(f"\n⚙️ Step 3: Running rule matching engine...")
+    matches = list(iter_regdoc_matches(deps["profile"].profile, deps["regulation"].regdoc_path))
+    print(f"✅ Matcher completed: {len(matches)} matches.")
+    return MatchOutput(matches=matches)
+
+
+def report_stage(params: Dict[str, Any], deps: Dict[str, BaseModel]) -> ReportOutput:
+    """Step 4 – Generate the final report."""
+    print(f"\n📝 Step 4: Generating final compliance report...")
+    report_text = generate_llm_report(profile=deps["profile"].profile, rules=deps["match"].matches)
+    print("✅ Report generated.")
+    return ReportOutput(report_text=report_text)
+
+
+async def areport_stage(params: Dict[str, Any], deps: Dict[str, BaseModel]) -> ReportOutput:
+    """Step 4 – Generate the final report (async LLM call)."""
+    print(f"\n📝 Step 4: Generating final compliance report...")
+    report_text = await agenerate_llm_report(profile=deps["profile"].profile, rules=deps["match"].matches)
+    print("✅ Report generated.")
+    return ReportOutput(report_text=report_text)
+
+
+PIPELINE = StageGraph([
+    Stage("regulation", RegulationOutput, regulation_stage),
+    Stage("profile", ProfileOutput, profile_stage),
+    Stage("match", MatchOutput, match_stage, depends_on=["regulation", "profile"]),
+    Stage("report", ReportOutput, report_stage, depends_on=["profile", "match"], arun=areport_stage),
+])
+
+
+def run_dir_for(output_dir: str, run_id: str) -> Path:
+    """Directory of a run's checkpoints and summary."""
+    return Path(output_dir) / "runs" / run_id
+
+
+def _prepare_run(
+    profile_path: Optional[str],
+    profile: Optional[Dict[str, Any]],
+    source_doc_path: Optional[str],
+    output_dir: str,
+    doc_id: Optional[str],
+    version: Optional[int],
+    run_id: Optional[str]
+) -> Dict[str, Any]:
+    """Validate the arguments and return the run parameters."""
+    if (source_doc_path is None) == (doc_id is None):
+        raise ValueError("❌ Pass exactly one of source_doc_path and doc_id")
+    if (profile_path is None) == (profile is None):
+        raise ValueError("❌ Pass exactly one of profile_path and profile")
+
+    run_id = run_id or generate_run_id()
+    print(f"\n🚀 Starting pipeline run: {run_id}")
+    print(f"📁 Output base directory: {output_dir}")
+
+    return {
+        "run_id": run_id,
+        "profile_path": None if profile_path is None else str(profile_path),
+        "profile": profile,
+        "source_doc_path": None if source_doc_path is None else str(source_doc_path),
+        "doc_id": doc_id,
+        "version": version,
+        "output_dir": str(output_dir),
+    }
+
+
+def _result(params: Dict[str, Any], outputs: Dict[str, BaseModel], save_outputs: bool) -> PipelineResult:
+    result = PipelineResult(
+        run_id=params["run_id"],
+        profile=outputs["profile"].profile,
+        matches=outputs["match"].matches,
+        report_text=outputs["report"].report_text,
+    )
+    if save_outputs:
+        result.match_file = str(Path(params["output_dir"]) / "matches" / f"match_{result.run_id}.json")
+        result.report_path = str((REPORT_DIR / f"report_{result.run_id}.txt").resolve())
+    print("\n🎉 Pipeline completed successfully.")
+    return result
+
+
+def write_outputs(result: PipelineResult) -> None:
+    """Write the match file and report file of a result (at its `match_file` / `report_path`)."""
+    if result.match_file is not None:
+        Path(result.match_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(result.match_file, "w", encoding="utf-8") as f:
+            json.dump({"profile": result.profile, "matches": result.matches, "total_matches": len(result.matches)},
+                      f, ensure_ascii=False, indent=2)
+        print(f"📄 Match file saved to: {result.match_file}")
+    if result.report_path is not None:
+        Path(result.report_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(result.report_path).write_text(result.report_text, encoding="utf-8")
+        print(f"📑 Report saved to: {result.report_path}")
+
+
+# Background side-output writes of `arun_pipeline`, referenced until done
+_PENDING_SAVES: Set[asyncio.Task] = set()
+
+
+def _save_in_background(result: PipelineResult) -> None:
+    def done(task: asyncio.Task) -> None:
+        _PENDING_SAVES.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Saving the outputs of run {result.run_id} failed: {task.exception()}")
+
+    task = asyncio.create_task(asyncio.to_thread(write_outputs, result))
+    _PENDING_SAVES.add(task)
+    task.add_done_callback(done)
+
+
+async def wait_for_saves() -> None:
+    """Wait until the side outputs of finished `arun_pipeline` calls are written."""
+    while _PENDING_SAVES:
+        await asyncio.gather(*_PENDING_SAVES, return_exceptions=True)
+
+
+def run_pipeline(
+    profile_path: str = None,
+    source_doc_path: str = None,
+    output_dir: str = "data",
+    doc_id: str = None,
+    version: int = None,
+    run_id: str = None,
+    resume_from: str = None,
+    on_stage: Optional[Callable[[str], None]] = None,
+    profile: Dict[str, Any] = None,
+    save_outputs: bool = True,
+    checkpoint: bool = True
+) -> PipelineResult:
     """
     Run the full regulatory pipeline:
-    1. Extract regulation from source document
-    2. Load user profile
+    1. Extract regulation from source document (cached per source content, see source_cache),
+       or use a registered document given by `doc_id` / `version` (see document_registry)
+    2. Load user profile (from `profile_path`, or passed in memory as `profile`)
     3. Match relevant rules
     4. Generate final report
+
+    Passing the `run_id` of an earlier run reuses its checkpointed stages;
+    `resume_from` (one of STAGES) re-runs that stage and everything after it.
+    `on_stage` is called with each stage's name before it runs (see StageGraph.run).
+    With `save_outputs`, the match and report files are written before returning.
+    Without `checkpoint`, no stage output is written and the run cannot be resumed.
     """
-    run_id = generate_run_id()
-    print(f"\n🚀 Starting pipeline run: {run_id}")
-    print(f"📁 Output base directory: {output_dir}")
-    
-    output_dir = Path(output_dir)
-    processed_dir = output_dir / "processed"
-    matches_dir = output_dir / "matches"
-    report_dir = Path("C:/Users/eyals/MyProjects/A-Impact/data/report")
+    params = _prepare_run(profile_path, profile, source_doc_path, output_dir, doc_id, version, run_id)
+    run_dir = run_dir_for(output_dir, params["run_id"]) if checkpoint else None
+    try:
+        outputs = PIPELINE.run(run_dir, params, resume_from=resume_from, on_stage=on_stage)
+    except StageFailed as e:
+        print(e)
+        raise e.error
+    result = _result(params, outputs, save_outputs)
+    if save_outputs:
+        write_outputs(result)
+    return result
 
 
-    # Ensure directories exist
-    for dir_path in [processed_dir, matches_dir, report_dir]:
-        dir_path.mkdir(parents=True, exist_ok=True)
-        print(f"📂 Ensured directory exists: {dir_path}")
+async def arun_pipeline(
+    profile_path: str = None,
+    source_doc_path: str = None,
+    output_dir: str = "data",
+    doc_id: str = None,
+    version: int = None,
+    run_id: str = None,
+    resume_from: str = None,
+    executor: Optional[Executor] = None,
+    profile: Dict[str, Any] = None,
+    save_outputs: bool = True,
+    checkpoint: bool = True,
+    background_saves: bool = True
+) -> PipelineResult:
+    """
+    Async variant of `run_pipeline` (same arguments and checkpoints).
 
-    # Step 1 – Extract and convert regulation document
-    print(f"\n🔎 Step 1: Extracting regulation from PDF:\n👉 {source_doc_path}")
+    The CPU-bound stages run in `executor` (the loop's default thread pool if
+    None) and the report's LLM call uses LangChain's `ainvoke`. With
+    `save_outputs`, the match and report files are written in the background
+    (see `wait_for_saves`) and the result already carries their paths; with
+    `background_saves=False` they are written (off the loop) before returning.
+    """
+    params = _prepare_run(profile_path, profile, source_doc_path, output_dir, doc_id, version, run_id)
+    run_dir = run_dir_for(output_dir, params["run_id"]) if checkpoint else None
     try:
-        text = extract_text(source_doc_path)
-        print(f"✅ Extracted {len(text)} characters from regulation document.")
-    except Exception as e:
-        print(f"❌ Failed to extract text from PDF: {e}")
-        raise
+        outputs = await PIPELINE.arun(run_dir, params, resume_from=resume_from, executor=executor)
+    except StageFailed as e:
+        print(e)
+        raise e.error
+    result = _result(params, outputs, save_outputs)
+    if save_outputs and background_saves:
+        _save_in_background(result)
+    elif save_outputs:
+        await asyncio.to_thread(write_outputs, result)
+    return result
 
-    reg_json_path = processed_dir / f"reg_{run_id}.json"
-    try:
-        convert_to_json(text, output_path=str(reg_json_path))
-        print(f"✅ Regulation JSON saved to: {reg_json_path}")
-    except Exception as e:
-        print(f"❌ Failed to convert text to JSON: {e}")
-        raise
-
-    # Step 2 – Load user profile
-    print(f"\n👤 Step 2: Loading user profile from:\n👉 {profile_path}")
-    try:
-        profile = load_profile(profile_path)
-        print(f"✅ Loaded profile with keys: {list(profile.keys())}")
-    except Exception as e:
-        print(f"❌ Failed to load profile: {e}")
-        raise
 
-    # Step 3 – Run matcher
-    print(f"\n⚙️ Step 3: Running rule matching engine...")
-    try:
-        match_result = run_full_match(
-            profile=profile,
-            profile_id=run_id,
-            use_regdoc=True,
-            regdoc_path=str(reg_json_path)
-        )
-        print("✅ Matcher completed.")
-    except Exception as e:
-        print(f"❌ Matcher failed: {e}")
-        raise
-
-    match_file = match_result.get("match_file", str(matches_dir / f"match_{run_id}.json"))
-    print(f"📄 Match file path: {match_file}")
-
-    # Step 4 – Generate report
-    print(f"\n📝 Step 4: Generating final compliance report...")
-    try:
-        report_path = generate_report(
-            match_file_path=match_file,
-            output_dir=str(report_dir)
-        )
-        report_path = Path(report_path).resolve() 
-        print(f"✅ Report generated at: {report_path}")
-    except Exception as e:
-        print(f"❌ Report generation failed: {e}")
-        raise
+def _resume_args(run_id: str, resume_from: Optional[str], output_dir: str) -> Dict[str, Any]:
+    params = read_run(run_dir_for(output_dir, run_id))["params"]
+    return {
+        "profile_path": params["profile_path"],
+        "profile": params.get("profile"),
+        "source_doc_path": params["source_doc_path"],
+        "output_dir": params["output_dir"],
+        "doc_id": params["doc_id"],
+        "version": params["version"],
+        "run_id": run_id,
+        "resume_from": resume_from,
+    }
 
-    print("\n🎉 Pipeline completed successfully.")
-    print(f"📄 Final match file: {match_file}")
-    print(f"📑 Final report file: {report_path}")
-    return report_path
\ No newline at end of file
+
+def resume_pipeline(run_id: str, resume_from: str = None, output_dir: str = "data") -> PipelineResult:
+    """
+    Resume an earlier run with its original parameters.
+
+    Args:
+        run_id: Id of the run to resume.
+        resume_from: Stage to re-run with everything after it (default: only
+            the stages without a checkpoint, e.g. the one that failed).
+        output_dir: Output base directory of the run.
+
+    Returns:
+        The result of the run.
+    """
+    return run_pipeline(**_resume_args(run_id, resume_from, output_dir))
+
+
+async def aresume_pipeline(
+    run_id: str,
+    resume_from: str = None,
+    output_dir: str = "data",
+    background_saves: bool = True
+) -> PipelineResult:
+    """Async variant of `resume_pipeline` (see `arun_pipeline` for `background_saves`)."""
+    return await arun_pipeline(**_resume_args(run_id, resume_from, output_dir), background_saves=background_saves)
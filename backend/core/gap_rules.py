@@ -0,0 +1,58 @@
+# backend/core/gap_rules.py
+"""
+Table of compliance gaps detected from matched rules.
+
+Each entry lists trigger terms; a matched rule whose text mentions any of them
+(and whose severity is listed) produces the entry's gap and suggested action.
+The table is evaluated once per rule when a RuleSet is built, so adding gap
+types does not add work per request.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+GAP_RULES: List[Dict[str, Any]] = [
+    {
+        "id": "disinfection_documents",
+        "terms": ["חיטוי"],
+        "severities": ["mandatory"],
+        "gap": "Missing official disinfection documents",
+        "suggested_action": "Provide latest certified water disinfection documentation",
+    },
+]
+
+
+def _rule_text(match: Dict[str, Any]) -> str:
+    """Text searched for trigger terms: the full match entry, as stored in match files."""
+    return json.dumps(match, ensure_ascii=False)
+
+
+def detect_gaps(match: Dict[str, Any], gap_rules: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Return the gap entries triggered by a matched rule.
+
+    Args:
+        match: Match entry built for the rule (see `ruleset.build_match`).
+        gap_rules: Gap table to evaluate (defaults to GAP_RULES).
+
+    Returns:
+        List of gap dictionaries with rule_id, gap and suggested_action.
+    """
+    gap_rules = GAP_RULES if gap_rules is None else gap_rules
+    text = None
+    gaps = []
+
+    for gap_rule in gap_rules:
+        severities = gap_rule.get("severities")
+        if severities is not None and match.get("severity") not in severities:
+            continue
+        if text is None:
+            text = _rule_text(match)
+        if any(term in text for term in gap_rule["terms"]):
+            gaps.append({
+                "rule_id": match["id"],
+                "gap": gap_rule["gap"],
+                "suggested_action": gap_rule["suggested_action"]
+            })
+
+    return gaps
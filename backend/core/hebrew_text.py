@@ -0,0 +1,57 @@
+# backend/core/hebrew_text.py
+"""
+Canonical form of Hebrew regulation text.
+
+Text extracted from PDFs mixes geresh/gershayim variants (״ vs "), final and
+non-final letter forms, stray niqqud, invisible direction marks and the broken
+spacing produced by `fitz`. Matching is done on a canonical form instead:
+regdoc content is normalized once when it is parsed (stored as
+`content_norm`) and synonym tables are normalized once at import, so runtime
+matching is exact lookup on canonical strings.
+
+Normalization is idempotent: normalize_hebrew(normalize_hebrew(t)) == normalize_hebrew(t).
+"""
+
+import re
+# Niqqud and cantillation marks (maqaf, paseq, sof pasuq and nun hafukha are kept)
+_MARKS = "".join(
+    chr(c) for c in range(0x0591, 0x05C8)
+    if chr(c) not in "־׀׃׆"
+)
+
+_TRANSLATION = str.maketrans({
+    **{mark: None for mark in _MARKS},
+    # Direction marks and zero-width characters left by PDF extraction
+    "\u200b": None, "\u200c": None, "\u200d": None, "\u200e": None, "\u200f": None, "\ufeff": None,
+    "\u00a0": " ",
+    # Gershayim / geresh and typographic quotes
+    "״": '"', "“": '"', "”": '"', "„": '"',
+    "׳": "'", "‘": "'", "’": "'",
+    "־": "-",
+    # Final letters → regular forms
+    "ך": "כ", "ם": "מ", "ן": "נ", "ף": "פ", "ץ": "צ",
+})
+
+_DOUBLE_GERESH = re.compile(r"''")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_hebrew(text: str) -> str:
+    """
+    Return the canonical form of a Hebrew text segment.
+
+    - niqqud, cantillation marks and invisible direction marks are removed
+    - ״ / “ ” / '' become ", ׳ / ‘ ’ become ', maqaf becomes -
+    - final letters (ך ם ן ף ץ) become their regular forms
+    - whitespace runs become a single space; leading/trailing space is removed
+
+    Args:
+        text: Raw text (e.g. a regulation subsection or a synonym).
+
+    Returns:
+        The normalized text.
+    """
+    text = text.translate(_TRANSLATION)
+    text = _DOUBLE_GERESH.sub('"', text)
+    return _SPACES.sub(" ", text).strip()
+
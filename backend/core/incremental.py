@@ -0,0 +1,209 @@
+# backend/core/incremental.py
+"""
+Incremental re-matching for live questionnaire previews.
+
+The questionnaire changes one field at a time. Instead of re-running a full
+`match_rules` / `match_from_regdoc` pass on every change, these matchers keep
+the previous match state and a field → rules/subsections dependency map built
+at load time, re-evaluate only what the changed fields can affect, and return
+an added/removed delta.
+
+Usage:
+    matcher = IncrementalRuleMatcher(get_ruleset(), profile)
+    delta = matcher.update({"serves_alcohol": True})
+    delta["added"], delta["removed"]     # match entries
+    matcher.result()                     # same as match_rules(matcher.profile, ruleset)
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+from backend.core.matcher_from_regdoc import SYNONYMS, build_regdoc_match, field_reasons
+from backend.core.regdoc_features import SubsectionFeatures, ThresholdIndex, features_for, iter_subsections
+from backend.core.regdoc_registry import get_regdoc
+from backend.core.rule_conditions import evaluate_conditions
+from backend.core.ruleset import RuleSet
+
+
+def _changed(profile: Dict[str, Any], key: str, value: Any) -> bool:
+    """Whether setting `key` to `value` changes the profile (bool vs. int counts as a change)."""
+    if key not in profile:
+        return True
+    old = profile[key]
+    return type(old) is not type(value) or old != value
+
+
+class IncrementalRuleMatcher:
+    """
+    Incremental matcher over a compiled RuleSet.
+
+    Args:
+        ruleset: Indexed compiled rules.
+        profile: Initial business profile.
+    """
+
+    def __init__(self, ruleset: RuleSet, profile: Dict[str, Any]):
+        self.ruleset = ruleset
+        self.profile = dict(profile)
+        self._matched: Set[int] = set(ruleset.candidates(self.profile))
+
+    def update(self, changes: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Apply a field diff and re-evaluate only the rules that read the changed fields.
+
+        Args:
+            changes: Mapping of changed profile fields to their new values.
+
+        Returns:
+            Dictionary with 'added' and 'removed' match entries.
+        """
+        affected: Set[int] = set()
+        for key, value in changes.items():
+            if _changed(self.profile, key, value):
+                self.profile[key] = value
+                affected.update(self.ruleset.rules_by_field.get(key, ()))
+
+        added, removed = [], []
+        for pos in sorted(affected):
+            ok = evaluate_conditions(self.profile, self.ruleset.conditions[pos])[0]
+            if ok and pos not in self._matched:
+                self._matched.add(pos)
+                added.append(pos)
+            elif not ok and pos in self._matched:
+                self._matched.discard(pos)
+                removed.append(pos)
+
+        return {
+            "added": self.ruleset.build_result(self.profile, added)["matches"],
+            "removed": self.ruleset.build_result(self.profile, removed)["matches"],
+        }
+
+    def result(self) -> Dict[str, Any]:
+        """Return the full match result for the current profile."""
+        return self.ruleset.build_result(self.profile, sorted(self._matched))
+
+
+class IncrementalRegdocMatcher:
+    """
+    Incremental matcher over a structured regulation document.
+
+    Keeps the reasons contributed by every profile field to every subsection,
+    so a field change only recomputes that field on the subsections that
+    mention it (boolean fields) or contain numeric clauses (numeric fields).
+
+    Args:
+        regdoc: Parsed regulation document (see `regulation_parser.parse_to_json`).
+        profile: Initial business profile.
+        features: The regdoc's feature index (derived from the text if omitted).
+    """
+
+    def __init__(
+        self,
+        regdoc: Dict[str, Any],
+        profile: Dict[str, Any],
+        features: Optional[List[SubsectionFeatures]] = None
+    ):
+        self.profile = dict(profile)
+        self._subsections = list(iter_subsections(regdoc))
+        self._contents = [content for _, _, content in self._subsections]
+        if features is None:
+            features = [features_for(content) for content in self._contents]
+        self._features = features
+
+        # Dependency maps, built once: which subsections each kind of field can match
+        self._thresholds = ThresholdIndex(self._features)
+        self._mentions: Dict[str, Set[int]] = {}
+        for key in list(SYNONYMS) + list(self.profile):
+            self._mentioning(key)
+
+        # field → reasons, per subsection (only non-empty entries)
+        self._reasons: List[Dict[str, List[str]]] = [{} for _ in self._subsections]
+        for i, content in enumerate(self._contents):
+            for key, value in self.profile.items():
+                reasons = field_reasons(key, value, content, self._features[i])
+                if reasons:
+                    self._reasons[i][key] = reasons
+
+    @classmethod
+    def from_file(cls, regdoc_path: str, profile: Dict[str, Any]) -> "IncrementalRegdocMatcher":
+        """Build the matcher from a regdoc in the shared registry (path or docId)."""
+        loaded = get_regdoc(regdoc_path)
+        return cls(loaded.regdoc, profile, loaded.features)
+
+    def _mentioning(self, key: str) -> Set[int]:
+        subs = self._mentions.get(key)
+        if subs is None:
+            subs = self._mentions[key] = {
+                i for i, content in enumerate(self._contents)
+                if self._features[i].mentions(key, content)
+            }
+        return subs
+
+    def _dependents(self, key: str, value: Any) -> Set[int]:
+        """Subsections for which `field_reasons(key, value, ...)` can be non-empty."""
+        if isinstance(value, bool) and value:
+            return self._mentioning(key)
+        if isinstance(value, (int, float)):
+            text = f"{value}"
+            literal = {
+                i for i, content in enumerate(self._contents)
+                if self._features[i].contains_literal(text, content)
+            }
+            return literal | self._thresholds.subsections(key, value)
+        return set()
+
+    def _match_entry(self, i: int) -> Dict[str, Any]:
+        section, sub, content = self._subsections[i]
+        reasons = [r for key in self.profile for r in self._reasons[i].get(key, [])]
+        return build_regdoc_match(section, sub, content, reasons)
+
+    def update(self, changes: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Apply a field diff and recompute only the affected subsections.
+
+        Args:
+            changes: Mapping of changed profile fields to their new values.
+
+        Returns:
+            Dictionary with 'added', 'removed' and 'updated' match entries
+            ('updated' = still applicable, but with different reasons).
+        """
+        before: Dict[int, Dict[str, Any]] = {}
+
+        for key, value in changes.items():
+            if not _changed(self.profile, key, value):
+                continue
+            affected = self._dependents(key, value)
+            if key in self.profile:
+                affected = affected | self._dependents(key, self.profile[key])
+            self.profile[key] = value
+
+            for i in affected:
+                if i not in before:
+                    before[i] = self._match_entry(i) if self._reasons[i] else None
+                reasons = field_reasons(key, value, self._contents[i], self._features[i])
+                if reasons:
+                    self._reasons[i][key] = reasons
+                else:
+                    self._reasons[i].pop(key, None)
+
+        added, removed, updated = [], [], []
+        for i in sorted(before):
+            old = before[i]
+            new = self._match_entry(i) if self._reasons[i] else None
+            if old is None and new is not None:
+                added.append(new)
+            elif old is not None and new is None:
+                removed.append(old)
+            elif old is not None and old != new:
+                updated.append(new)
+
+        return {"added": added, "removed": removed, "updated": updated}
+
+    def result(self) -> Dict[str, Any]:
+        """Return the full match result for the current profile, as written by `match_from_regdoc`."""
+        matches = [self._match_entry(i) for i, reasons in enumerate(self._reasons) if reasons]
+        return {
+            "profile": self.profile,
+            "matches": matches,
+            "total_matches": len(matches)
+        }
@@ -0,0 +1,394 @@
+# backend/core/job_queue.py
+"""
+Persistent background job queue for pipeline runs.
+
+Jobs are stored in a local SQLite database and executed by a pool of worker
+threads, so an HTTP request only has to submit a job and can then poll it
+(or follow its progress stream) instead of waiting for the LLM:
+
+    queued ──> running ──> completed | failed
+       └──────────┴──────> cancelled
+
+- Submitting the same parameters while an identical job is still queued or
+  running returns that job instead of starting a second one.
+- A running job reports the pipeline stage it is in; cancelling it takes
+  effect at the next stage boundary (a queued job is cancelled at once).
+- A running job is leased to the worker pool that claimed it, which renews
+  the lease while the job runs. A job whose lease expired (its process died)
+  is taken over by the next free worker of any process sharing the database;
+  jobs of live processes are never touched. The job id doubles as the
+  pipeline run id, so a taken-over job reuses the checkpoints of the stages
+  it had completed.
+
+Usage:
+    job, created = JOB_QUEUE.submit({"profile": {...}, "doc_id": "reg-4.2A-2022", "output_dir": "data"})
+    JOB_QUEUE.get(job["id"])       # {"status": "running", "stage": "report", ...}
+    JOB_QUEUE.cancel(job["id"])
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from backend.core.full_pipeline import generate_run_id, run_pipeline
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+JOBS_DB = Path(__file__).resolve().parent.parent.parent / "data" / "jobs" / "jobs.sqlite3"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Seconds a running job stays owned by its worker pool without a heartbeat
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+ACTIVE = ("queued", "running")
+TERMINAL = ("completed", "failed", "cancelled")
+
+# Runs a job: (job id, params, on_stage) -> JSON-serializable result
+JobRunner = Callable[[str, Dict[str, Any], Callable[[str], None]], Dict[str, Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    dedupe_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_key ON jobs (dedupe_key, status);
+"""
+
+# Columns added after the first release, for databases created before them
+_LATER_COLUMNS = {"owner": "TEXT", "lease_until": "REAL"}
+
+
+class JobCancelled(Exception):
+    """Raised at a stage boundary of a job whose cancellation was requested."""
+
+
+class JobLeaseLost(Exception):
+    """Raised at a stage boundary of a job that another worker pool has taken over."""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def dedupe_key(params: Dict[str, Any]) -> str:
+    """Content hash of job parameters (key order does not matter)."""
+    canonical = json.dumps(params, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def run_pipeline_job(job_id: str, params: Dict[str, Any], on_stage: Callable[[str], None]) -> Dict[str, Any]:
+    """
+    Run the pipeline for a job; the job id is used as the run id.
+
+    Args:
+        job_id: Id of the job.
+        params: "profile" (inline dict) or "profile_path", one of "source_doc_path" /
+            "doc_id" (+ optional "version"), "output_dir" and optionally "save_outputs".
+            Jobs are always checkpointed, so a taken-over job can resume.
+        on_stage: Progress / cancellation hook, see `StageGraph.run`.
+
+    Returns:
+        The run id, report path and report text.
+    """
+    result = run_pipeline(
+        profile_path=params.get("profile_path"),
+        profile=params.get("profile"),
+        source_doc_path=params.get("source_doc_path"),
+        output_dir=params.get("output_dir", "data"),
+        doc_id=params.get("doc_id"),
+        version=params.get("version"),
+        run_id=job_id,
+        on_stage=on_stage,
+        save_outputs=params.get("save_outputs", True),
+    )
+    return {"run_id": job_id, "report_path": result.report_path, "report": result.report_text}
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue with a pool of worker threads.
+
+    Args:
+        db_path: SQLite database file (created if needed).
+        workers: Number of worker threads, i.e. jobs run concurrently.
+        runner: Callable `(job_id, params, on_stage) -> result` executing one job.
+        poll_interval: Seconds an idle worker waits before checking the queue again.
+        lease_seconds: Lifetime of a running job's lease; it is renewed every third of it.
+    """
+
+    def __init__(
+        self,
+        db_path: PathLike = JOBS_DB,
+        workers: int = JOB_WORKERS,
+        runner: JobRunner = run_pipeline_job,
+        poll_interval: float = 1.0,
+        lease_seconds: float = JOB_LEASE_SECONDS
+    ):
+        self.db_path = Path(db_path)
+        self.workers = max(1, workers)
+        self.runner = runner
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        # Identifies this worker pool as the owner of the jobs it runs
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._halt = threading.Event()
+        # Ids of the jobs this pool's workers are running (their leases are renewed)
+        self._running: Set[str] = set()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._initialized = False
+
+    # === Storage ===
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode (transactions are explicit) and close it afterwards."""
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+                for name, kind in _LATER_COLUMNS.items():
+                    if name not in columns:
+                        conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+                self._initialized = True
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        for internal in ("dedupe_key", "owner", "lease_until"):
+            del job[internal]
+        return job
+
+    def _update(self, job_id: str, **fields: Any) -> bool:
+        """Update a job this pool still owns; False if another pool has taken it over."""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            return conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND owner = ?", (*fields.values(), job_id, self.owner)
+            ).rowcount > 0
+
+    # === Public API ===
+    def submit(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Queue a job, unless an identical one is already queued or running.
+
+        Args:
+            params: JSON-serializable job parameters (passed to the runner).
+
+        Returns:
+            (job, created): the new job, or the identical in-flight job with created=False.
+        """
+        key = dedupe_key(params)
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) AND cancel_requested = 0",
+                (key, *ACTIVE),
+            ).fetchone()
+            if row is None:
+                job_id = generate_run_id()
+                conn.execute(
+                    "INSERT INTO jobs (id, dedupe_key, status, params, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                    (job_id, key, json.dumps(params, ensure_ascii=False), _now()),
+                )
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                created = True
+            else:
+                created = False
+            conn.execute("COMMIT")
+
+        job = self._to_dict(row)
+        if created:
+            logger.info(f"📥 Queued job {job['id']}")
+            self.start()
+            with self._wakeup:
+                self._wakeup.notify()
+        else:
+            logger.info(f"♻️ Identical job {job['id']} is already {job['status']}")
+        return job, created
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job (params, status, current stage, result or error), or None if unknown."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """List the most recent jobs, optionally only those with the given status."""
+        query, args = "SELECT * FROM jobs", ()
+        if status is not None:
+            query, args = query + " WHERE status = ?", (status,)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC, id DESC LIMIT ?", (*args, limit)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job: a queued job is cancelled at once, a running one at its next stage boundary.
+
+        Returns:
+            The updated job, or None if unknown. Finished jobs are returned unchanged.
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (_now(), job_id),
+            )
+            conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        return self.get(job_id)
+
+    # === Workers ===
+    def start(self) -> None:
+        """Start the worker threads and the lease heartbeat (idempotent)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping = False
+            self._halt.clear()
+            self._threads = [
+                threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            self._threads.append(threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"👷 Started {self.workers} job worker(s) on {self.db_path}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers after their current job."""
+        self._stopping = True
+        self._halt.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically lease the oldest queued job, or a running job whose lease expired, to this pool."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, status FROM jobs WHERE status = 'queued' OR (status = 'running' AND "
+                "(lease_until IS NULL OR lease_until < ?)) ORDER BY created_at, id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, owner = ?, lease_until = ? WHERE id = ?",
+                    (_now(), self.owner, now + self.lease_seconds, row["id"]),
+                )
+            conn.execute("COMMIT")
+        if row is None:
+            return None
+        if row["status"] == "running":
+            logger.info(f"🔁 Taking over job {row['id']}: its lease expired")
+        return self.get(row["id"])
+
+    def _renew_leases(self) -> None:
+        running = list(self._running)
+        if not running:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = 'running' "
+                f"AND id IN ({', '.join('?' * len(running))})",
+                (time.time() + self.lease_seconds, self.owner, *running),
+            )
+
+    def _heartbeat(self) -> None:
+        """Renew the leases of the jobs this pool is running until the pool stops."""
+        while not self._stopping:
+            try:
+                self._renew_leases()
+            except Exception:
+                # e.g. "database is locked": retry well before the leases run out
+                logger.exception("❌ Renewing job leases failed; retrying")
+                self._halt.wait(self.lease_seconds / 10)
+                continue
+            self._halt.wait(self.lease_seconds / 3)
+
+    def _work(self) -> None:
+        while not self._stopping:
+            try:
+                job = self._claim()
+                if job is None:
+                    with self._wakeup:
+                        self._wakeup.wait(self.poll_interval)
+                    continue
+                self._run(job)
+            except Exception:
+                # A failing database must not kill the worker: back off and look again
+                logger.exception("❌ Job worker error; retrying")
+                self._halt.wait(self.poll_interval)
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+
+        def on_stage(stage: str) -> None:
+            current = self.get(job_id)
+            if current is not None and current["cancel_requested"]:
+                raise JobCancelled(job_id)
+            if not self._update(job_id, stage=stage):
+                raise JobLeaseLost(job_id)
+            logger.info(f"⚙️ Job {job_id}: stage '{stage}'")
+
+        start = time.perf_counter()
+        self._running.add(job_id)
+        try:
+            result = self.runner(job_id, job["params"], on_stage)
+        except JobCancelled:
+            self._update(job_id, status="cancelled", finished_at=_now())
+            logger.info(f"🛑 Job {job_id} cancelled")
+        except JobLeaseLost:
+            logger.warning(f"⚠️ Job {job_id} was taken over by another worker pool; dropping this run")
+        except Exception as e:
+            self._update(job_id, status="failed", error=str(e), finished_at=_now())
+            logger.error(f"❌ Job {job_id} failed: {e}")
+        else:
+            self._update(
+                job_id, status="completed", result=json.dumps(result, ensure_ascii=False), finished_at=_now()
+            )
+            logger.info(f"✅ Job {job_id} completed in {time.perf_counter() - start:.2f}s")
+        finally:
+            # Unrenewed, the lease of a job whose final update failed expires and the job is run again
+            self._running.discard(job_id)
+
+
+JOB_QUEUE = JobQueue()
@@ -0,0 +1,135 @@
+# backend/core/keywords.py
+"""
+Keyword and number primitives shared by the regdoc matcher and its indexes.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from backend.core.hebrew_text import normalize_hebrew
+from backend.core.text_search import AhoCorasick
+
+# 🧠 Synonyms map for semantic keyword matching
+SYNONYMS: Dict[str, List[str]] = {
+    "uses_gas": [
+        "גז", "שימוש בגז", "מתקני גז", "בלוני גז", "מערכת גז", "אספקת גז", "תשתית גז", "חיבור גז"
+    ],
+    "delivers": [
+        "משלוחים", "שליחויות", "שירות משלוחים", "שילוח", "אספקה לבית הלקוח", "הזמנות טלפוניות"
+    ],
+    "has_meat": [
+        "בשר", "מנות בשריות", "בשר אדום", "בשר עוף", "הגשת בשר", "מזון מן החי", "שחיטה", "חומרי גלם מן החי"
+    ],
+    "uses_fryer": [
+        "טיגון", "מכשירי טיגון", "סיר טיגון", "צ'יפסר", "מכשירי חימום שמן", "שמן רותח"
+    ],
+    "has_alcohol": [
+        "מכירת אלכוהול", "הגשת משקאות חריפים", "רישיון משקאות", "שתייה חריפה"
+    ],
+    "serves_dairy": [
+        "מוצרי חלב", "גבינות", "יוגורט", "מנות חלביות", "הגשת חלב", "תפריט חלבי"
+    ],
+    "has_seating": [
+        "מקומות ישיבה", "כיסאות ושולחנות", "אזור הסעדה", "ישיבה במקום", "ישיבה במסעדה"
+    ],
+    "is_open_air": [
+        "אוויר פתוח", "מרפסת", "חצר", "הסעדה חיצונית", "איזור ישיבה פתוח", "שולחנות מחוץ למבנה"
+    ],
+    "uses_gas_grill": [
+        "גריל גז", "מתקן גריל", "גריל", "צלייה", "ברביקיו", "מתקן צלייה"
+    ],
+    "is_kosher": [
+        "כשרות", "רבנות", "תעודת כשרות", "פיקוח הלכתי", "בשר חלק", "כשר למהדרין"
+    ]
+}
+
+
+# 📏 Units of "עד N" / "מעל N" clauses, and the numeric profile fields they constrain
+UNITS: Dict[str, List[str]] = {
+    "sqm": ['מ"ר', "מ״ר", "מ''ר", "מטר רבוע", "מטרים רבועים"],
+    "seats": ["מקומות ישיבה", "מקומות", "מושבים", "סועדים", "איש", "אנשים"],
+}
+
+FIELD_UNITS: Dict[str, str] = {
+    "area_sqm": "sqm",
+    "business_area_sqm": "sqm",
+    "num_seats": "seats",
+    "seating_capacity": "seats",
+}
+
+UPTO = "upto"
+ABOVE = "above"
+
+# Matching runs on normalized text (see hebrew_text), so the tables are normalized once here
+NORMALIZED_SYNONYMS: Dict[str, List[str]] = {
+    key: sorted({normalize_hebrew(word) for word in words}) for key, words in SYNONYMS.items()
+}
+
+_UNIT_BY_WORD = {normalize_hebrew(word): unit for unit, words in UNITS.items() for word in words}
+# "עד 50 מקומות", "מעל500 " מ"ר" (PDF text may glue or scatter punctuation),
+# "עד 1,000 מ"ר"; the unit is optional.
+_THRESHOLD_CLAUSE = re.compile(
+    r"(עד|מעל)\s*(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)"
+    r"(?:[\s\"'.,]*(%s)(?![\u0590-\u05FF]))?" % "|".join(
+        re.escape(word) for word in sorted(_UNIT_BY_WORD, key=len, reverse=True)
+    )
+)
+
+
+# Single automaton over every normalized synonym, labelled with its profile key
+SYNONYM_AUTOMATON = AhoCorasick(
+    (word, key) for key, words in NORMALIZED_SYNONYMS.items() for word in words
+)
+
+
+@lru_cache(maxsize=4096)
+def keys_mentioned(content: str) -> FrozenSet[str]:
+    """
+    Return every profile key whose synonyms appear in the regulation content.
+
+    Scans the normalized text once with SYNONYM_AUTOMATON; results are cached
+    per content string since regulation text does not change between requests.
+
+    Args:
+        content: A text segment from a regulation document (raw or normalized).
+
+    Returns:
+        Frozen set of profile keys (e.g., {'uses_gas', 'delivers'}).
+    """
+    return frozenset(SYNONYM_AUTOMATON.labels_in(normalize_hebrew(content)))
+
+
+def keyword_match(key: str, content: str) -> bool:
+    """
+    Check if any synonym for the given profile key appears in the regulation content.
+
+    Reference implementation (one substring test per synonym); the matchers use
+    `keys_mentioned` instead.
+
+    Args:
+        key: A profile attribute key (e.g., 'uses_gas').
+        content: A text segment from a regulation document.
+
+    Returns:
+        True if a match is found, False otherwise.
+    """
+    content = normalize_hebrew(content)
+    return any(word in content for word in NORMALIZED_SYNONYMS.get(key, []))
+
+
+def extract_thresholds(text: str) -> List[Tuple[str, float, Optional[str]]]:
+    """
+    Extract every "עד N" / "מעל N" clause with its unit.
+
+    Args:
+        text: The text to scan, normalized with `normalize_hebrew`.
+
+    Returns:
+        List of (UPTO | ABOVE, N, unit) tuples in text order; unit is a key of
+        UNITS, or None when the number is not followed by a known unit.
+    """
+    return [
+        (UPTO if op == "עד" else ABOVE, float(number.replace(",", "")), _UNIT_BY_WORD.get(word))
+        for op, number, word in _THRESHOLD_CLAUSE.findall(text)
+    ]
@@ -1,39 +1,86 @@
 # backend/core/matcher.py
 import json
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 from datetime import datetime
 
 # 📥 Optional engine: matches raw free-text regulation documents
 from backend.core.matcher_from_regdoc import match_from_regdoc
+from backend.core.ruleset import RuleSet, evaluate_applies_if
+from backend.core.binary_store import load_document
+from backend.core.file_cache import FileCache
 
-# Priority level constants for severity ranking
-MANDATORY = 1
-RECOMMENDED = 2
-INFO = 3
+# Default location of the compiled rules produced by compile_rules_from_regdoc.py
+COMPILED_RULES_PATH = "data/processed/compiled_rules.json"
 
 
-def load_compiled_rules(path: str = "data/processed/compiled_rules.json") -> List[Dict[str, Any]]:
+def load_compiled_rules(path: str = COMPILED_RULES_PATH) -> List[Dict[str, Any]]:
     """
-    Load a list of compiled regulatory rules from a JSON file.
+    Load a list of compiled regulatory rules from a JSON (or binary store) file.
 
     Args:
-        path: Path to the compiled rules JSON file.
+        path: Path to the compiled rules file.
 
     Returns:
         List of rule dictionaries.
     """
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
-        print("🔍 First 3 entries in rules file:", data[:3])
-        return data
+    data = load_document(path)
+    print(f"📥 Loaded {len(data)} compiled rules from {path}")
+    return data
+
+
+# Shared, process-wide cache of indexed rulesets keyed by rules file path
+RULESET_CACHE = FileCache(lambda path: RuleSet(load_compiled_rules(path)), name="rulesets")
+
+
+def get_ruleset(path: str = COMPILED_RULES_PATH) -> RuleSet:
+    """
+    Return the indexed RuleSet for a compiled rules file.
+
+    The file is parsed once per process and only re-read when its mtime/size
+    changes, so repeated matches do not touch the JSON again.
+
+    Args:
+        path: Path to the compiled rules JSON file.
+
+    Returns:
+        The cached RuleSet.
+    """
+    return RULESET_CACHE.get(path)
+
+
+# RuleSets of the plain rule lists recently passed to `match_rules`, by list identity
+_LIST_RULESETS: "OrderedDict[int, Tuple[List[Dict[str, Any]], Tuple[int, ...], RuleSet]]" = OrderedDict()
+_LIST_RULESETS_MAX = 8
+
+
+def _ruleset_for_list(rules: List[Dict[str, Any]]) -> RuleSet:
+    """
+    Return a RuleSet over a plain rule list, built once per list.
+
+    The RuleSet holds the match entries and gap table precomputed per rule. A
+    list is recognised by identity and its rule objects (the list is kept
+    referenced while cached); rules are not expected to be edited in place.
+    """
+    fingerprint = tuple(map(id, rules))
+    cached = _LIST_RULESETS.get(id(rules))
+    if cached is not None and cached[0] is rules and cached[1] == fingerprint:
+        _LIST_RULESETS.move_to_end(id(rules))
+        return cached[2]
+    ruleset = RuleSet(rules)
+    _LIST_RULESETS[id(rules)] = (rules, fingerprint, ruleset)
+    while len(_LIST_RULESETS) > _LIST_RULESETS_MAX:
+        _LIST_RULESETS.popitem(last=False)
+    return ruleset
 
 
 def _applies(profile: Dict[str, Any], applies_if: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """
     Internal helper to evaluate whether a rule applies to the given profile.
 
-    Supports exact match and maximum thresholds via keys ending in '_max'.
+    Supports every `applies_if` form of `rule_conditions`: exact values, '_max'
+    key suffixes and {"min", "max", "range", "in", "eq"} dicts.
 
     Args:
         profile: Business profile data.
@@ -42,72 +89,33 @@ def _applies(profile: Dict[str, Any], applies_if: Dict[str, Any]) -> Tuple[bool,
     Returns:
         A tuple: (True/False if rule applies, list of matching reasons or reasons for rejection)
     """
-    reasons = []
-
-    for key, val in applies_if.items():
-        if key.endswith("_max"):
-            actual = profile.get(key.replace("_max", ""))
-            if actual is not None and actual <= val:
-                reasons.append(f"{key.replace('_max','')} ≤ {val}")
-            else:
-                return False, [f"{key.replace('_max','')} > {val}"]
-        else:
-            if profile.get(key) == val:
-                reasons.append(f"{key} == {val}")
-            else:
-                return False, [f"{key} != {val}"]
+    return evaluate_applies_if(profile, applies_if)
 
-    return True, reasons
 
-
-def match_rules(profile: Dict[str, Any], rules: List[Dict[str, Any]]) -> Dict[str, Any]:
+def match_rules(profile: Dict[str, Any], rules: Union[List[Dict[str, Any]], RuleSet]) -> Dict[str, Any]:
     """
     Match a business profile against a list of compiled rules and return results.
 
+    A plain list is scanned rule by rule; a prebuilt `RuleSet` answers the same
+    query from its condition indexes. Both return identical results, built from
+    the RuleSet's precomputed match entries and gap table (for a list, a RuleSet
+    built once per list).
+
     Args:
         profile: Business profile dictionary.
-        rules: List of compiled rule dictionaries.
+        rules: List of compiled rule dictionaries, or a `RuleSet` built from them.
 
     Returns:
         A result dictionary including matched rules and identified compliance gaps.
     """
-    matches = []
-    gaps = []
-
-    for rule in rules:
-        ok, reasons = _applies(profile, rule.get("applies_if", {}))
-        if not ok:
-            continue
-
-        severity = rule.get("severity", "info")
-        priority = {"mandatory": MANDATORY, "recommended": RECOMMENDED, "info": INFO}.get(severity, INFO)
-
-        match = {
-            "id": rule["id"],
-            "title": rule.get("title"),
-            "authority": rule.get("authority"),
-            "severity": severity,
-            "priority": priority,
-            "applies_because": reasons,
-            "requirements": [req["name"] for req in rule.get("requirements", [])],
-            "source": rule.get("source"),
-            "tags": rule.get("tags", [])
-        }
-        matches.append(match)
+    if isinstance(rules, RuleSet):
+        return rules.match(profile)
 
-        # Special case: identify disinfection gaps in mandatory rules
-        if severity == "mandatory" and "חיטוי" in json.dumps(match, ensure_ascii=False):
-            gaps.append({
-                "rule_id": rule["id"],
-                "gap": "Missing official disinfection documents",
-                "suggested_action": "Provide latest certified water disinfection documentation"
-            })
-
-    return {
-        "profile": profile,
-        "matches": matches,
-        "gaps": gaps
-    }
+    positions = [
+        pos for pos, rule in enumerate(rules)
+        if _applies(profile, rule.get("applies_if", {}))[0]
+    ]
+    return _ruleset_for_list(rules).build_result(profile, positions)
 
 
 def generate_unique_profile_id(profile: Dict[str, Any]) -> str:
@@ -152,7 +160,8 @@ def run_full_match(
     profile: Dict[str, Any],
     profile_id: str = None,
     use_regdoc: bool = False,
-    regdoc_path: str = "data/processed/reg-4.2A-2022.json"
+    regdoc_path: str = "data/processed/reg-4.2A-2022.json",
+    rules_path: str = COMPILED_RULES_PATH
 ) -> Dict[str, Any]:
     """
     Run the complete matching process on a business profile.
@@ -166,6 +175,7 @@ def run_full_match(
         profile_id: Optional profile identifier (auto-generated if not provided).
         use_regdoc: Whether to use the raw regulation doc engine.
         regdoc_path: Path to the regdoc JSON file.
+        rules_path: Path to the compiled rules JSON file.
 
     Returns:
         A dictionary with match status, file path, and (optionally) number of matches.
@@ -188,7 +198,7 @@ def run_full_match(
         }
 
     # Default: compiled rule engine
-    rules = load_compiled_rules()
+    rules = get_ruleset(rules_path)
     result = match_rules(profile, rules)
     match_file = save_match_result(profile_id, result)
     return {
@@ -1,104 +1,120 @@
 # backend/core/matcher_from_regdoc.py
 import json
-import re
 from pathlib import Path
-from typing import Dict, Any, List
-
-# 🧠 Synonyms map for semantic keyword matching
-SYNONYMS: Dict[str, List[str]] = {
-    "uses_gas": [
-        "גז", "שימוש בגז", "מתקני גז", "בלוני גז", "מערכת גז", "אספקת גז", "תשתית גז", "חיבור גז"
-    ],
-    "delivers": [
-        "משלוחים", "שליחויות", "שירות משלוחים", "שילוח", "אספקה לבית הלקוח", "הזמנות טלפוניות"
-    ],
-    "has_meat": [
-        "בשר", "מנות בשריות", "בשר אדום", "בשר עוף", "הגשת בשר", "מזון מן החי", "שחיטה", "חומרי גלם מן החי"
-    ],
-    "uses_fryer": [
-        "טיגון", "מכשירי טיגון", "סיר טיגון", "צ'יפסר", "מכשירי חימום שמן", "שמן רותח"
-    ],
-    "has_alcohol": [
-        "מכירת אלכוהול", "הגשת משקאות חריפים", "רישיון משקאות", "שתייה חריפה"
-    ],
-    "serves_dairy": [
-        "מוצרי חלב", "גבינות", "יוגורט", "מנות חלביות", "הגשת חלב", "תפריט חלבי"
-    ],
-    "has_seating": [
-        "מקומות ישיבה", "כיסאות ושולחנות", "אזור הסעדה", "ישיבה במקום", "ישיבה במסעדה"
-    ],
-    "is_open_air": [
-        "אוויר פתוח", "מרפסת", "חצר", "הסעדה חיצונית", "איזור ישיבה פתוח", "שולחנות מחוץ למבנה"
-    ],
-    "uses_gas_grill": [
-        "גריל גז", "מתקן גריל", "גריל", "צלייה", "ברביקיו", "מתקן צלייה"
-    ],
-    "is_kosher": [
-        "כשרות", "רבנות", "תעודת כשרות", "פיקוח הלכתי", "בשר חלק", "כשר למהדרין"
-    ]
-}
-
-
-def _keyword_match(key: str, content: str) -> bool:
+from typing import Dict, Any, Iterator, List, Optional, Union
+
+from backend.core.keywords import (
+    ABOVE,
+    UPTO,
+    SYNONYMS,
+    SYNONYM_AUTOMATON,
+    keys_mentioned,
+    keyword_match as _keyword_match,
+)
+from backend.core.regdoc_features import SubsectionFeatures, features_for
+from backend.core.regdoc_registry import LoadedRegdoc, get_regdoc
+
+
+def field_reasons(
+    key: str,
+    value: Any,
+    content: str,
+    features: Optional[SubsectionFeatures] = None
+) -> List[str]:
     """
-    Check if any synonym for the given profile key appears in the regulation content.
+    Match a single profile attribute against a regulation text segment.
 
     Args:
-        key: A profile attribute key (e.g., 'uses_gas').
-        content: A text segment from a regulation document.
+        key: Profile attribute name.
+        value: Profile attribute value.
+        content: A section of regulation text.
+        features: The subsection's entry in the regdoc feature index
+            (derived from `content` if omitted).
 
     Returns:
-        True if a match is found, False otherwise.
-    """
-    return any(word in content for word in SYNONYMS.get(key, []))
-
-
-def _extract_number(text: str) -> int:
+        The reasons contributed by this attribute (empty if it does not match).
     """
-    Extract the first numeric value found in the given text.
+    if features is None:
+        features = features_for(content)
+    reasons = []
 
-    Used for interpreting 'up to' or 'above' rules.
+    if isinstance(value, bool) and value:
+        if features.mentions(key, content):
+            reasons.append(f"✔ {key} == True")
 
-    Args:
-        text: The text from which to extract a number.
+    elif isinstance(value, (int, float)):
+        if features.contains_literal(f"{value}", content):
+            reasons.append(f"✔ {key} == {value}")
+        # "עד N" / "מעל N" clauses in the field's unit, from the feature index
+        threshold = features.threshold(key, value)
+        if threshold == UPTO:
+            reasons.append(f"✔ {key} ≤ {value}")
+        elif threshold == ABOVE:
+            reasons.append(f"✔ {key} > {value}")
 
-    Returns:
-        The first number found, or 0 if none exists.
-    """
-    match = re.search(r"\d+", text.replace(",", ""))
-    return int(match.group()) if match else 0
+    return reasons
 
 
-def match_conditions(content: str, profile: Dict[str, Any]) -> List[str]:
+def match_conditions(
+    content: str,
+    profile: Dict[str, Any],
+    features: Optional[SubsectionFeatures] = None
+) -> List[str]:
     """
     Match a regulation text segment against business profile attributes.
 
     Args:
         content: A section of regulation text.
         profile: Business profile dictionary.
+        features: The subsection's entry in the regdoc feature index (optional).
 
     Returns:
         A list of reasons indicating which profile attributes matched this content.
     """
     reasons = []
+    if features is None:
+        features = features_for(content)
 
     for key, value in profile.items():
-        if isinstance(value, bool) and value:
-            if key in content or _keyword_match(key, content):
-                reasons.append(f"✔ {key} == True")
-
-        elif isinstance(value, (int, float)):
-            if f"{value}" in content:
-                reasons.append(f"✔ {key} == {value}")
-            number = _extract_number(content)
-            if "עד" in content and value <= number:
-                reasons.append(f"✔ {key} ≤ {value}")
-            elif "מעל" in content and value > number:
-                reasons.append(f"✔ {key} > {value}")
+        reasons.extend(field_reasons(key, value, content, features))
 
     return reasons
 
 
+def build_regdoc_match(section: Dict[str, Any], sub: Dict[str, Any], content: str, reasons: List[str]) -> Dict[str, Any]:
+    """Build the match entry stored for an applicable regulation subsection."""
+    return {
+        "rule_id": f"{section['id']}-{sub['id']}",
+        "title": sub.get("title", "Untitled"),
+        "authority": section.get("title", "Unknown Authority"),
+        "applies_because": reasons,
+        "requirement_text": content
+    }
+
+
+def iter_regdoc_matches(profile: Dict[str, Any], regdoc: Union[str, LoadedRegdoc]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the applicable rules of a regulation document one at a time, in document order.
+
+    Each match is yielded as soon as its subsection is evaluated, so callers can
+    stream results without holding the full match list.
+
+    Args:
+        profile: Business profile dictionary.
+        regdoc: Path or docId of the regdoc, or an already loaded regdoc.
+
+    Yields:
+        Match entries, as stored in match files.
+    """
+    # Parsed once per process and shared between requests (see regdoc_registry)
+    loaded = regdoc if isinstance(regdoc, LoadedRegdoc) else get_regdoc(regdoc)
+
+    for (section, sub, content), feats in zip(loaded.subsections, loaded.features):
+        reasons = match_conditions(content, profile, feats)
+        if reasons:
+            yield build_regdoc_match(section, sub, content, reasons)
+
+
 def match_from_regdoc(
     profile: Dict[str, Any],
     regdoc_path: str,
@@ -117,30 +133,7 @@ def match_from_regdoc(
     Returns:
         Path to the generated match result JSON file.
     """
-    with open(regdoc_path, encoding="utf-8") as f:
-        regdoc = json.load(f)
-
-    matches = []
-
-    for section in regdoc.get("sections", []):
-        authority = section.get("title", "Unknown Authority")
-
-        for sub in section.get("subsections", []):
-            content = sub.get("content", "").strip()
-            if not content:
-                continue
-
-            reasons = match_conditions(content, profile)
-            if not reasons:
-                continue
-
-            matches.append({
-                "rule_id": f"{section['id']}-{sub['id']}",
-                "title": sub.get("title", "Untitled"),
-                "authority": authority,
-                "applies_because": reasons,
-                "requirement_text": content
-            })
+    matches = list(iter_regdoc_matches(profile, regdoc_path))
 
     # Ensure output directory exists
     Path(output_dir).mkdir(parents=True, exist_ok=True)
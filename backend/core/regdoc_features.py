@@ -0,0 +1,320 @@
+# backend/core/regdoc_features.py
+"""
+Per-subsection feature index for structured regulation documents.
+
+Regdoc text never changes between requests, so everything the regdoc matcher
+derives from it – which profile keys a subsection mentions, which literal
+numbers it contains and its "עד N"/"מעל N" clauses with their units – is
+computed once when the regdoc is written and saved next to it as
+`<regdoc>.features.json`. Matching then reduces to set and threshold lookups.
+
+The index stores the SHA-256 of the regdoc file and of the synonym table it
+was built with; `load_feature_index` rebuilds it automatically when either
+has changed.
+"""
+
+import hashlib
+import json
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Union
+
+from backend.core.hebrew_text import normalize_hebrew
+from backend.core.keywords import ABOVE, FIELD_UNITS, SYNONYMS, UNITS, UPTO, extract_thresholds, keys_mentioned
+
+FEATURE_INDEX_VERSION = 4
+
+# Characters that can appear in the text of a profile number (e.g. "120", "80.5")
+_NUMBER_RUN = re.compile(r"[0-9.]+")
+# Formatted profile numbers answered from the index: digit-bounded, at most 24 chars
+_MAX_LITERAL = 24
+_NUMBER_TEXT = re.compile(r"^\d(?:[0-9.]{0,%d}\d)?$" % (_MAX_LITERAL - 2))
+
+PathLike = Union[str, Path]
+
+
+def _synonyms_digest() -> str:
+    tables = {"synonyms": SYNONYMS, "units": UNITS}
+    return hashlib.sha256(json.dumps(tables, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def iter_subsections(regdoc: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+    """
+    Yield every non-empty subsection of a structured regulation document.
+
+    Args:
+        regdoc: Parsed regulation document.
+
+    Yields:
+        Tuples of (section, subsection, stripped content).
+    """
+    for section in regdoc.get("sections", []):
+        for sub in section.get("subsections", []):
+            content = sub.get("content", "").strip()
+            if content:
+                yield section, sub, content
+
+
+def content_digest(content: str) -> str:
+    """SHA-256 of a subsection's stripped content (features depend on nothing else)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def feature_index_path(regdoc_path: PathLike) -> Path:
+    """Return the path of the feature index stored next to a regdoc file."""
+    regdoc_path = Path(regdoc_path)
+    # "reg.json" → "reg.features.json"; other formats keep their suffix so a
+    # binary copy ("reg.rstb") does not share (and keep rebuilding) the JSON's index
+    stem = regdoc_path.stem if regdoc_path.suffix == ".json" else regdoc_path.name
+    return regdoc_path.with_name(f"{stem}.features.json")
+
+
+def subsection_features(content: str, content_norm: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract the matcher features of one subsection.
+
+    Args:
+        content: Stripped subsection text.
+        content_norm: Its normalized form, if already stored in the regdoc.
+
+    Returns:
+        JSON-serializable feature dictionary.
+    """
+    if content_norm is None:
+        content_norm = normalize_hebrew(content)
+    keys = set(keys_mentioned(content_norm))
+    # Profile keys written literally in the text (matched by `key in content`)
+    keys.update(key for key in SYNONYMS if key in content_norm)
+    return {
+        "keys": sorted(keys),
+        "number_runs": sorted(set(_NUMBER_RUN.findall(content_norm))),
+        "thresholds": [list(clause) for clause in extract_thresholds(content_norm)],
+    }
+
+
+def build_feature_index(
+    regdoc: Dict[str, Any],
+    regdoc_sha256: Optional[str] = None,
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build the feature index of a regdoc.
+
+    Args:
+        regdoc: Parsed regulation document.
+        regdoc_sha256: Digest of the regdoc file the index belongs to.
+        previous: An earlier index (e.g. of the previous edition); entries of
+            subsections whose content is unchanged are reused, not recomputed.
+
+    Returns:
+        Feature index dictionary (one entry per non-empty subsection, in document order).
+    """
+    reusable = {}
+    if previous and previous.get("version") == FEATURE_INDEX_VERSION \
+            and previous.get("synonyms_sha256") == _synonyms_digest():
+        reusable = {entry["content_sha256"]: entry for entry in previous["subsections"]}
+
+    subsections = []
+    for section, sub, content in iter_subsections(regdoc):
+        digest = content_digest(content)
+        if digest in reusable:
+            features = dict(reusable[digest])
+        else:
+            features = subsection_features(content, sub.get("content_norm"))
+            features["content_sha256"] = digest
+        features["rule_id"] = f"{section['id']}-{sub['id']}"
+        subsections.append(features)
+
+    return {
+        "version": FEATURE_INDEX_VERSION,
+        "docId": regdoc.get("docId"),
+        "regdoc_sha256": regdoc_sha256,
+        "synonyms_sha256": _synonyms_digest(),
+        "subsections": subsections,
+    }
+
+
+def save_regdoc(
+    regdoc: Dict[str, Any],
+    output_path: PathLike,
+    previous_index: Optional[Dict[str, Any]] = None
+) -> Path:
+    """
+    Write a regdoc JSON file together with its feature index.
+
+    Args:
+        regdoc: Parsed regulation document.
+        output_path: Destination of the regdoc JSON.
+        previous_index: Earlier feature index whose unchanged entries can be reused.
+
+    Returns:
+        Path of the written feature index.
+    """
+    output_path = Path(output_path)
+    text = json.dumps(regdoc, ensure_ascii=False, indent=2)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return write_feature_index(build_feature_index(regdoc, digest, previous_index), output_path)
+
+
+def write_feature_index(index: Dict[str, Any], regdoc_path: PathLike) -> Path:
+    """Save a feature index next to its regdoc and return its path."""
+    index_path = feature_index_path(regdoc_path)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    return index_path
+
+
+def _is_current(index: Dict[str, Any], regdoc_sha256: str) -> bool:
+    return (
+        index.get("version") == FEATURE_INDEX_VERSION
+        and index.get("regdoc_sha256") == regdoc_sha256
+        and index.get("synonyms_sha256") == _synonyms_digest()
+    )
+
+
+def load_feature_index(regdoc_path: PathLike, regdoc: Dict[str, Any], regdoc_sha256: str) -> List["SubsectionFeatures"]:
+    """
+    Load the feature index of a regdoc, rebuilding and re-saving it if missing or stale.
+
+    Args:
+        regdoc_path: Path of the regdoc JSON file.
+        regdoc: The parsed regdoc.
+        regdoc_sha256: SHA-256 of the regdoc file bytes.
+
+    Returns:
+        One SubsectionFeatures per non-empty subsection, aligned with `iter_subsections(regdoc)`.
+    """
+    index_path = feature_index_path(regdoc_path)
+    index = None
+    if index_path.exists():
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+
+    if index is None or not _is_current(index, regdoc_sha256):
+        index = build_feature_index(regdoc, regdoc_sha256)
+        try:
+            write_feature_index(index, regdoc_path)
+        except OSError:
+            pass  # read-only location: keep the in-memory index
+
+    return [SubsectionFeatures(entry) for entry in index["subsections"]]
+
+
+class SubsectionFeatures:
+    """In-memory view of one subsection's entry in the feature index."""
+
+    __slots__ = ("keys", "literals", "upto", "above")
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.keys: FrozenSet[str] = frozenset(entry["keys"])
+        # Every digit-bounded substring of every number run, so `f"{value}" in content`
+        # becomes a set lookup for plain numeric values.
+        self.literals: FrozenSet[str] = frozenset(
+            run[i:j] for run in entry["number_runs"]
+            for i in range(len(run)) if run[i].isdigit()
+            for j in range(i + 1, min(len(run), i + _MAX_LITERAL) + 1) if run[j - 1].isdigit()
+        )
+        # Per unit (None = no unit), the loosest "עד" limit and the lowest "מעל" limit:
+        # a value satisfies some clause iff it satisfies that one.
+        self.upto: Dict[Optional[str], float] = {}
+        self.above: Dict[Optional[str], float] = {}
+        for op, limit, unit in entry["thresholds"]:
+            if op == UPTO:
+                self.upto[unit] = max(limit, self.upto.get(unit, limit))
+            else:
+                self.above[unit] = min(limit, self.above.get(unit, limit))
+
+    def mentions(self, key: str, content: str) -> bool:
+        """Whether the subsection mentions a profile key (by synonym or literally)."""
+        if key in self.keys:
+            return True
+        # Keys outside the synonym table are not indexed: check the text itself
+        return key not in SYNONYMS and key in content
+
+    def contains_literal(self, text: str, content: str) -> bool:
+        """Whether `text` (a formatted profile value) appears in the subsection."""
+        if _NUMBER_TEXT.match(text):
+            return text in self.literals
+        return text in content
+
+    def threshold(self, key: str, value: float) -> Optional[str]:
+        """
+        Check a numeric profile field against the subsection's threshold clauses.
+
+        Fields listed in FIELD_UNITS only see clauses in their unit; other
+        fields see clauses without a unit.
+
+        Returns:
+            UPTO if an "עד" clause allows the value, else ABOVE if a "מעל" clause
+            is exceeded, else None.
+        """
+        unit = FIELD_UNITS.get(key)
+        limit = self.upto.get(unit)
+        if limit is not None and value <= limit:
+            return UPTO
+        limit = self.above.get(unit)
+        if limit is not None and value > limit:
+            return ABOVE
+        return None
+
+
+class ThresholdIndex:
+    """
+    Regdoc-wide interval index of threshold clauses, per unit.
+
+    Answers "which subsections does this numeric value satisfy?" with a bisect
+    per unit instead of a scan over every subsection.
+
+    Args:
+        features: Feature index entries of a regdoc, in subsection order.
+    """
+
+    def __init__(self, features: List[SubsectionFeatures]):
+        self._upto: Dict[Optional[str], Tuple[List[float], List[int]]] = {}
+        self._above: Dict[Optional[str], Tuple[List[float], List[int]]] = {}
+        for target, attr in ((self._upto, "upto"), (self._above, "above")):
+            per_unit: Dict[Optional[str], List[Tuple[float, int]]] = {}
+            for i, feats in enumerate(features):
+                for unit, limit in getattr(feats, attr).items():
+                    per_unit.setdefault(unit, []).append((limit, i))
+            for unit, pairs in per_unit.items():
+                pairs.sort()
+                target[unit] = ([limit for limit, _ in pairs], [i for _, i in pairs])
+
+    def subsections(self, key: str, value: float) -> Set[int]:
+        """
+        Return the subsections whose threshold clauses the value satisfies.
+
+        Args:
+            key: Numeric profile field.
+            value: Its value.
+
+        Returns:
+            Positions (in subsection order) with an "עד N" clause where value ≤ N
+            or a "מעל N" clause where value > N.
+        """
+        if value != value:  # NaN satisfies no clause
+            return set()
+        unit = FIELD_UNITS.get(key)
+        found: Set[int] = set()
+        if unit in self._upto:
+            limits, positions = self._upto[unit]
+            found.update(positions[bisect_left(limits, value):])
+        if unit in self._above:
+            limits, positions = self._above[unit]
+            found.update(positions[:bisect_left(limits, value)])
+        return found
+
+
+@lru_cache(maxsize=4096)
+def features_for(content: str) -> SubsectionFeatures:
+    """Features of a subsection text that has no stored index entry (cached per text)."""
+    return SubsectionFeatures(subsection_features(content))
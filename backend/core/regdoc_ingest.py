@@ -0,0 +1,172 @@
+# backend/core/regdoc_ingest.py
+"""
+Incremental re-ingestion of a new regulation edition.
+
+A new edition of a regulation usually changes a handful of subsections. Instead
+of rebuilding everything, `ingest_regdoc` parses the new text, hashes every
+chapter and subsection, diffs them against the regdoc already stored at the
+output path and:
+
+- reuses the stored normalized content and feature index entries of unchanged
+  subsections, recomputing them only for changed ones;
+- leaves the stored files untouched (same mtime, so every cache stays valid)
+  when nothing changed;
+- writes a machine-readable change set next to the regdoc
+  (`<regdoc>.changes.json`) listing added / removed / modified subsection ids
+  (the `rule_id`s used in match files), so rule compilation and cached matches
+  can be invalidated selectively.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from backend.core.hebrew_text import normalize_hebrew
+from backend.core.regdoc_features import feature_index_path, save_regdoc
+from backend.core.regulation_parser import parse_to_json
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def subsection_digest(sub: Dict[str, Any]) -> str:
+    """Hash of a subsection's parsed fields (id, title, content)."""
+    return _digest([sub.get("id"), sub.get("title"), sub.get("content", "")])
+
+
+def section_digest(section: Dict[str, Any]) -> str:
+    """Hash of a chapter: its id, title and the hashes of its subsections, in order."""
+    return _digest([
+        section.get("id"),
+        section.get("title"),
+        [subsection_digest(sub) for sub in section.get("subsections", [])],
+    ])
+
+
+def _digests_by_id(items: List[tuple]) -> Dict[str, List[str]]:
+    """Group (id, digest) pairs by id, keeping document order (ids may repeat)."""
+    grouped: Dict[str, List[str]] = {}
+    for item_id, digest in items:
+        grouped.setdefault(item_id, []).append(digest)
+    return grouped
+
+
+def _diff(old: Dict[str, List[str]], new: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    return {
+        "added": [item_id for item_id in new if item_id not in old],
+        "removed": [item_id for item_id in old if item_id not in new],
+        "modified": [item_id for item_id in new if item_id in old and old[item_id] != new[item_id]],
+    }
+
+
+def diff_regdocs(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare two editions of a regdoc.
+
+    Subsections are identified by their match `rule_id` ("<section id>-<subsection id>").
+    An id that occurs several times is compared as the ordered list of its occurrences.
+
+    Args:
+        old: The stored regdoc.
+        new: The newly parsed regdoc.
+
+    Returns:
+        Change set with 'added', 'removed' and 'modified' subsection ids,
+        the number of 'unchanged' ones and the same lists for 'sections'.
+    """
+    def subsections(regdoc):
+        return _digests_by_id([
+            (f"{section['id']}-{sub['id']}", subsection_digest(sub))
+            for section in regdoc.get("sections", [])
+            for sub in section.get("subsections", [])
+        ])
+
+    def sections(regdoc):
+        return _digests_by_id([(section["id"], section_digest(section)) for section in regdoc.get("sections", [])])
+
+    old_subs, new_subs = subsections(old), subsections(new)
+    changes = _diff(old_subs, new_subs)
+    changes["unchanged"] = sum(1 for item_id in new_subs if old_subs.get(item_id) == new_subs[item_id])
+    changes["sections"] = _diff(sections(old), sections(new))
+    return changes
+
+
+def changes_path(regdoc_path: PathLike) -> Path:
+    """Return the path of the change set stored next to a regdoc JSON file."""
+    regdoc_path = Path(regdoc_path)
+    return regdoc_path.with_name(f"{regdoc_path.stem}.changes.json")
+
+
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def ingest_regdoc(
+    text: Union[str, Iterable[str]],
+    output_path: PathLike,
+    doc_id: str,
+    title: str
+) -> Dict[str, Any]:
+    """
+    Parse a regulation edition and update the stored regdoc incrementally.
+
+    Args:
+        text: Raw regulation text of the new edition, or an iterable of lines/pages.
+        output_path: Path of the regdoc JSON (may not exist yet).
+        doc_id: Document identifier.
+        title: Document title.
+
+    Returns:
+        The change set (also written to `changes_path(output_path)`), with
+        'written' telling whether the regdoc files were rewritten.
+    """
+    output_path = Path(output_path)
+    new = parse_to_json(text, doc_id=doc_id, title=title, normalize=False)
+    old = _load_json(output_path) if output_path.exists() else None
+
+    # Normalized text of unchanged content is taken from the stored edition
+    stored_norms = {
+        sub["content"]: sub["content_norm"]
+        for section in (old or {}).get("sections", [])
+        for sub in section.get("subsections", [])
+        if "content" in sub and "content_norm" in sub
+    }
+    normalized = 0
+    for section in new["sections"]:
+        for sub in section["subsections"]:
+            if sub["content"] in stored_norms:
+                sub["content_norm"] = stored_norms[sub["content"]]
+            else:
+                sub["content_norm"] = normalize_hebrew(sub["content"])
+                normalized += 1
+
+    changes = diff_regdocs(old or {}, new)
+    changes["docId"] = doc_id
+    changes["previous_edition"] = old is not None
+    changes["written"] = old != new or not feature_index_path(output_path).exists()
+
+    if changes["written"]:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        previous_index = _load_json(feature_index_path(output_path))
+        save_regdoc(new, output_path, previous_index)
+
+    with open(changes_path(output_path), "w", encoding="utf-8") as f:
+        json.dump(changes, f, ensure_ascii=False, indent=2)
+
+    logger.info(
+        f"🔁 Ingested {doc_id}: {len(changes['added'])} added, {len(changes['removed'])} removed, "
+        f"{len(changes['modified'])} modified, {changes['unchanged']} unchanged subsections "
+        f"({normalized} normalized){'' if changes['written'] else ' – regdoc unchanged, not rewritten'}"
+    )
+    return changes
@@ -0,0 +1,182 @@
+# backend/core/regdoc_registry.py
+"""
+Process-wide registry of parsed regulation documents.
+
+Every regdoc matcher call used to open and `json.load` the regdoc file, so
+concurrent requests parsed the same multi-hundred-KB JSON in parallel. The
+registry keeps each parsed regdoc together with its derived data (subsection
+list and feature index) in a bounded, mtime-validated `FileCache`, shared by
+every caller in the process. Documents can be looked up by path or, once
+loaded, by their `docId`.
+
+Usage:
+    loaded = get_regdoc("data/processed/reg-4.2A-2022.json")
+    for (section, sub, content), features in zip(loaded.subsections, loaded.features):
+        ...
+    REGDOC_REGISTRY.stats()
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.core.binary_store import MAGIC, BinaryStore
+from backend.core.file_cache import FileCache, PathLike
+from backend.core.regdoc_features import SubsectionFeatures, iter_subsections, load_feature_index
+
+# Memory budget for parsed regdocs kept in the registry
+REGDOC_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class LoadedRegdoc:
+    """
+    A parsed regdoc and the data derived from it.
+
+    Instances are shared between requests and must be treated as read-only.
+
+    Attributes:
+        path: Absolute path of the regdoc JSON file.
+        regdoc: The parsed document.
+        sha256: Digest of the file bytes.
+        subsections: (section, subsection, content) tuples, as yielded by `iter_subsections`.
+        features: Feature index entries aligned with `subsections`.
+    """
+
+    __slots__ = ("path", "regdoc", "sha256", "subsections", "features")
+
+    def __init__(
+        self,
+        path: str,
+        regdoc: Dict[str, Any],
+        sha256: str,
+        features: List[SubsectionFeatures]
+    ):
+        self.path = path
+        self.regdoc = regdoc
+        self.sha256 = sha256
+        self.subsections: List[Tuple[Dict[str, Any], Dict[str, Any], str]] = list(iter_subsections(regdoc))
+        self.features = features
+
+    @property
+    def doc_id(self) -> Optional[str]:
+        return self.regdoc.get("docId")
+
+
+def load_regdoc(path: str) -> LoadedRegdoc:
+    """
+    Read a regdoc file (JSON or binary store) and its feature index (rebuilding a stale index).
+
+    Args:
+        path: Path of the regdoc file.
+
+    Returns:
+        The loaded regdoc.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.startswith(MAGIC):
+        with BinaryStore(path) as store:
+            regdoc = store.materialize()
+    else:
+        regdoc = json.loads(raw.decode("utf-8"))
+    sha256 = hashlib.sha256(raw).hexdigest()
+    return LoadedRegdoc(path, regdoc, sha256, load_feature_index(path, regdoc, sha256))
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Estimate the memory footprint of an object graph (containers, strings, slotted objects).
+
+    Args:
+        obj: Root object.
+
+    Returns:
+        Approximate size in bytes; shared objects are counted once.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__slots__"):
+            stack.extend(getattr(item, slot) for slot in item.__slots__ if hasattr(item, slot))
+    return total
+
+
+class RegdocRegistry(FileCache):
+    """
+    Bounded LRU cache of `LoadedRegdoc`s, keyed by path, with `docId` aliases.
+
+    Args:
+        max_bytes: Memory budget for cached regdocs (estimated with `deep_sizeof`).
+    """
+
+    def __init__(self, max_bytes: Optional[int] = REGDOC_CACHE_MAX_BYTES):
+        super().__init__(self._load, name="regdocs", max_bytes=max_bytes, sizeof=deep_sizeof)
+        self._paths_by_id: Dict[str, str] = {}
+        self._ids_lock = threading.Lock()
+
+    def _load(self, path: str) -> LoadedRegdoc:
+        loaded = load_regdoc(path)
+        if loaded.doc_id:
+            with self._ids_lock:
+                self._paths_by_id[loaded.doc_id] = path
+        return loaded
+
+    def get_by_id(self, doc_id: str) -> LoadedRegdoc:
+        """
+        Return a regdoc by its `docId` (the most recently loaded file with that id).
+
+        Args:
+            doc_id: Document identifier stored in the regdoc.
+
+        Returns:
+            The loaded regdoc, revalidated against its file.
+
+        Raises:
+            KeyError: If no regdoc with this id has been loaded.
+        """
+        with self._ids_lock:
+            path = self._paths_by_id.get(doc_id)
+        if path is None:
+            raise KeyError(f"Unknown regdoc id: {doc_id}")
+        return self.get(path)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._ids_lock:
+            stats["doc_ids"] = sorted(self._paths_by_id)
+        return stats
+
+
+REGDOC_REGISTRY = RegdocRegistry()
+
+
+def get_regdoc(path_or_id: PathLike) -> LoadedRegdoc:
+    """
+    Return a parsed regdoc from the shared registry.
+
+    Args:
+        path_or_id: Path of the regdoc JSON file, or the `docId` of an already loaded regdoc.
+
+    Returns:
+        The loaded regdoc (reloaded if the file changed on disk).
+    """
+    if not os.path.exists(path_or_id):
+        try:
+            return REGDOC_REGISTRY.get_by_id(str(path_or_id))
+        except KeyError:
+            pass  # fall through: report the missing file
+    return REGDOC_REGISTRY.get(path_or_id)
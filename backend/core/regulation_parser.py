@@ -1,12 +1,35 @@
 # backend/core/regulation_parser.py
+import logging
 import re
-import json
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List, Union
 
+from backend.core.hebrew_text import normalize_hebrew
+from backend.core.regdoc_features import save_regdoc
 
-def parse_to_json(text: str, doc_id: str, title: str) -> Dict[str, Any]:
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to the parser changes its output (invalidates cached regdocs, see source_cache)
+PARSER_VERSION = "2"
+
+# Compiled once; matched in this order (see `iter_sections`)
+SECTION_PATTERN = re.compile(r"פרק\s?(\d+)\s*[-–]\s*(.+)")
+SUBSECTION_PATTERN = re.compile(r"(\d+\.\d+)\s*[\.\-]?\s*(.+)")
+CONTENT_PATTERN = re.compile(r"(\d+\.\d+\.\d+)\s*[\.\-]?\s*(.+)")
+
+
+def _finalize_section(section: Dict[str, Any], buffers: List[List[str]], normalize: bool) -> Dict[str, Any]:
+    """Join the content buffers of a finished section and add the normalized content."""
+    for sub, parts in zip(section["subsections"], buffers):
+        sub["content"] = "".join(parts)
+        if normalize:
+            sub["content_norm"] = normalize_hebrew(sub["content"])
+    return section
+
+
+def iter_sections(chunks: Iterable[str], normalize: bool = True) -> Iterator[Dict[str, Any]]:
     """
-    Parse regulation text into a structured JSON format.
+    Parse regulation text incrementally, yielding each section once it is complete.
 
     Expected input format (simplified):
         - "פרק 1 - כותרת" → main chapter
@@ -14,72 +37,112 @@ def parse_to_json(text: str, doc_id: str, title: str) -> Dict[str, Any]:
         - "1.1.1 תוכן" → subsection content
         - Indented or unmarked lines → continuation of previous content
 
+    Note that SUBSECTION_PATTERN also matches "1.1.1 ..." lines (as subsection
+    "1.1"), so CONTENT_PATTERN only applies to lines the former rejects. The
+    order is kept as is: changing it would change the parsed documents.
+
     Args:
-        text: Raw regulation text (from PDF or Word).
-        doc_id: Unique identifier for the document.
-        title: Human-readable document title.
+        chunks: Lines of text, or larger chunks (e.g. pages) that are split into lines.
+        normalize: Whether to add `content_norm` to every subsection.
 
-    Returns:
-        A dictionary representing the structured regulation document.
+    Yields:
+        Section dictionaries in document order, each with its subsections.
     """
-    lines = text.splitlines()
-    sections = []
     current_section = None
-    current_subsection = None
-
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if not line:
-            continue
-
-        # Debug log – raw line content
-        print(f"[{i:03}] 🔹 Line: {line}")
-
-        # Detect main section (e.g., "פרק 1 - הגדרות כלליות")
-        match_section = re.match(r"פרק\s?(\d+)\s*[-–]\s*(.+)", line)
-        if match_section:
-            print(f"📘 Found Section: {match_section.group(1)} - {match_section.group(2)}")
-            if current_section:
-                sections.append(current_section)
-
-            current_section = {
-                "id": match_section.group(1),
-                "title": match_section.group(2).strip(),
-                "subsections": []
-            }
-            current_subsection = None
-            continue
-
-        # Detect subsection title (e.g., "1.1 סעיף כלשהו")
-        match_sub = re.match(r"(\d+\.\d+)\s*[\.\-]?\s*(.+)", line)
-        if match_sub:
-            print(f"📗 Found Subsection: {match_sub.group(1)} - {match_sub.group(2)}")
-            current_subsection = {
-                "id": match_sub.group(1),
-                "title": match_sub.group(2).strip(),
-                "content": ""
-            }
-            if current_section:
-                current_section["subsections"].append(current_subsection)
-            continue
-
-        # Detect subsection content line (e.g., "1.1.1 תוכן כלשהו")
-        match_content = re.match(r"(\d+\.\d+\.\d+)\s*[\.\-]?\s*(.+)", line)
-        if match_content and current_subsection:
-            print(f"📝 Found Content Line: {match_content.group(1)} → {match_content.group(2)}")
-            current_subsection["content"] += match_content.group(2).strip() + " "
-            continue
-
-        # Append unmarked line to existing content block
-        if current_subsection:
-            print(f"➡️ Appending to content: {line}")
-            current_subsection["content"] += line + " "
+    current_buffers: List[List[str]] = []
+    current_parts = None  # content buffer of the open subsection
+    line_no = 0
+    # Checked once: the per-line debug messages are not even formatted otherwise
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    for chunk in chunks:
+        for line in chunk.splitlines():
+            i = line_no
+            line_no += 1
+            line = line.strip()
+            if not line:
+                continue
+
+            if debug:
+                logger.debug(f"[{i:03}] 🔹 Line: {line}")
+
+            # Detect main section (e.g., "פרק 1 - הגדרות כלליות")
+            match_section = SECTION_PATTERN.match(line)
+            if match_section:
+                if debug:
+                    logger.debug(f"📘 Found Section: {match_section.group(1)} - {match_section.group(2)}")
+                if current_section:
+                    yield _finalize_section(current_section, current_buffers, normalize)
+
+                current_section = {
+                    "id": match_section.group(1),
+                    "title": match_section.group(2).strip(),
+                    "subsections": []
+                }
+                current_buffers = []
+                current_parts = None
+                continue
+
+            # Detect subsection title (e.g., "1.1 סעיף כלשהו")
+            match_sub = SUBSECTION_PATTERN.match(line)
+            if match_sub:
+                if debug:
+                    logger.debug(f"📗 Found Subsection: {match_sub.group(1)} - {match_sub.group(2)}")
+                current_parts = []
+                if current_section:
+                    current_section["subsections"].append({
+                        "id": match_sub.group(1),
+                        "title": match_sub.group(2).strip(),
+                        "content": ""
+                    })
+                    current_buffers.append(current_parts)
+                continue
+
+            # Detect subsection content line (e.g., "1.1.1 תוכן כלשהו")
+            match_content = CONTENT_PATTERN.match(line)
+            if match_content and current_parts is not None:
+                if debug:
+                    logger.debug(f"📝 Found Content Line: {match_content.group(1)} → {match_content.group(2)}")
+                current_parts.append(match_content.group(2).strip() + " ")
+                continue
+
+            # Append unmarked line to existing content block
+            if current_parts is not None:
+                if debug:
+                    logger.debug(f"➡️ Appending to content: {line}")
+                current_parts.append(line + " ")
 
     # Finalize last open section
     if current_section:
-        sections.append(current_section)
+        yield _finalize_section(current_section, current_buffers, normalize)
+
 
-    print(f"\n✅ Finished parsing. Total sections: {len(sections)}\n")
+def parse_to_json(
+    text: Union[str, Iterable[str]],
+    doc_id: str,
+    title: str,
+    normalize: bool = True
+) -> Dict[str, Any]:
+    """
+    Parse regulation text into a structured JSON format.
+
+    See `iter_sections` for the expected input format. Every subsection also
+    gets `content_norm`, its normalized text used for matching (see hebrew_text).
+
+    Args:
+        text: Raw regulation text (from PDF or Word), or an iterable of lines/pages.
+        doc_id: Unique identifier for the document.
+        title: Human-readable document title.
+        normalize: Whether to add `content_norm` (callers that reuse stored
+            normalized content, like regdoc_ingest, fill it in themselves).
+
+    Returns:
+        A dictionary representing the structured regulation document.
+    """
+    chunks = [text] if isinstance(text, str) else text
+    sections = list(iter_sections(chunks, normalize))
+
+    logger.info(f"✅ Finished parsing. Total sections: {len(sections)}")
     return {
         "docId": doc_id,
         "title": title,
@@ -88,19 +151,23 @@ def parse_to_json(text: str, doc_id: str, title: str) -> Dict[str, Any]:
     }
 
 
-def convert_to_json(text: str, output_path: str, doc_id: str = "auto", title: str = "Regulation Document") -> None:
+def convert_to_json(
+    text: Union[str, Iterable[str]],
+    output_path: str,
+    doc_id: str = "auto",
+    title: str = "Regulation Document"
+) -> None:
     """
     Parse regulation text and export it as a structured JSON file.
 
     Args:
-        text: Raw regulation text.
+        text: Raw regulation text, or an iterable of lines/pages (e.g. `extract_regulations.iter_pages`).
         output_path: File path to write structured JSON.
         doc_id: Document identifier (optional).
         title: Document title (optional).
     """
     parsed = parse_to_json(text, doc_id=doc_id, title=title)
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(parsed, f, ensure_ascii=False, indent=2)
+    # Writes the regdoc and its feature index (see regdoc_features)
+    save_regdoc(parsed, output_path)
 
     print(f"✅ Regulation JSON saved to: {output_path}")
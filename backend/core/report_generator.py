@@ -1,20 +1,26 @@
 # backend/core/report_generator.py
-import json
+import asyncio
 from pathlib import Path
-from backend.utils.llm_client import call_llm_with_yaml_prompt
+from typing import Optional
+from backend.utils.llm_client import acall_llm_with_yaml_prompt, call_llm_with_yaml_prompt, resolve_model
+from backend.core.binary_store import load_document
 import argparse
 
 # Path to the YAML prompt template used by the LLM
 PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "report_prompt.yaml"
 
+# Provider used when no model is requested
+REPORT_PROVIDER = "google"
 
-def generate_llm_report(profile: dict, rules: list) -> str:
+
+def generate_llm_report(profile: dict, rules: list, model: Optional[str] = None) -> str:
     """
     Generate a personalized regulatory compliance report in Hebrew using an LLM.
 
     Args:
         profile: Business profile dictionary (e.g., area, seating, gas usage).
         rules: List of matched regulatory rules for this business.
+        model: LLM provider or model name (default: REPORT_PROVIDER's configured model).
 
     Returns:
         A regulatory report string (in Hebrew).
@@ -24,43 +30,100 @@ def generate_llm_report(profile: dict, rules: list) -> str:
         "matched_rules": rules
     }
 
+    provider, model_name = resolve_model(model, REPORT_PROVIDER)
     return call_llm_with_yaml_prompt(
         yaml_path=PROMPT_PATH,
         json_input=json_input,
-        provider="google",   # Can be made configurable
-        verbose=True
+        provider=provider,
+        verbose=True,
+        model=model_name
     )
 
 
-def generate_llm_report_from_file(json_path: Path) -> str:
+async def agenerate_llm_report(profile: dict, rules: list, model: Optional[str] = None) -> str:
     """
-    Load a match result JSON file and generate a regulatory report.
+    Async variant of `generate_llm_report`: awaits the LLM call instead of blocking a thread.
 
     Args:
-        json_path: Path to the JSON file with 'profile' and 'matches'.
+        profile: Business profile dictionary.
+        rules: List of matched regulatory rules for this business.
+        model: LLM provider or model name (default: REPORT_PROVIDER's configured model).
 
     Returns:
         A regulatory report string (in Hebrew).
-
-    Raises:
-        FileNotFoundError: If the provided file does not exist.
-        ValueError: If expected keys are missing in the JSON.
     """
+    provider, model_name = resolve_model(model, REPORT_PROVIDER)
+    return await acall_llm_with_yaml_prompt(
+        yaml_path=PROMPT_PATH,
+        json_input={"business_profile": profile, "matched_rules": rules},
+        provider=provider,
+        verbose=True,
+        model=model_name
+    )
+
+
+def _load_match_file(json_path: Path) -> dict:
+    """Load a match file (JSON or binary store) and check its keys."""
     if not json_path.exists():
         raise FileNotFoundError(f"❌ JSON file not found: {json_path}")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_document(json_path)
 
     if "profile" not in data or "matches" not in data:
         raise ValueError("❌ JSON must contain 'profile' and 'matches' keys")
+    return data
+
+
+def _write_report(report_text: str, match_file_path: str, output_dir: str) -> str:
+    """Save a report next to its siblings, named after the match file; returns its path."""
+    # Derive a unique report filename based on match file name
+    profile_id = Path(match_file_path).stem.replace("match_", "")
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    report_file_path = Path(output_dir) / f"report_{profile_id}.txt"
+
+    with open(report_file_path, "w", encoding="utf-8") as f:
+        f.write(report_text)
+
+    print(f"✅ Report saved to: {report_file_path}")
+    return str(report_file_path)
+
+
+def generate_llm_report_from_file(json_path: Path, model: Optional[str] = None) -> str:
+    """
+    Load a match result JSON file and generate a regulatory report.
+
+    Args:
+        json_path: Path to the JSON file with 'profile' and 'matches'.
+        model: LLM provider or model name (see `generate_llm_report`).
+
+    Returns:
+        A regulatory report string (in Hebrew).
+
+    Raises:
+        FileNotFoundError: If the provided file does not exist.
+        ValueError: If expected keys are missing in the JSON.
+    """
+    data = _load_match_file(json_path)
 
     return generate_llm_report(
         profile=data["profile"],
-        rules=data["matches"]
+        rules=data["matches"],
+        model=model
     )
 
 
+async def agenerate_llm_report_from_file(json_path: Path, model: Optional[str] = None) -> str:
+    """
+    Async variant of `generate_llm_report_from_file` (file read in a worker thread, LLM call awaited).
+
+    Raises:
+        FileNotFoundError: If the provided file does not exist.
+        ValueError: If expected keys are missing in the JSON.
+    """
+    data = await asyncio.to_thread(_load_match_file, json_path)
+    return await agenerate_llm_report(profile=data["profile"], rules=data["matches"], model=model)
+
+
 def generate_report(match_file_path: str, output_dir: str = "data/report") -> str:
     """
     Full pipeline for generating a compliance report from match results.
@@ -77,17 +140,22 @@ def generate_report(match_file_path: str, output_dir: str = "data/report") -> st
         Path to the saved report file (as string).
     """
     report_text = generate_llm_report_from_file(Path(match_file_path))
+    return _write_report(report_text, match_file_path, output_dir)
 
-    # Derive a unique report filename based on match file name
-    profile_id = Path(match_file_path).stem.replace("match_", "")
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    report_file_path = Path(output_dir) / f"report_{profile_id}.txt"
 
-    with open(report_file_path, "w", encoding="utf-8") as f:
-        f.write(report_text)
+async def agenerate_report(match_file_path: str, output_dir: str = "data/report") -> str:
+    """
+    Async variant of `generate_report`: file I/O runs in a worker thread, the LLM call is awaited.
 
-    print(f"✅ Report saved to: {report_file_path}")
-    return str(report_file_path)
+    Args:
+        match_file_path: Path to the match JSON file.
+        output_dir: Output directory to save the report.
+
+    Returns:
+        Path to the saved report file (as string).
+    """
+    report_text = await agenerate_llm_report_from_file(Path(match_file_path))
+    return await asyncio.to_thread(_write_report, report_text, match_file_path, output_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+# backend/core/rule_conditions.py
+"""
+Compiler for `applies_if` rule conditions.
+
+Each `applies_if` entry is parsed once into a `Condition` holding a predicate
+closure and its precomputed reason strings, so evaluating a rule against a
+profile never parses keys or formats text.
+
+Supported forms:
+    "serves_alcohol": False                  → eq
+    "seats_max": 200                         → max   (legacy key suffix)
+    "business_area_sqm": {"max": 80}         → max
+    "seating_capacity": {"min": 100}         → min
+    "seats": {"min": 50, "max": 200}         → range
+    "seats": {"range": [50, 200]}            → range
+    "business_type": {"in": ["cafe", "pub"]} → in
+    "business_type": {"eq": "cafe"}          → eq
+
+Any other dict value is compared by equality, as before; so is any other key,
+including one ending in '_min' (a minimum is only written as {"min": N}).
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+EQ = "eq"
+MIN = "min"
+MAX = "max"
+RANGE = "range"
+IN = "in"
+
+
+class Condition:
+    """A single compiled `applies_if` condition."""
+
+    __slots__ = ("attr", "op", "value", "test", "passed", "failed")
+
+    def __init__(self, attr: str, op: str, value: Any, test: Callable[[Any], bool], passed: str, failed: str):
+        self.attr = attr
+        self.op = op
+        self.value = value
+        self.test = test
+        self.passed = passed
+        self.failed = failed
+
+    def __repr__(self) -> str:
+        return f"Condition({self.attr!r}, {self.op!r}, {self.value!r})"
+
+
+def _compare(check: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """Wrap an ordering check so that missing or incomparable values simply fail."""
+    def test(actual: Any) -> bool:
+        if actual is None:
+            return False
+        try:
+            return check(actual)
+        except TypeError:
+            return False
+    return test
+
+
+def _eq(attr: str, expected: Any) -> Condition:
+    return Condition(
+        attr, EQ, expected,
+        lambda actual: actual == expected,
+        f"{attr} == {expected}", f"{attr} != {expected}",
+    )
+
+
+def _max(attr: str, limit: Any) -> Condition:
+    return Condition(
+        attr, MAX, limit,
+        _compare(lambda actual: actual <= limit),
+        f"{attr} ≤ {limit}", f"{attr} > {limit}",
+    )
+
+
+def _min(attr: str, limit: Any) -> Condition:
+    return Condition(
+        attr, MIN, limit,
+        _compare(lambda actual: actual >= limit),
+        f"{attr} ≥ {limit}", f"{attr} < {limit}",
+    )
+
+
+def _range(attr: str, low: Any, high: Any) -> Condition:
+    return Condition(
+        attr, RANGE, (low, high),
+        _compare(lambda actual: low <= actual <= high),
+        f"{low} ≤ {attr} ≤ {high}", f"{attr} ∉ [{low}, {high}]",
+    )
+
+
+def _in(attr: str, options: Any) -> Condition:
+    options = tuple(options)
+    try:
+        lookup = frozenset(options)
+    except TypeError:  # unhashable members: fall back to a linear membership test
+        lookup = options
+
+    def test(actual: Any) -> bool:
+        try:
+            return actual in lookup
+        except TypeError:
+            return False
+
+    shown = list(options)
+    return Condition(attr, IN, options, test, f"{attr} ∈ {shown}", f"{attr} ∉ {shown}")
+
+
+def compile_condition(key: str, value: Any) -> Condition:
+    """
+    Compile one `applies_if` entry into a Condition.
+
+    Args:
+        key: Condition key (a profile attribute, optionally with a '_max' suffix).
+        value: Condition value (scalar, or an operator dict).
+
+    Returns:
+        The compiled Condition.
+    """
+    if isinstance(value, dict):
+        ops = set(value)
+        if ops == {"eq"}:
+            return _eq(key, value["eq"])
+        if ops == {"max"}:
+            return _max(key, value["max"])
+        if ops == {"min"}:
+            return _min(key, value["min"])
+        if ops == {"min", "max"}:
+            return _range(key, value["min"], value["max"])
+        if ops == {"range"} and len(value["range"]) == 2:
+            low, high = value["range"]
+            return _range(key, low, high)
+        if ops == {"in"} and isinstance(value["in"], (list, tuple, set, frozenset)):
+            return _in(key, value["in"])
+        return _eq(key, value)
+
+    if key.endswith("_max"):
+        return _max(key[:-len("_max")], value)
+    return _eq(key, value)
+
+
+def compile_conditions(applies_if: Dict[str, Any]) -> List[Condition]:
+    """
+    Compile a rule's `applies_if` block, preserving key order.
+
+    Args:
+        applies_if: Condition dict defined in the rule.
+
+    Returns:
+        List of compiled conditions.
+    """
+    return [compile_condition(key, value) for key, value in applies_if.items()]
+
+
+def evaluate_conditions(profile: Dict[str, Any], conditions: List[Condition]) -> Tuple[bool, List[str]]:
+    """
+    Evaluate compiled conditions against a profile.
+
+    Args:
+        profile: Business profile data.
+        conditions: Output of `compile_conditions`.
+
+    Returns:
+        A tuple: (True/False if rule applies, list of matching reasons or reasons for rejection)
+    """
+    reasons = []
+    for condition in conditions:
+        if condition.test(profile.get(condition.attr)):
+            reasons.append(condition.passed)
+        else:
+            return False, [condition.failed]
+    return True, reasons
@@ -0,0 +1,331 @@
+# backend/core/ruleset.py
+"""
+Indexed container for compiled regulatory rules.
+
+`match_rules` on a plain list walks every rule and re-evaluates its `applies_if`
+block for each profile. A RuleSet is built once from `load_compiled_rules`
+output and keeps inverted indexes over the conditions, so the cost of a profile
+lookup grows with the number of distinct condition attributes, not with the
+number of rules.
+
+Conditions are compiled into predicates by `rule_conditions` at load time.
+Index layout (rule positions are stored as bits of a Python int):
+    - eq / in conditions: attribute → value → bitmap of rules accepting it
+    - max conditions: attribute → sorted thresholds + suffix bitmaps, so all
+      rules whose limit is ≥ the profile value are found with one bisect
+    - min conditions: the same with prefix bitmaps; ranges use both
+    - conditions with unhashable or non-numeric values fall back to their
+      compiled predicate per profile
+"""
+
+import bisect
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.core.gap_rules import detect_gaps
+
+from backend.core.rule_conditions import (
+    EQ,
+    IN,
+    MAX,
+    MIN,
+    RANGE,
+    Condition,
+    compile_conditions,
+    evaluate_conditions,
+)
+
+# Priority level constants for severity ranking
+MANDATORY = 1
+RECOMMENDED = 2
+INFO = 3
+
+SEVERITY_PRIORITY = {"mandatory": MANDATORY, "recommended": RECOMMENDED, "info": INFO}
+
+
+def evaluate_applies_if(profile: Dict[str, Any], applies_if: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """
+    Evaluate whether a rule applies to the given profile.
+
+    Compiles the conditions on every call; use a RuleSet to compile them once.
+
+    Args:
+        profile: Business profile data.
+        applies_if: Condition dict defined in the rule.
+
+    Returns:
+        A tuple: (True/False if rule applies, list of matching reasons or reasons for rejection)
+    """
+    return evaluate_conditions(profile, compile_conditions(applies_if))
+
+
+def build_match(rule: Dict[str, Any], reasons: List[str]) -> Dict[str, Any]:
+    """
+    Build the match entry reported for a rule that applies to a profile.
+
+    Args:
+        rule: Compiled rule dictionary.
+        reasons: Reasons returned by the condition evaluation.
+
+    Returns:
+        Match dictionary in the format stored in match result files.
+    """
+    severity = rule.get("severity", "info")
+    return {
+        "id": rule["id"],
+        "title": rule.get("title"),
+        "authority": rule.get("authority"),
+        "severity": severity,
+        "priority": SEVERITY_PRIORITY.get(severity, INFO),
+        "applies_because": reasons,
+        "requirements": [req["name"] for req in rule.get("requirements", [])],
+        "source": rule.get("source"),
+        "tags": rule.get("tags", [])
+    }
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _is_indexable(condition: Condition) -> bool:
+    """Whether a condition can live in the bitmap indexes (hashable / numeric values)."""
+    if condition.op == EQ:
+        return _is_hashable(condition.value)
+    if condition.op == IN:
+        return all(_is_hashable(v) for v in condition.value)
+    if condition.op == RANGE:
+        return all(_is_number(v) for v in condition.value)
+    return _is_number(condition.value)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and value == value  # excludes NaN
+
+
+def _comparable(value: Any) -> Any:
+    """Map values that never satisfy an ordering condition (None, NaN) to None."""
+    if value is None or value != value:
+        return None
+    return value
+
+
+def _tighten(index: Dict[str, Dict[int, Any]], attr: str, pos: int, value: Any, pick) -> None:
+    """Store a threshold; several thresholds of one rule on one attribute keep the tightest."""
+    per_rule = index.setdefault(attr, {})
+    per_rule[pos] = pick(value, per_rule[pos]) if pos in per_rule else value
+
+
+def _group_thresholds(per_rule: Dict[int, Any]) -> Tuple[List[Any], List[int]]:
+    """Return sorted distinct thresholds and the bitmap of rules using each one."""
+    by_threshold: Dict[Any, int] = {}
+    for pos, threshold in per_rule.items():
+        by_threshold[threshold] = by_threshold.get(threshold, 0) | (1 << pos)
+    thresholds = sorted(by_threshold)
+    return thresholds, [by_threshold[t] for t in thresholds]
+
+
+def _set_bits(mask: int) -> List[int]:
+    """Return the positions of the set bits in `mask`, in ascending order."""
+    bits = bin(mask)[:1:-1]  # drop '0b' and reverse so that index == bit position
+    positions = []
+    pos = bits.find("1")
+    while pos != -1:
+        positions.append(pos)
+        pos = bits.find("1", pos + 1)
+    return positions
+
+
+class RuleSet:
+    """
+    Compiled rules plus inverted indexes over their `applies_if` conditions.
+
+    Build it once per rules file and pass it to `match_rules` in place of the
+    plain list; results are identical to the linear scan.
+
+    Args:
+        rules: Compiled rule dictionaries.
+        gap_rules: Gap table evaluated once per rule (defaults to gap_rules.GAP_RULES).
+    """
+
+    def __init__(self, rules: Iterable[Dict[str, Any]], gap_rules: Optional[List[Dict[str, Any]]] = None):
+        self.rules: List[Dict[str, Any]] = list(rules)
+
+        # A matched rule's reasons only depend on the rule itself, so the
+        # complete match entry (and the gaps it triggers) can be prepared up front.
+        self._templates: List[Dict[str, Any]] = []
+        self.gaps: List[List[Dict[str, Any]]] = []
+
+        # Compiled predicates per rule, in `applies_if` key order
+        self.conditions: List[List[Condition]] = []
+        # Per-attribute view of the indexable conditions: attr → rule position → value.
+        # eq/in conditions store the tuple of accepted values; ranges are split
+        # into a min and a max threshold.
+        self.eq_conditions: Dict[str, Dict[int, Tuple[Any, ...]]] = {}
+        self.max_conditions: Dict[str, Dict[int, Any]] = {}
+        self.min_conditions: Dict[str, Dict[int, Any]] = {}
+        # Rules that have to be evaluated per profile with their compiled predicates
+        self.residual: List[int] = []
+        # Dependency map: profile field → positions of the rules whose conditions read it
+        self.rules_by_field: Dict[str, List[int]] = {}
+
+        for pos, rule in enumerate(self.rules):
+            conditions = compile_conditions(rule.get("applies_if", {}))
+            self.conditions.append(conditions)
+            for attr in dict.fromkeys(c.attr for c in conditions):
+                self.rules_by_field.setdefault(attr, []).append(pos)
+
+            if all(_is_indexable(c) for c in conditions):
+                for condition in conditions:
+                    self._add_to_index(pos, condition)
+            else:
+                self.residual.append(pos)
+
+            template = build_match(rule, [c.passed for c in conditions])
+            self._templates.append(template)
+            self.gaps.append(detect_gaps(template, gap_rules))
+
+        self._eq: Dict[str, Tuple[int, Dict[Any, int]]] = {}
+        for attr, per_rule in self.eq_conditions.items():
+            by_value: Dict[Any, int] = {}
+            constrained = 0
+            for pos, accepted in per_rule.items():
+                for val in accepted:
+                    by_value[val] = by_value.get(val, 0) | (1 << pos)
+                constrained |= 1 << pos
+            self._eq[attr] = (constrained, by_value)
+
+        self._max: Dict[str, Tuple[int, List[Any], List[int]]] = {}
+        for attr, per_rule in self.max_conditions.items():
+            thresholds, by_threshold = _group_thresholds(per_rule)
+            # suffix[i] = every rule whose threshold is ≥ thresholds[i]
+            suffix = [0] * (len(thresholds) + 1)
+            for i in range(len(thresholds) - 1, -1, -1):
+                suffix[i] = suffix[i + 1] | by_threshold[i]
+            self._max[attr] = (suffix[0], thresholds, suffix)
+
+        self._min: Dict[str, Tuple[int, List[Any], List[int]]] = {}
+        for attr, per_rule in self.min_conditions.items():
+            thresholds, by_threshold = _group_thresholds(per_rule)
+            # prefix[i] = every rule whose threshold is < thresholds[i] (i.e. among the first i)
+            prefix = [0] * (len(thresholds) + 1)
+            for i, mask in enumerate(by_threshold):
+                prefix[i + 1] = prefix[i] | mask
+            self._min[attr] = (prefix[-1], thresholds, prefix)
+
+        residual_mask = 0
+        for pos in self.residual:
+            residual_mask |= 1 << pos
+        self._indexed_mask = ((1 << len(self.rules)) - 1) & ~residual_mask
+
+    def _add_to_index(self, pos: int, condition: Condition) -> None:
+        if condition.op == EQ:
+            self.eq_conditions.setdefault(condition.attr, {})[pos] = (condition.value,)
+        elif condition.op == IN:
+            self.eq_conditions.setdefault(condition.attr, {})[pos] = condition.value
+        elif condition.op == MAX:
+            _tighten(self.max_conditions, condition.attr, pos, condition.value, min)
+        elif condition.op == MIN:
+            _tighten(self.min_conditions, condition.attr, pos, condition.value, max)
+        elif condition.op == RANGE:
+            low, high = condition.value
+            _tighten(self.min_conditions, condition.attr, pos, low, max)
+            _tighten(self.max_conditions, condition.attr, pos, high, min)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.rules)
+
+    def candidates(self, profile: Dict[str, Any]) -> List[int]:
+        """
+        Return the positions of all rules that apply to the profile, in rule order.
+
+        Args:
+            profile: Business profile dictionary.
+
+        Returns:
+            Sorted list of rule positions.
+        """
+        ok = self._indexed_mask
+
+        for attr, (constrained, by_value) in self._eq.items():
+            try:
+                satisfied = by_value.get(profile.get(attr), 0)
+            except TypeError:  # unhashable profile value cannot equal a hashable condition
+                satisfied = 0
+            ok &= ~constrained | satisfied
+
+        for attr, (constrained, thresholds, suffix) in self._max.items():
+            actual = _comparable(profile.get(attr))
+            satisfied = 0
+            if actual is not None:
+                try:
+                    satisfied = suffix[bisect.bisect_left(thresholds, actual)]
+                except TypeError:  # value not comparable with numeric thresholds
+                    satisfied = 0
+            ok &= ~constrained | satisfied
+
+        for attr, (constrained, thresholds, prefix) in self._min.items():
+            actual = _comparable(profile.get(attr))
+            satisfied = 0
+            if actual is not None:
+                try:
+                    satisfied = prefix[bisect.bisect_right(thresholds, actual)]
+                except TypeError:
+                    satisfied = 0
+            ok &= ~constrained | satisfied
+
+        positions = _set_bits(ok)
+        residual = [
+            pos for pos in self.residual
+            if evaluate_conditions(profile, self.conditions[pos])[0]
+        ]
+        if residual:
+            positions = sorted(positions + residual)
+        return positions
+
+    def match(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Match a business profile against the indexed rules.
+
+        Args:
+            profile: Business profile dictionary.
+
+        Returns:
+            A result dictionary including matched rules and identified compliance gaps.
+        """
+        return self.build_result(profile, self.candidates(profile))
+
+    def build_result(self, profile: Dict[str, Any], positions: Iterable[int]) -> Dict[str, Any]:
+        """
+        Build the match result for a profile from the positions of its matched rules.
+
+        Args:
+            profile: Business profile dictionary.
+            positions: Positions of the applicable rules, in rule order.
+
+        Returns:
+            A result dictionary including matched rules and identified compliance gaps.
+        """
+        matches = []
+        gaps = []
+
+        for pos in positions:
+            template = self._templates[pos]
+            matches.append({
+                **template,
+                "applies_because": list(template["applies_because"]),
+                "requirements": list(template["requirements"]),
+            })
+            gaps.extend(dict(gap) for gap in self.gaps[pos])
+
+        return {
+            "profile": profile,
+            "matches": matches,
+            "gaps": gaps
+        }
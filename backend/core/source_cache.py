@@ -0,0 +1,280 @@
+# backend/core/source_cache.py
+"""
+Content-addressed on-disk cache of extracted and parsed regulation sources.
+
+`run_pipeline` used to extract the source PDF and parse it into a fresh
+`reg_<run_id>.json` on every request, although nearly every run points at the
+same regulation document. The cache stores the extracted text and the parsed
+regdoc (with its feature index) once per source content:
+
+    <root>/<source sha256>-p<PARSER_VERSION>/
+        text.txt                extracted text
+        regdoc.json             parsed regdoc (+ regdoc.features.json)
+        meta.json               source path, doc id, size, creation time
+                                (its mtime records the last use)
+
+Entries are keyed by the SHA-256 of the source bytes plus the parser version,
+so a renamed copy of a document hits the cache and a parser change misses it.
+The total size is bounded by `max_bytes`; least recently used entries are
+evicted first.
+
+Usage:
+    cached = source_cache_for("data/cache").get_or_build("data/rew/18-07-2022_4.2A.pdf")
+    run_full_match(profile, use_regdoc=True, regdoc_path=str(cached.regdoc_path))
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from backend.core.file_cache import file_sha256
+from backend.core.regulation_parser import PARSER_VERSION, convert_to_json
+from backend.scripts.extract_regulations import PAGE_SEPARATORS, iter_pages
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# Disk budget for cached sources
+SOURCE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+TEXT_NAME = "text.txt"
+REGDOC_NAME = "regdoc.json"
+META_NAME = "meta.json"
+
+
+class CachedSource(NamedTuple):
+    """Result of a cache lookup: where the extracted text and regdoc of a source live."""
+    key: str
+    text_path: Path
+    regdoc_path: Path
+    hit: bool
+
+
+def _set_last_used(meta_path: Path) -> None:
+    # Full-precision clock: the filesystem's own timestamps can be coarser than back-to-back uses
+    now = time.time_ns()
+    os.utime(meta_path, ns=(now, now))
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+class SourceCache:
+    """
+    On-disk cache of extracted text and parsed regdocs, keyed by source content.
+
+    Args:
+        root: Directory holding one subdirectory per cached source.
+        max_bytes: Disk budget for all entries (unbounded if None).
+    """
+
+    def __init__(self, root: PathLike, max_bytes: Optional[int] = SOURCE_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def key(self, source_path: PathLike) -> str:
+        """Cache key of a source file: its content hash plus the parser version."""
+        return f"{file_sha256(Path(source_path))}-p{PARSER_VERSION}"
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_or_build(
+        self,
+        source_path: PathLike,
+        doc_id: Optional[str] = None,
+        title: str = "Regulation Document"
+    ) -> CachedSource:
+        """
+        Return the cached text and regdoc of a source, extracting and parsing it on a miss.
+
+        The regdoc is stored with the `doc_id` and `title` of the run that built it.
+
+        Args:
+            source_path: PDF or DOCX regulation document.
+            doc_id: Document identifier for a newly parsed regdoc (default: derived
+                from the content hash, so different sources never share a docId).
+            title: Document title for a newly parsed regdoc.
+
+        Returns:
+            The cache entry.
+
+        Raises:
+            FileNotFoundError: If the source does not exist.
+        """
+        key = self.key(source_path)
+        entry_dir = self.root / key
+
+        # Concurrent runs on the same source wait for a single build
+        with self._key_lock(key):
+            hit = (entry_dir / META_NAME).exists()
+            if hit:
+                self._touch(entry_dir)
+            else:
+                self._build(source_path, entry_dir, doc_id or f"src-{key[:16]}", title)
+            with self._lock:
+                if hit:
+                    self._hits += 1
+                else:
+                    self._misses += 1
+
+        if not hit:
+            self._evict(keep=key)
+        logger.info(f"{'♻️ Cache hit' if hit else '🆕 Cached'} for {source_path}: {key}")
+        return CachedSource(key, entry_dir / TEXT_NAME, entry_dir / REGDOC_NAME, hit)
+
+    def _build(self, source_path: PathLike, entry_dir: Path, doc_id: str, title: str) -> None:
+        """Extract and parse a source into a temporary directory, then move it into place."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".building-", dir=self.root))
+        try:
+            # Pages stream into the parser and the text file, never held as one string
+            separator = PAGE_SEPARATORS[Path(source_path).suffix.lower()]
+            pages = iter_pages(source_path)
+            chars = 0
+
+            def written_pages():
+                nonlocal chars
+                for i, page in enumerate(pages):
+                    piece = page if i == 0 else separator + page
+                    text_file.write(piece)
+                    chars += len(piece)
+                    yield page
+
+            with open(tmp_dir / TEXT_NAME, "w", encoding="utf-8") as text_file:
+                convert_to_json(written_pages(), output_path=str(tmp_dir / REGDOC_NAME), doc_id=doc_id, title=title)
+
+            meta = {
+                "source_path": str(Path(source_path).resolve()),
+                "parser_version": PARSER_VERSION,
+                "doc_id": doc_id,
+                "chars": chars,
+                "created": time.time(),
+            }
+            (tmp_dir / META_NAME).write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+            _set_last_used(tmp_dir / META_NAME)
+            if entry_dir.exists():  # leftover without meta.json from an interrupted build
+                shutil.rmtree(entry_dir)
+            os.replace(tmp_dir, entry_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def _touch(self, entry_dir: Path) -> None:
+        """Record a use of an entry (drives LRU eviction); meta.json itself is never rewritten."""
+        _set_last_used(entry_dir / META_NAME)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        List the cache entries, least recently used first.
+
+        Returns:
+            One dict per entry with its key, size in bytes and stored metadata.
+        """
+        if not self.root.exists():
+            return []
+        entries = []
+        for entry_dir in self.root.iterdir():
+            meta_path = entry_dir / META_NAME
+            if not meta_path.is_file():
+                continue
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                last_used = meta_path.stat().st_mtime_ns / 1e9
+            except (OSError, ValueError):
+                continue
+            entries.append({"key": entry_dir.name, "bytes": _dir_size(entry_dir), **meta, "last_used": last_used})
+        return sorted(entries, key=lambda e: (e["last_used"], e["key"]))
+
+    def purge(self, key: Optional[str] = None) -> int:
+        """
+        Delete one entry, or every entry when no key is given.
+
+        Args:
+            key: Key of the entry to delete (optional).
+
+        Returns:
+            Number of deleted entries.
+        """
+        keys = [key] if key else [entry["key"] for entry in self.entries()]
+        removed = 0
+        for k in keys:
+            with self._key_lock(k):
+                entry_dir = self.root / k
+                if entry_dir.is_dir():
+                    shutil.rmtree(entry_dir)
+                    removed += 1
+        return removed
+
+    def _evict(self, keep: str) -> None:
+        """Delete least recently used entries until the cache fits its budget."""
+        if self.max_bytes is None:
+            return
+        entries = self.entries()
+        total = sum(entry["bytes"] for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry["key"] == keep:
+                continue
+            if self.purge(entry["key"]):
+                total -= entry["bytes"]
+                with self._lock:
+                    self._evictions += 1
+                logger.info(f"🗑️ Evicted cached source {entry['key']}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters, the number of entries and their size on disk."""
+        entries = self.entries()
+        with self._lock:
+            return {
+                "name": "sources",
+                "root": str(self.root),
+                "entries": len(entries),
+                "bytes": sum(entry["bytes"] for entry in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+_CACHES: Dict[str, SourceCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def source_cache_for(root: PathLike) -> SourceCache:
+    """
+    Return the process-wide cache for a cache directory (one instance, and one set of locks, per directory).
+
+    Args:
+        root: Cache directory.
+
+    Returns:
+        The shared `SourceCache`.
+    """
+    key = os.path.abspath(root)
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            _CACHES[key] = SourceCache(key)
+        return _CACHES[key]
+
+
+def source_caches() -> List[SourceCache]:
+    """Return the caches opened so far in this process."""
+    with _CACHES_LOCK:
+        return list(_CACHES.values())
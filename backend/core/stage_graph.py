@@ -0,0 +1,355 @@
+# backend/core/stage_graph.py
+"""
+Small DAG executor for multi-stage runs, with checkpoints, resume and timings.
+
+A run is a list of `Stage`s, each declaring the stages it depends on and a
+pydantic model for its output. Stages run in dependency order; every stage
+receives the run parameters and the outputs of its dependencies, and its
+validated output is checkpointed to `<run_dir>/<stage>.json` together with its
+wall-clock time and the CPU time of the thread that ran it. A run summary
+(`run.json`) records the parameters and the status and timings of every stage.
+
+Re-running the same run directory reuses the checkpoints of completed stages,
+so a failure in the last stage does not throw the earlier ones away. Without
+a run directory (`run_dir=None`) nothing is written: the outputs only live in
+memory and the run cannot be resumed.
+`resume_from` forces a stage, and everything downstream of it, to run again.
+`StageGraph.arun` is the asyncio variant: synchronous stages run in an
+executor and stages with an `arun` coroutine are awaited; checkpoints are
+written in the background while the next stage runs. An `on_stage`
+callback is told which stage is about to run (e.g. for progress reporting);
+an exception it raises stops the run before that stage.
+
+Usage:
+    stages = [
+        Stage("text", TextOutput, lambda params, deps: TextOutput(text=...)),
+        Stage("words", WordsOutput, lambda params, deps: WordsOutput(n=len(deps["text"].text.split())), ["text"]),
+    ]
+    outputs = StageGraph(stages).run(run_dir, params)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import Executor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+RUN_FILE = "run.json"
+
+
+class Stage:
+    """
+    One node of a stage graph.
+
+    Args:
+        name: Stage name (also the checkpoint file name).
+        output: Pydantic model of the stage output.
+        run: Callable `(params, deps) -> output`, where `deps` maps dependency names to their outputs.
+        depends_on: Names of the stages whose outputs this stage consumes.
+        arun: Optional coroutine function with the same signature, used by `StageGraph.arun`
+            (e.g. for I/O-bound stages such as LLM calls).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        output: Type[BaseModel],
+        run: Callable[[Dict[str, Any], Dict[str, BaseModel]], BaseModel],
+        depends_on: Optional[List[str]] = None,
+        arun: Optional[Callable[[Dict[str, Any], Dict[str, BaseModel]], Awaitable[BaseModel]]] = None
+    ):
+        self.name = name
+        self.output = output
+        self.run = run
+        self.depends_on = depends_on or []
+        self.arun = arun
+
+
+class StageFailed(RuntimeError):
+    """A stage raised; the checkpoints of the stages before it are kept."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"❌ Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Replace a JSON file atomically (a crash never leaves a half-written checkpoint)."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def read_run(run_dir: Path) -> Dict[str, Any]:
+    """
+    Read the summary of a run.
+
+    Raises:
+        FileNotFoundError: If the run directory has no summary.
+    """
+    with open(Path(run_dir) / RUN_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StageGraph:
+    """
+    Executor for a list of stages.
+
+    Args:
+        stages: The stages, in any order; dependencies must name stages of the graph.
+
+    Raises:
+        ValueError: If a dependency is unknown or the stages contain a cycle.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        visiting: Set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"❌ Stage graph has a cycle through '{name}'")
+            if name not in self.stages:
+                raise ValueError(f"❌ Unknown stage: '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def downstream(self, name: str) -> Set[str]:
+        """Return `name` and every stage that depends on it, directly or not."""
+        if name not in self.stages:
+            raise ValueError(f"❌ Unknown stage: '{name}'")
+        affected = {name}
+        for stage_name in self.order:
+            if any(dep in affected for dep in self.stages[stage_name].depends_on):
+                affected.add(stage_name)
+        return affected
+
+    def run(
+        self,
+        run_dir: Optional[Path],
+        params: Dict[str, Any],
+        resume_from: Optional[str] = None,
+        on_stage: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, BaseModel]:
+        """
+        Run the stages in dependency order, reusing the checkpoints in `run_dir`.
+
+        Args:
+            run_dir: Directory of the run's checkpoints and summary (created if needed);
+                None runs without checkpoints.
+            params: JSON-serializable run parameters, passed to every stage.
+            resume_from: Stage to run again together with all its downstream
+                stages, even if they have checkpoints.
+            on_stage: Called with the name of each stage before it runs (not for reused stages).
+
+        Returns:
+            The output of every stage, by name.
+
+        Raises:
+            StageFailed: If a stage raises (the summary records the failure).
+        """
+        run = _Run(self, run_dir, params, resume_from)
+        try:
+            for name in self.order:
+                if not run.reuse(name):
+                    stage = self.stages[name]
+                    if on_stage is not None:
+                        on_stage(name)
+                    run.record(name, lambda: _timed(stage.run, params, run.deps(name)))
+        finally:
+            run.finish()
+        return run.outputs
+
+    async def arun(
+        self,
+        run_dir: Optional[Path],
+        params: Dict[str, Any],
+        resume_from: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        on_stage: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, BaseModel]:
+        """
+        Async variant of `run`: stages with an `arun` coroutine are awaited, the
+        others (CPU-bound work) run in `executor` so the event loop stays free.
+
+        Args:
+            run_dir: Directory of the run's checkpoints and summary (created if needed);
+                None runs without checkpoints.
+            params: JSON-serializable run parameters, passed to every stage.
+            resume_from: Stage to run again together with all its downstream stages.
+            executor: Executor for synchronous stages (the loop's default executor if None).
+            on_stage: Called with the name of each stage before it runs (not for reused stages).
+
+        Returns:
+            The output of every stage, by name.
+
+        Raises:
+            StageFailed: If a stage raises (the summary records the failure).
+        """
+        loop = asyncio.get_running_loop()
+        run = _Run(self, run_dir, params, resume_from, defer_writes=True)
+        writes = []
+        try:
+            for name in self.order:
+                if run.reuse(name):
+                    continue
+                stage = self.stages[name]
+                if on_stage is not None:
+                    on_stage(name)
+                deps = run.deps(name)
+                try:
+                    if stage.arun is not None:
+                        timed = await _atimed(stage.arun, params, deps)
+                    else:
+                        timed = await loop.run_in_executor(executor, _timed, stage.run, params, deps)
+                except Exception as e:
+                    timed = e
+                try:
+                    run.record(name, lambda: timed)
+                finally:
+                    writes.extend(loop.run_in_executor(executor, _write_json, *write) for write in run.take_writes())
+        finally:
+            # The summary is written last, once every checkpoint it refers to is on disk
+            await asyncio.gather(*writes)
+            await loop.run_in_executor(executor, run.finish)
+        return run.outputs
+
+
+def _timed(func: Callable, *args) -> Tuple[Any, float, float]:
+    """Call `func` and return (result, wall seconds, CPU seconds of the calling thread)."""
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        result = func(*args)
+    except Exception as e:
+        e.timings = (time.perf_counter() - wall, time.thread_time() - cpu)
+        raise
+    return result, time.perf_counter() - wall, time.thread_time() - cpu
+
+
+async def _atimed(func: Callable[..., Awaitable], *args) -> Tuple[Any, float, float]:
+    """Await `func`; like `_timed`, but the CPU time includes other tasks run by the loop meanwhile."""
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        result = await func(*args)
+    except Exception as e:
+        e.timings = (time.perf_counter() - wall, time.thread_time() - cpu)
+        raise
+    return result, time.perf_counter() - wall, time.thread_time() - cpu
+
+
+class _Run:
+    """Checkpoint and summary bookkeeping of one `StageGraph` run."""
+
+    def __init__(
+        self,
+        graph: StageGraph,
+        run_dir: Optional[Path],
+        params: Dict[str, Any],
+        resume_from: Optional[str],
+        defer_writes: bool = False
+    ):
+        self.graph = graph
+        self.run_dir = None if run_dir is None else Path(run_dir)
+        if self.run_dir is not None:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.rerun = graph.downstream(resume_from) if resume_from else set()
+        self.summary = {"params": params, "started_at": datetime.now().isoformat(timespec="seconds"), "stages": {}}
+        self.outputs: Dict[str, BaseModel] = {}
+        self.start = time.perf_counter()
+        # With defer_writes, checkpoints are collected for the caller to write (see take_writes)
+        self.deferred: Optional[List[Tuple[Path, Any]]] = [] if defer_writes else None
+
+    def take_writes(self) -> List[Tuple[Path, Any]]:
+        """Return and forget the deferred checkpoint writes, as (path, data) pairs."""
+        writes, self.deferred = self.deferred, []
+        return writes
+
+    def deps(self, name: str) -> Dict[str, BaseModel]:
+        return {dep: self.outputs[dep] for dep in self.graph.stages[name].depends_on}
+
+    def reuse(self, name: str) -> bool:
+        """Load the stage's checkpoint unless the stage must run; returns whether it was reused."""
+        if not self._load_checkpoint(name):
+            # Whatever consumes a fresh output must not reuse results computed from the old one
+            self.rerun |= self.graph.downstream(name)
+            return False
+        return True
+
+    def _load_checkpoint(self, name: str) -> bool:
+        if self.run_dir is None or name in self.rerun:
+            return False
+        checkpoint = self.run_dir / f"{name}.json"
+        if not checkpoint.exists():
+            return False
+        with open(checkpoint, encoding="utf-8") as f:
+            saved = json.load(f)
+        try:
+            self.outputs[name] = self.graph.stages[name].output.model_validate(saved["output"])
+        except (KeyError, ValidationError) as e:
+            # e.g. written by an older version of the stage: run it again
+            logger.warning(f"⚠️ Ignoring stale checkpoint of stage '{name}': {e}")
+            return False
+        self.summary["stages"][name] = {**saved["timings"], "status": "reused"}
+        logger.info(f"♻️ Stage '{name}' reused from checkpoint")
+        return True
+
+    def record(self, name: str, execute: Callable[[], Any]) -> None:
+        """
+        Run `execute` (returning (output, wall, cpu) or an exception) and checkpoint the stage.
+
+        Raises:
+            StageFailed: If the stage raised.
+        """
+        try:
+            result = execute()
+            if isinstance(result, BaseException):
+                raise result
+            output, wall_s, cpu_s = result
+            output = self.graph.stages[name].output.model_validate(output)
+        except Exception as e:
+            wall_s, cpu_s = getattr(e, "timings", (0.0, 0.0))
+            self.summary["stages"][name] = {
+                "status": "failed", "error": str(e), "wall_s": round(wall_s, 4), "cpu_s": round(cpu_s, 4),
+            }
+            raise StageFailed(name, e) from e
+
+        timings = {"wall_s": round(wall_s, 4), "cpu_s": round(cpu_s, 4)}
+        if self.run_dir is not None:
+            checkpoint = (self.run_dir / f"{name}.json", {"stage": name, "output": output.model_dump(mode="json"), "timings": timings})
+            if self.deferred is None:
+                _write_json(*checkpoint)
+            else:
+                self.deferred.append(checkpoint)
+        self.outputs[name] = output
+        self.summary["stages"][name] = {**timings, "status": "completed"}
+        logger.info(f"⏱️ Stage '{name}' completed in {timings['wall_s']:.3f}s (CPU {timings['cpu_s']:.3f}s)")
+
+    def finish(self) -> None:
+        self.summary["wall_s"] = round(time.perf_counter() - self.start, 4)
+        self.summary["status"] = "completed" if len(self.outputs) == len(self.graph.order) else "failed"
+        if self.run_dir is not None:
+            _write_json(self.run_dir / RUN_FILE, self.summary)
@@ -0,0 +1,81 @@
+# backend/core/text_search.py
+"""
+Multi-pattern substring search (Aho–Corasick).
+
+Builds one automaton over many patterns so a text is scanned once, instead of
+once per pattern, and reports the labels of every pattern that occurs in it
+(overlapping occurrences included).
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    Aho–Corasick automaton mapping patterns to labels.
+
+    The goto/failure functions are folded into a full transition table over the
+    patterns' alphabet, so scanning costs one dict lookup per character.
+
+    Args:
+        patterns: Iterable of (pattern, label) pairs. A label may be shared by
+            several patterns; empty patterns are ignored.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[Hashable]] = [set()]
+
+        for pattern, label in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(label)
+
+        # Breadth-first pass: failure links, inherited outputs and the full
+        # transition table (missing edges follow the failure link).
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                delta[state][ch] = nxt
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs: List[FrozenSet[Hashable]] = [frozenset(o) for o in outputs]
+
+    def labels_in(self, text: str) -> Set[Hashable]:
+        """
+        Return the labels of all patterns occurring in `text`.
+
+        Args:
+            text: Text to scan.
+
+        Returns:
+            Set of labels (empty if no pattern occurs).
+        """
+        delta = self._delta
+        outputs = self._outputs
+        found: Set[Hashable] = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
@@ -1,4 +1,5 @@
 # backend/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -6,7 +7,9 @@ import logging
 import os
 
 from backend.utils.logging_config import setup_logging
-from backend.routes import questionnaire, report, pipeline
+from backend.core.full_pipeline import wait_for_saves
+from backend.core.job_queue import JOB_QUEUE
+from backend.routes import questionnaire, report, pipeline, matches, documents, jobs
 
 # ===============================
 # Logging
@@ -14,10 +17,24 @@ from backend.routes import questionnaire, report, pipeline
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# ===============================
+# Background job workers
+# ===============================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the workers with the app so jobs queued before a restart are picked up
+    JOB_QUEUE.start()
+    yield
+    JOB_QUEUE.stop(timeout=5)
+    # Match/report files of finished requests are written in the background
+    await wait_for_saves()
+
+
 # ===============================
 # FastAPI App
 # ===============================
 app = FastAPI(
+    lifespan=lifespan,
     title="A-Impact Business Licensing API",
     version="1.0.0",
     description=(
@@ -43,6 +60,9 @@ app.add_middleware(
 app.include_router(questionnaire.router, prefix="/api/v1", tags=["questionnaire"])
 app.include_router(report.router, prefix="/api/v1", tags=["report"])
 app.include_router(pipeline.router, prefix="/api/v1", tags=["pipeline"])
+app.include_router(matches.router, prefix="/api/v1", tags=["matches"])
+app.include_router(documents.router, prefix="/api/v1", tags=["documents"])
+app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
 
 # ===============================
 # Static Frontend
@@ -65,6 +85,9 @@ def root():
             "/api/v1/questionnaire",
             "/api/v1/report/generate",
             "/api/v1/pipeline/run_json",
+            "/api/v1/match/stream",
+            "/api/v1/documents",
+            "/api/v1/jobs",
             "/frontend/index.html"
         ]
     }
@@ -0,0 +1,92 @@
+# backend/routes/documents.py
+"""
+API routes for the regulation document registry.
+
+Documents are ingested once and then referenced by `doc_id` (and optionally
+`version`) from the pipeline routes, which skip extraction and parsing.
+Sources are only read from under `SOURCE_DIRS` (raw documents and parsed
+regdocs), so clients cannot register arbitrary server files and read them back.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from backend.core.document_registry import DOCUMENT_REGISTRY
+from backend.routes.matches import REGDOC_DIR
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Directories the API may ingest sources from: raw regulation documents and parsed regdocs
+SOURCE_DIRS = [Path("data/rew"), REGDOC_DIR]
+
+
+def _resolve_source(source_path: str) -> Path:
+    """
+    Turn a client's source path into a file under SOURCE_DIRS.
+
+    Raises:
+        HTTPException: 400 for paths outside SOURCE_DIRS, 404 for missing files.
+    """
+    path = Path(source_path).resolve()
+    if not any(path.is_relative_to(root.resolve()) for root in SOURCE_DIRS):
+        logger.warning(f"❌ Rejected document source outside {SOURCE_DIRS}: {source_path}")
+        raise HTTPException(
+            status_code=400, detail=f"Source must be a file under {', '.join(map(str, SOURCE_DIRS))}"
+        )
+    if not path.is_file():
+        logger.warning(f"❌ Document source not found: {source_path}")
+        raise HTTPException(status_code=404, detail=f"Source not found: {source_path}")
+    return path
+
+
+class RegisterDocumentRequest(BaseModel):
+    """
+    Request model for ingesting a regulation document into the registry.
+    """
+    source_path: str = Field(..., description="Path to the PDF/DOCX source or a parsed regdoc JSON")
+    doc_id: str = Field(..., description="Document identifier, e.g. reg-4.2A-2022")
+    title: Optional[str] = Field(None, description="Document title (optional)")
+
+
+@router.get("/documents")
+def list_documents():
+    """
+    List the registered regulation documents and their versions.
+    """
+    return {"documents": DOCUMENT_REGISTRY.documents()}
+
+
+@router.get("/documents/{doc_id}")
+def get_document(doc_id: str, version: Optional[int] = None):
+    """
+    Return the record of a registered document version (latest by default).
+    """
+    try:
+        return DOCUMENT_REGISTRY.resolve(doc_id, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+
+@router.post("/documents")
+def register_document(request: RegisterDocumentRequest):
+    """
+    Ingest a regulation document as a new version of `doc_id` (no-op if its content is unchanged).
+
+    Returns:
+        The version record, with status "registered" or "unchanged".
+    """
+    source_path = _resolve_source(request.source_path)
+    try:
+        return DOCUMENT_REGISTRY.register(source_path, request.doc_id, request.title)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.exception("❌ Document registration failed")
+        raise HTTPException(status_code=500, detail=f"Document registration failed: {str(e)}")
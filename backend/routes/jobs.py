@@ -0,0 +1,102 @@
+# backend/routes/jobs.py
+"""
+API routes for background pipeline jobs (see backend/core/job_queue.py).
+
+Submitting a job returns its id at once; the job is then followed by polling
+`GET /jobs/{job_id}` or through a Server-Sent Events stream of `progress`
+events (status and current stage), closed by a `done` event with the job.
+"""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.core.job_queue import JOB_QUEUE, TERMINAL
+from backend.routes.pipeline import PipelineRunJSONRequest, _check_registered
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Seconds between two looks at a job's state in the progress stream
+EVENTS_POLL_INTERVAL = 0.5
+
+
+def _get_job(job_id: str) -> dict:
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@router.post("/jobs", status_code=202)
+def submit_job(req: PipelineRunJSONRequest):
+    """
+    Queue a pipeline run for an inlined JSON profile (same body as /pipeline/run_json).
+
+    An identical submission that is still queued or running is not run twice:
+    its job is returned with "deduplicated": true.
+
+    Returns:
+        JSON with the job id and status.
+    """
+    _check_registered(req)
+    job, created = JOB_QUEUE.submit(req.model_dump(mode="json"))
+    return {"job_id": job["id"], "status": job["status"], "deduplicated": not created}
+
+
+@router.get("/jobs")
+def list_jobs(status: Optional[str] = None, limit: int = 100):
+    """
+    List the most recent jobs, optionally filtered by status.
+    """
+    return {"jobs": JOB_QUEUE.jobs(status=status, limit=limit)}
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Return a job: status, current stage, and its result (run id, report) or error.
+    """
+    return _get_job(job_id)
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    """
+    Cancel a job. A queued job is cancelled at once; a running one stops
+    before its next stage (its status stays "running" until then).
+    """
+    _get_job(job_id)
+    return JOB_QUEUE.cancel(job_id)
+
+
+async def _events(job_id: str) -> AsyncIterator[str]:
+    last = None
+    while True:
+        job = await asyncio.to_thread(JOB_QUEUE.get, job_id)
+        progress = {"status": job["status"], "stage": job["stage"], "cancel_requested": job["cancel_requested"]}
+        if progress != last:
+            yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+            last = progress
+        if job["status"] in TERMINAL:
+            yield f"event: done\ndata: {json.dumps(job, ensure_ascii=False)}\n\n"
+            return
+        await asyncio.sleep(EVENTS_POLL_INTERVAL)
+
+
+@router.get("/jobs/{job_id}/events")
+def job_events(job_id: str):
+    """
+    Stream a job's progress as Server-Sent Events until it finishes.
+
+    Returns:
+        `progress` events ({"status", "stage", "cancel_requested"}) whenever
+        they change, then a `done` event carrying the full job.
+    """
+    _get_job(job_id)
+    logger.info(f"📡 Streaming progress of job {job_id}")
+    return StreamingResponse(_events(job_id), media_type="text/event-stream")
@@ -0,0 +1,113 @@
+# backend/routes/matches.py
+"""
+API route for streaming regdoc match results.
+
+Matches are sent as soon as each regulation subsection is evaluated, so the
+frontend can render the first requirements immediately while the rest of the
+document is still being scanned. Two wire formats are supported:
+
+- NDJSON (`application/x-ndjson`): one JSON object per line.
+- Server-Sent Events (`text/event-stream`): `match` events, then a `done` event.
+
+The regdoc is named by a registered doc id (see /documents) or by a path
+under `REGDOC_DIR`; anything else is rejected, so clients cannot make the
+server read (or write feature indexes next to) arbitrary files.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, Literal
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from backend.core.document_registry import DOCUMENT_REGISTRY
+from backend.core.matcher_from_regdoc import iter_regdoc_matches
+from backend.core.regdoc_registry import get_regdoc
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGDOC_PATH = "data/processed/reg-4.2A-2022.json"
+
+# Regdoc paths sent by clients must resolve inside this directory
+REGDOC_DIR = Path("data/processed")
+
+
+class MatchStreamRequest(BaseModel):
+    """
+    Request model for streaming matches of a business profile against a regdoc.
+    """
+    profile: Dict[str, Any] = Field(..., description="Business profile attributes")
+    regdoc_path: str = Field(
+        default=DEFAULT_REGDOC_PATH,
+        description="Registered doc id, or path of a structured regulation JSON under data/processed"
+    )
+    format: Literal["ndjson", "sse"] = Field(default="ndjson", description="Stream format")
+
+
+def _resolve_regdoc(regdoc_ref: str) -> str:
+    """
+    Turn a client's regdoc reference into a file path the server may read.
+
+    Raises:
+        HTTPException: 400 for paths outside REGDOC_DIR, 404 for missing files.
+    """
+    try:
+        return DOCUMENT_REGISTRY.resolve(regdoc_ref)["regdoc_path"]
+    except KeyError:
+        pass
+
+    path = Path(regdoc_ref).resolve()
+    if not path.is_relative_to(REGDOC_DIR.resolve()):
+        logger.warning(f"❌ Rejected regdoc outside {REGDOC_DIR}: {regdoc_ref}")
+        raise HTTPException(status_code=400, detail=f"Regdoc must be a registered doc id or a file under {REGDOC_DIR}")
+    if not path.is_file():
+        logger.warning(f"❌ Regdoc not found: {regdoc_ref}")
+        raise HTTPException(status_code=404, detail=f"Regdoc not found: {regdoc_ref}")
+    return str(path)
+
+
+def _ndjson(matches: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    total = 0
+    for match in matches:
+        total += 1
+        yield json.dumps({"type": "match", "match": match}, ensure_ascii=False) + "\n"
+    yield json.dumps({"type": "done", "total_matches": total}) + "\n"
+
+
+def _sse(matches: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    total = 0
+    for match in matches:
+        total += 1
+        yield f"event: match\ndata: {json.dumps(match, ensure_ascii=False)}\n\n"
+    yield f"event: done\ndata: {json.dumps({'total_matches': total})}\n\n"
+
+
+@router.post("/match/stream")
+def stream_matches(request: MatchStreamRequest):
+    """
+    Stream the applicable rules of a regulation document for a business profile.
+
+    Request Body:
+    {
+      "profile": {"uses_gas": true, "num_seats": 40},
+      "regdoc_path": "reg-4.2A-2022",  // optional: doc id, or path under data/processed
+      "format": "ndjson"                                    // or "sse"
+    }
+
+    Returns:
+        Streaming response with one item per match, followed by a final
+        `done` item carrying the total number of matches.
+    """
+    # Resolve the regdoc before streaming so a bad reference is a proper 400 / 404
+    loaded = get_regdoc(_resolve_regdoc(request.regdoc_path))
+
+    logger.info(f"📡 Streaming matches from {loaded.path} as {request.format}")
+    matches = iter_regdoc_matches(request.profile, loaded)
+
+    if request.format == "sse":
+        return StreamingResponse(_sse(matches), media_type="text/event-stream")
+    return StreamingResponse(_ndjson(matches), media_type="application/x-ndjson")
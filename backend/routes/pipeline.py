@@ -1,45 +1,69 @@
 # backend/routes/pipeline.py
+import asyncio
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 import logging
-import json
-from pathlib import Path
-import tempfile
+from typing import Literal, Optional
 
-from backend.core.full_pipeline import run_pipeline
+from backend.core.document_registry import DOCUMENT_REGISTRY
+from backend.core.full_pipeline import STAGES, aresume_pipeline, arun_pipeline, generate_run_id, run_dir_for
+from backend.core.stage_graph import read_run
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+# === Regulation to run against: a source document, or a registered document id ===
+class RegulationSource(BaseModel):
+    source_doc_path: Optional[str] = Field(None, description="Path to the regulatory source document")
+    doc_id: Optional[str] = Field(None, description="Id of a registered regulation document (see /documents)")
+    version: Optional[int] = Field(None, description="Version of the registered document (default: latest)")
+
+    @model_validator(mode="after")
+    def _one_source(self):
+        if (self.source_doc_path is None) == (self.doc_id is None):
+            raise ValueError("Pass exactly one of source_doc_path and doc_id")
+        return self
+
+
+def _check_registered(req: RegulationSource) -> None:
+    """Reject unknown document ids / versions with a 404 before running anything."""
+    if req.doc_id is not None:
+        try:
+            DOCUMENT_REGISTRY.resolve(req.doc_id, req.version)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=e.args[0])
+
+
 # === Request model for path-based pipeline run ===
-class PipelineRequest(BaseModel):
+class PipelineRequest(RegulationSource):
     profile_path: str = Field(..., description="Path to the business profile JSON file")
-    source_doc_path: str = Field(..., description="Path to the regulatory source document")
     output_dir: str = Field(..., description="Directory to store intermediate and final outputs")
 
 
 @router.post("/pipeline/run")
-def run_full_pipeline(req: PipelineRequest):
+async def run_full_pipeline(req: PipelineRequest):
     """
     Run the full pipeline (Stages 1–4) using file paths only.
 
     Returns:
-        JSON with report path if successful.
+        JSON with the path of the saved report if successful.
     """
+    # The registry lookup reads the index file: keep it off the event loop
+    await asyncio.to_thread(_check_registered, req)
     try:
-        logger.info(f"Running pipeline for profile={req.profile_path}, source_doc={req.source_doc_path}")
-        report_path = run_pipeline(
+        logger.info(f"Running pipeline for profile={req.profile_path}, source_doc={req.source_doc_path or req.doc_id}")
+        result = await arun_pipeline(
             profile_path=req.profile_path,
             source_doc_path=req.source_doc_path,
             output_dir=req.output_dir,
+            doc_id=req.doc_id,
+            version=req.version,
+            run_id=generate_run_id(),
+            background_saves=False,
         )
-        report_path = Path(report_path).resolve()
-
-        if not report_path.exists():
-            raise HTTPException(status_code=500, detail=f"Report not found at {report_path}")
-
-        return {"status": "success", "report_path": str(report_path)}
+        # The returned path is the only output: the report file is written before responding
+        return {"status": "success", "run_id": result.run_id, "report_path": result.report_path}
 
     except Exception as e:
         logger.exception("Pipeline run failed")
@@ -63,53 +87,84 @@ class BusinessProfile(BaseModel):
     is_kosher: bool = False
 
 
-class PipelineRunJSONRequest(BaseModel):
+class PipelineRunJSONRequest(RegulationSource):
     profile: BusinessProfile
-    source_doc_path: str
     output_dir: str
+    save_outputs: bool = Field(True, description="Also save the match and report files (in the background)")
+    checkpoint: bool = Field(False, description="Checkpoint the stage outputs so the run can be resumed")
 
 
 @router.post("/pipeline/run_json")
-def run_full_pipeline_json(req: PipelineRunJSONRequest):
+async def run_full_pipeline_json(req: PipelineRunJSONRequest):
     """
     Run the full pipeline using an inlined JSON profile (no file upload needed).
 
     Returns:
-        JSON with report path, report text, and original profile data.
+        JSON with report text, report path (None without `save_outputs`), and original profile data.
     """
+    await asyncio.to_thread(_check_registered, req)
     try:
-        # Save profile to a temporary file to simulate file-based input
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode="w", encoding="utf-8") as tmp:
-            json.dump(req.profile.dict(), tmp, ensure_ascii=False, indent=2)
-            tmp_path = Path(tmp.name)
-
-        logger.info(f"Running pipeline with JSON profile={req.profile.business_name}, saved at {tmp_path}")
+        logger.info(f"Running pipeline with JSON profile={req.profile.business_name}")
 
-        report_path = run_pipeline(
-            profile_path=tmp_path,
+        # The profile and the stage outputs stay in memory; checkpoints are only written on request
+        result = await arun_pipeline(
+            profile=req.profile.model_dump(),
             source_doc_path=req.source_doc_path,
             output_dir=req.output_dir,
+            doc_id=req.doc_id,
+            version=req.version,
+            run_id=generate_run_id(),
+            save_outputs=req.save_outputs,
+            checkpoint=req.checkpoint,
         )
-        report_path = Path(report_path).resolve()
-
-        if not report_path.exists():
-            logger.error(f"❌ Report file not found: {report_path}")
-            raise HTTPException(status_code=500, detail=f"Report file not found at {report_path}")
-
-        try:
-            with open(report_path, "r", encoding="utf-8") as f:
-                report_text = f.read()
-        except Exception as e:
-            logger.error(f"❌ Failed to read report file {report_path}: {e}")
-            raise HTTPException(status_code=500, detail=f"Failed to read report file: {e}")
-
         return {
             "status": "success",
-            "report_path": str(report_path),
-            "report_text": report_text,
-            "profile": req.profile.dict(),
+            "run_id": result.run_id,
+            "report_path": result.report_path,
+            "report_text": result.report_text,
+            "profile": result.profile,
         }
 
     except Exception as e:
         logger.exception("Pipeline run (JSON) failed")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# === Resuming checkpointed runs (see backend/core/stage_graph.py) ===
+class PipelineResumeRequest(BaseModel):
+    run_id: str = Field(..., description="Id of the run to resume")
+    resume_from: Optional[Literal[STAGES]] = Field(
+        None, description="Stage to re-run with everything after it (default: the stages that did not complete)"
+    )
+    output_dir: str = Field(default="data", description="Output base directory of the run")
+
+
+@router.post("/pipeline/resume")
+async def resume_full_pipeline(req: PipelineResumeRequest):
+    """
+    Resume an earlier pipeline run from its checkpoints, e.g. to retry only the report.
+
+    Returns:
+        JSON with report path if successful.
+    """
+    if not (run_dir_for(req.output_dir, req.run_id) / "run.json").exists():
+        raise HTTPException(status_code=404, detail=f"Unknown run: {req.run_id}")
+    try:
+        result = await aresume_pipeline(
+            req.run_id, resume_from=req.resume_from, output_dir=req.output_dir, background_saves=False
+        )
+        return {"status": "success", "run_id": req.run_id, "report_path": result.report_path}
+    except Exception as e:
+        logger.exception("Pipeline resume failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/pipeline/runs/{run_id}")
+def get_pipeline_run(run_id: str, output_dir: str = "data"):
+    """
+    Return the summary of a pipeline run: parameters, status and per-stage wall/CPU timings.
+    """
+    try:
+        return read_run(run_dir_for(output_dir, run_id))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Unknown run: {run_id}")
@@ -9,9 +9,13 @@ by referencing a precomputed match file (e.g., match_restaurant_eyal.json).
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from pathlib import Path
+from typing import Optional
 import logging
 
-from backend.core.report_generator import generate_llm_report_from_file
+from backend.core.matcher import RULESET_CACHE
+from backend.core.regdoc_registry import REGDOC_REGISTRY
+from backend.core.report_generator import agenerate_llm_report_from_file
+from backend.core.source_cache import source_caches
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -25,11 +29,13 @@ class ReportFromFileRequest(BaseModel):
     Request model for generating a report from an existing JSON match file.
     """
     filename: str = Field(..., description="Name of the match JSON file (e.g., match_restaurant_eyal.json)")
-    model: str = Field(default="gpt-4", description="LLM provider or model name to use (optional)")
+    model: Optional[str] = Field(
+        default=None, description="LLM provider (ollama / openai / google) or model name, e.g. gpt-4 (optional)"
+    )
 
 
 @router.post("/report-from-file")
-def report_from_file(request: ReportFromFileRequest):
+async def report_from_file(request: ReportFromFileRequest):
     """
     Generate a regulatory compliance report from a saved match file.
 
@@ -50,7 +56,7 @@ def report_from_file(request: ReportFromFileRequest):
 
     try:
         logger.info(f"📄 Generating report from file: {file_path} using model: {request.model}")
-        report = generate_llm_report_from_file(file_path, model=request.model)
+        report = await agenerate_llm_report_from_file(file_path, model=request.model)
 
         return {
             "message": "✅ Report generated successfully",
@@ -62,3 +68,20 @@ def report_from_file(request: ReportFromFileRequest):
     except Exception as e:
         logger.exception("❌ Report generation failed")
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
+
+
+@router.get("/cache-stats")
+def cache_stats():
+    """
+    Report the state of the shared caches (regdocs, compiled rulesets, cached sources).
+
+    Returns:
+        JSON with entries, memory size, hit/miss and eviction counters per cache.
+    """
+    return {
+        "caches": [
+            REGDOC_REGISTRY.stats(),
+            RULESET_CACHE.stats(),
+            *(cache.stats() for cache in source_caches()),
+        ]
+    }
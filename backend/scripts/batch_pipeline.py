@@ -0,0 +1,340 @@
+# backend/scripts/batch_pipeline.py
+"""
+Run matching (and optionally LLM reports) for many business profiles at once.
+
+Reads profiles from a JSONL file (one JSON object per line) or a CSV file
+(one profile per row, header = attribute names). Every worker process loads
+the regdoc or compiled ruleset once and matches chunks of profiles against
+it; reports are then generated with a bounded number of concurrent LLM calls.
+Writes one consolidated results file with per-profile outcomes plus
+throughput and failure statistics.
+
+A profile's id is taken from its "profile_id" or "id" field, else its line/row number.
+
+Usage:
+    python -m backend.scripts.batch_pipeline profiles.jsonl --regdoc data/processed/reg-4.2A-2022.json --workers 4
+    python -m backend.scripts.batch_pipeline profiles.csv --doc-id reg-4.2A-2022 --reports --llm-concurrency 8
+    python -m backend.scripts.batch_pipeline profiles.jsonl --rules data/processed/compiled_rules.json
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, get_args
+
+from backend.core.batch_matcher import match_rules_batch
+from backend.core.document_registry import DOCUMENT_REGISTRY
+from backend.core.keywords import FIELD_UNITS, SYNONYMS
+from backend.core.matcher import get_ruleset, match_rules
+from backend.core.matcher_from_regdoc import iter_regdoc_matches
+from backend.core.regdoc_registry import get_regdoc
+from backend.models.user_input import BusinessProfile
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256
+
+ProfileEntry = Tuple[str, Optional[Dict[str, Any]], Optional[str]]  # (id, profile, read error)
+
+
+def _typed_fields(*types: type) -> Set[str]:
+    """Questionnaire fields annotated with one of `types` (Optional[...] included)."""
+    names = set()
+    for name, field in BusinessProfile.model_fields.items():
+        annotated = set(get_args(field.annotation)) - {type(None)} or {field.annotation}
+        if annotated <= set(types):
+            names.add(name)
+    return names
+
+
+# Profile fields whose CSV cells are typed; any other cell (names, phone numbers, ...) stays text
+BOOLEAN_FIELDS = set(SYNONYMS) | _typed_fields(bool)
+NUMERIC_FIELDS = set(FIELD_UNITS) | _typed_fields(int, float)
+
+
+def _coerce(key: str, value: str) -> Any:
+    """Turn a CSV cell of a known boolean / numeric profile field into a bool / int / float."""
+    text = value.strip()
+    if key in BOOLEAN_FIELDS and text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    if key in NUMERIC_FIELDS:
+        for cast in (int, float):
+            try:
+                return cast(text)
+            except ValueError:
+                pass
+    return text
+
+
+def _entry(number: int, profile: Any) -> ProfileEntry:
+    if not isinstance(profile, dict):
+        return str(number), None, "profile is not a JSON object"
+    profile = dict(profile)
+    # Both id keys are removed, so neither is matched as a profile attribute
+    profile_id, plain_id = profile.pop("profile_id", None), profile.pop("id", None)
+    return str(profile_id or plain_id or number), profile, None
+
+
+def read_profiles(path: Path) -> List[ProfileEntry]:
+    """
+    Read business profiles from a JSONL or CSV file.
+
+    Args:
+        path: Profiles file (.jsonl / .json lines, or .csv).
+
+    Returns:
+        (profile id, profile, error) per line/row; unreadable lines get an
+        error instead of a profile, so they are reported rather than aborting the batch.
+    """
+    entries = []
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                # Empty cells mean "not answered"
+                entries.append(_entry(number, {k: _coerce(k, v) for k, v in row.items() if v and v.strip()}))
+        else:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(_entry(number, json.loads(line)))
+                except ValueError as e:
+                    entries.append((str(number), None, f"invalid JSON: {e}"))
+    return entries
+
+
+# The regdoc / ruleset of the current worker process, loaded once by `_init_worker`
+_ENGINE: Optional[Tuple[str, Any]] = None
+
+
+def _init_worker(engine: str, source: str) -> None:
+    global _ENGINE
+    _ENGINE = (engine, get_ruleset(source) if engine == "rules" else get_regdoc(source))
+
+
+def _rule_ids(matches: List[Dict[str, Any]]) -> List[str]:
+    return [str(m.get("rule_id", m.get("id"))) for m in matches]
+
+
+def match_chunk(chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Match a chunk of profiles against the worker's regdoc or ruleset.
+
+    Args:
+        chunk: (profile id, profile) pairs.
+
+    Returns:
+        One result per profile, with 'status' "matched" or "failed".
+    """
+    engine, loaded = _ENGINE
+    results = []
+    if engine == "rules":
+        try:
+            matched = match_rules_batch([profile for _, profile in chunk], loaded)
+        except Exception:
+            matched = None  # fall back to one profile at a time to isolate the bad one
+        for i, (profile_id, profile) in enumerate(chunk):
+            try:
+                matches = (matched[i] if matched is not None else match_rules(profile, loaded))["matches"]
+                results.append({"id": profile_id, "status": "matched", "matches": matches})
+            except Exception as e:
+                results.append({"id": profile_id, "status": "failed", "error": str(e)})
+    else:
+        for profile_id, profile in chunk:
+            try:
+                matches = list(iter_regdoc_matches(profile, loaded))
+                results.append({"id": profile_id, "status": "matched", "matches": matches})
+            except Exception as e:
+                results.append({"id": profile_id, "status": "failed", "error": str(e)})
+    return results
+
+
+def match_profiles(
+    profiles: List[Tuple[str, Dict[str, Any]]],
+    engine: str,
+    source: str,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Match profiles across a process pool; each worker loads the regdoc/ruleset once.
+
+    Args:
+        profiles: (profile id, profile) pairs.
+        engine: "regdoc" or "rules".
+        source: Regdoc path/docId, or compiled rules path.
+        workers: Worker processes (defaults to the CPU count; 1 matches in-process).
+        chunk_size: Profiles per task.
+
+    Returns:
+        One result per profile, in input order.
+    """
+    chunks = [profiles[i:i + chunk_size] for i in range(0, len(profiles), chunk_size)]
+    if workers == 1:
+        _init_worker(engine, source)
+        return [result for chunk in chunks for result in match_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine, source)) as pool:
+        return [result for chunk_results in pool.map(match_chunk, chunks) for result in chunk_results]
+
+
+def generate_reports(jobs: List[Tuple[Dict[str, Any], Dict[str, Any]]], concurrency: int) -> None:
+    """
+    Add an LLM report (or a report error) to matched results, at most `concurrency` calls at a time.
+
+    Args:
+        jobs: (match result from `match_profiles`, profile) pairs; results are updated in place.
+        concurrency: Maximum number of LLM calls in flight.
+    """
+    # Imported here: the LLM client pulls in LangChain, which plain matching runs do not need
+    from backend.core.report_generator import generate_llm_report
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(generate_llm_report, profile, result["matches"]): result
+            for result, profile in jobs if result["status"] == "matched"
+        }
+        for future in as_completed(futures):
+            result = futures[future]
+            try:
+                result["report"] = future.result()
+            except Exception as e:
+                logger.error(f"❌ Report for profile {result['id']} failed: {e}")
+                result["report_error"] = str(e)
+
+
+def _rate(count: int, seconds: float) -> Optional[float]:
+    return round(count / seconds, 2) if seconds > 0 else None
+
+
+def run_batch(
+    profiles_path: Path,
+    output_path: Path,
+    engine: str,
+    source: str,
+    workers: Optional[int] = None,
+    reports: bool = False,
+    llm_concurrency: int = 4,
+    chunk_size: int = CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Match (and optionally report on) every profile of a file and write the consolidated results.
+
+    Args:
+        profiles_path: JSONL or CSV profiles file.
+        output_path: Destination of the consolidated results JSON.
+        engine: "regdoc" or "rules".
+        source: Regdoc path/docId, or compiled rules path.
+        workers: Matching worker processes (defaults to the CPU count).
+        reports: Whether to generate an LLM report per matched profile.
+        llm_concurrency: Maximum concurrent LLM calls.
+        chunk_size: Profiles per matching task.
+
+    Returns:
+        The consolidated results.
+    """
+    start = time.perf_counter()
+    entries = read_profiles(profiles_path)
+    valid = [(profile_id, profile) for profile_id, profile, error in entries if error is None]
+    logger.info(f"📥 Read {len(entries)} profiles ({len(entries) - len(valid)} unreadable) from {profiles_path}")
+
+    match_start = time.perf_counter()
+    matched = match_profiles(valid, engine, source, workers, chunk_size)
+    match_s = time.perf_counter() - match_start
+    # Results come back in input order; put the unreadable entries back in between
+    pending = iter(matched)
+    results = [
+        next(pending) if error is None else {"id": profile_id, "status": "failed", "error": error}
+        for profile_id, _, error in entries
+    ]
+    ok = [r for r in results if r["status"] == "matched"]
+    logger.info(f"✅ Matched {len(ok)} profiles in {match_s:.2f}s")
+
+    report_stats = None
+    if reports:
+        report_start = time.perf_counter()
+        generate_reports(list(zip(matched, (profile for _, profile in valid))), llm_concurrency)
+        report_s = time.perf_counter() - report_start
+        generated = sum(1 for r in results if "report" in r)
+        report_stats = {
+            "requested": len(ok),
+            "generated": generated,
+            "failed": len(ok) - generated,
+            "concurrency": llm_concurrency,
+            "wall_s": round(report_s, 4),
+            "reports_per_s": _rate(generated, report_s),
+        }
+
+    # Full match entries are only needed for the reports; the results file keeps the rule ids
+    for result in ok:
+        matches = result.pop("matches")
+        result["total_matches"] = len(matches)
+        result["rule_ids"] = _rule_ids(matches)
+
+    summary = {
+        "profiles_file": str(profiles_path),
+        "engine": engine,
+        "source": source,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "stats": {
+            "profiles": len(results),
+            "matched": len(ok),
+            "failed": len(results) - len(ok),
+            "workers": workers or os.cpu_count(),
+            "match_wall_s": round(match_s, 4),
+            "profiles_per_s": _rate(len(valid), match_s),
+            "reports": report_stats,
+            "total_wall_s": round(time.perf_counter() - start, 4),
+        },
+        "results": results,
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("profiles", help="JSONL or CSV file of business profiles")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--regdoc", help="Regdoc file to match against")
+    source.add_argument("--doc-id", help="Registered document id to match against (latest version)")
+    source.add_argument("--rules", help="Compiled rules file to match against")
+    parser.add_argument("--output", default=None, help="Results file (default: data/batches/batch_<timestamp>.json)")
+    parser.add_argument("--workers", type=int, default=None, help="Matching worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Profiles per matching task")
+    parser.add_argument("--reports", action="store_true", help="Generate an LLM report for every matched profile")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Maximum concurrent LLM calls")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.rules:
+        engine, source_path = "rules", args.rules
+    else:
+        engine = "regdoc"
+        source_path = args.regdoc or DOCUMENT_REGISTRY.resolve(args.doc_id)["regdoc_path"]
+    output = Path(args.output or f"data/batches/batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    summary = run_batch(
+        Path(args.profiles), output, engine, source_path,
+        workers=args.workers, reports=args.reports,
+        llm_concurrency=args.llm_concurrency, chunk_size=args.chunk_size,
+    )
+    stats = summary["stats"]
+    print(f"📦 {stats['profiles']} profiles: {stats['matched']} matched, {stats['failed']} failed "
+          f"in {stats['match_wall_s']:.2f}s ({stats['profiles_per_s']} profiles/s)")
+    if stats["reports"]:
+        print(f"📝 Reports: {stats['reports']['generated']} generated, {stats['reports']['failed']} failed "
+              f"in {stats['reports']['wall_s']:.2f}s")
+    print(f"💾 Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
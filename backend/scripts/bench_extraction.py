@@ -0,0 +1,58 @@
+# backend/scripts/bench_extraction.py
+"""
+Benchmark: serial vs. page-parallel PDF text extraction.
+
+Builds a multi-hundred-page PDF by repeating the pages of a regulation
+document, extracts it once serially and once per worker count, checks that
+every run returns the same text and prints the timings.
+
+Usage:
+    python -m backend.scripts.bench_extraction --source data/rew/18-07-2022_4.2A.pdf --copies 8 --workers 2 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from backend.scripts.extract_regulations import extract_text_from_pdf
+
+
+def build_large_pdf(source: str, copies: int, path: str) -> int:
+    """Write `copies` concatenated copies of `source` to `path`; returns the page count."""
+    with fitz.open(source) as original, fitz.open() as large:
+        for _ in range(copies):
+            large.insert_pdf(original)
+        large.save(path)
+        return large.page_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="data/rew/18-07-2022_4.2A.pdf", help="PDF whose pages are repeated")
+    parser.add_argument("--copies", type=int, default=8, help="How many times the source pages are repeated")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="Worker counts to measure")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.pdf")
+        pages = build_large_pdf(args.source, args.copies, path)
+        print(f"📄 {pages} pages, {os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        expected = extract_text_from_pdf(path)
+        serial = time.perf_counter() - start
+        print(f"⏱️ serial: {serial:.3f}s")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            text = extract_text_from_pdf(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            status = "✅" if text == expected else "❌ output differs"
+            print(f"⏱️ {workers} workers: {elapsed:.3f}s ({serial / elapsed:.2f}x) {status}")
+
+
+if __name__ == "__main__":
+    main()
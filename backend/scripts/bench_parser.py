@@ -0,0 +1,108 @@
+# backend/scripts/bench_parser.py
+"""
+Benchmark: previous print-per-line regulation parser vs. the streaming parser.
+
+Extracts the text of a regulation document once, checks that both parsers
+produce the same regdoc and prints their timings. The previous parser's
+per-line output goes to os.devnull, i.e. real write calls without a terminal.
+
+Usage:
+    python -m backend.scripts.bench_parser --source data/rew/18-07-2022_4.2A.pdf --repeat 20
+"""
+
+import argparse
+import contextlib
+import os
+import re
+import time
+
+from backend.core.hebrew_text import normalize_hebrew
+from backend.core.regulation_parser import parse_to_json
+from backend.scripts.extract_regulations import extract_text
+
+
+def legacy_parse_to_json(text: str, doc_id: str, title: str) -> dict:
+    """The parser as it was before the streaming rewrite (prints every line, `+=` content)."""
+    lines = text.splitlines()
+    sections = []
+    current_section = None
+    current_subsection = None
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        print(f"[{i:03}] 🔹 Line: {line}")
+
+        match_section = re.match(r"פרק\s?(\d+)\s*[-–]\s*(.+)", line)
+        if match_section:
+            print(f"📘 Found Section: {match_section.group(1)} - {match_section.group(2)}")
+            if current_section:
+                sections.append(current_section)
+            current_section = {"id": match_section.group(1), "title": match_section.group(2).strip(), "subsections": []}
+            current_subsection = None
+            continue
+
+        match_sub = re.match(r"(\d+\.\d+)\s*[\.\-]?\s*(.+)", line)
+        if match_sub:
+            print(f"📗 Found Subsection: {match_sub.group(1)} - {match_sub.group(2)}")
+            current_subsection = {"id": match_sub.group(1), "title": match_sub.group(2).strip(), "content": ""}
+            if current_section:
+                current_section["subsections"].append(current_subsection)
+            continue
+
+        match_content = re.match(r"(\d+\.\d+\.\d+)\s*[\.\-]?\s*(.+)", line)
+        if match_content and current_subsection:
+            print(f"📝 Found Content Line: {match_content.group(1)} → {match_content.group(2)}")
+            current_subsection["content"] += match_content.group(2).strip() + " "
+            continue
+
+        if current_subsection:
+            print(f"➡️ Appending to content: {line}")
+            current_subsection["content"] += line + " "
+
+    if current_section:
+        sections.append(current_section)
+
+    print(f"\n✅ Finished parsing. Total sections: {len(sections)}\n")
+    return {"docId": doc_id, "title": title, "language": "he", "sections": sections}
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="data/rew/18-07-2022_4.2A.pdf", help="Regulation PDF/DOCX")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per parser")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        text = extract_text(args.source)
+
+        legacy = legacy_parse_to_json(text, "bench", "bench")
+        for section in legacy["sections"]:
+            for sub in section["subsections"]:
+                sub["content_norm"] = normalize_hebrew(sub["content"])
+        assert legacy == parse_to_json(text, "bench", "bench"), "parsers disagree"
+
+        legacy_s = _time(lambda: legacy_parse_to_json(text, "bench", "bench"), args.repeat)
+    streaming_s = _time(lambda: parse_to_json(text, "bench", "bench"), args.repeat)
+    # The streaming parser also normalizes content; time that part on its own
+    normalize_s = _time(
+        lambda: [normalize_hebrew(sub["content"]) for section in legacy["sections"] for sub in section["subsections"]],
+        args.repeat
+    )
+
+    print(f"📄 {args.source}: {len(text):,} chars, {len(text.splitlines()):,} lines, {len(legacy['sections'])} sections")
+    print(f"🐢 previous parser:  {legacy_s * 1000:8.2f} ms")
+    print(f"🚀 streaming parser: {streaming_s * 1000:8.2f} ms  (incl. {normalize_s * 1000:.2f} ms normalization)")
+    print(f"⚡ speedup (parsing only): {legacy_s / max(streaming_s - normalize_s, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
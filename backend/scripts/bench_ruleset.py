@@ -0,0 +1,105 @@
+# backend/scripts/bench_ruleset.py
+"""
+Benchmark: linear rule scan vs. indexed RuleSet vs. vectorized batch matching.
+
+Generates a synthetic ruleset shaped like `compiled_rules.json` (boolean
+profile flags plus max/min/range thresholds), checks that all paths return identical
+results and prints the per-profile latency of each.
+
+Usage:
+    python -m backend.scripts.bench_ruleset --rules 20000 --profiles 200
+"""
+
+import argparse
+import random
+import time
+
+from backend.core.batch_matcher import match_rules_batch
+from backend.core.matcher import match_rules
+from backend.core.ruleset import RuleSet
+
+BOOL_FIELDS = [
+    "has_gas_installation", "offers_delivery", "serves_meat", "uses_open_fire",
+    "has_industrial_kitchen", "serves_alcohol", "has_outdoor_area", "has_music_or_noise",
+]
+NUMERIC_FIELDS = ["business_area_sqm", "seating_capacity"]
+
+
+def make_rules(count: int, rng: random.Random) -> list:
+    """Generate `count` synthetic compiled rules."""
+    rules = []
+    for i in range(count):
+        applies_if = {}
+        for field in rng.sample(BOOL_FIELDS, rng.randint(1, 3)):
+            applies_if[field] = rng.random() < 0.8
+        if rng.random() < 0.5:
+            applies_if[f"{rng.choice(NUMERIC_FIELDS)}_max"] = rng.choice([50, 80, 100, 150, 200, 300, 500])
+        elif rng.random() < 0.5:
+            low = rng.choice([0, 20, 50, 100])
+            applies_if[rng.choice(NUMERIC_FIELDS)] = rng.choice([{"min": low}, {"range": [low, low + 200]}])
+        rules.append({
+            "id": f"R-{i}",
+            "title": f"Rule {i}",
+            "authority": "Synthetic",
+            "severity": rng.choice(["mandatory", "recommended", "info"]),
+            "applies_if": applies_if,
+            "requirements": [{"name": f"Requirement {i}"}],
+            "source": {"section_id": str(i // 100), "subsection_id": str(i)},
+        })
+    return rules
+
+
+def make_profiles(count: int, rng: random.Random) -> list:
+    """Generate `count` synthetic business profiles."""
+    profiles = []
+    for _ in range(count):
+        profile = {field: rng.random() < 0.5 for field in BOOL_FIELDS}
+        profile["business_area_sqm"] = rng.randint(20, 600)
+        profile["seating_capacity"] = rng.randint(0, 400)
+        profiles.append(profile)
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=10000, help="Number of synthetic rules")
+    parser.add_argument("--profiles", type=int, default=100, help="Number of profiles to match")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = make_rules(args.rules, rng)
+    profiles = make_profiles(args.profiles, rng)
+
+    start = time.perf_counter()
+    ruleset = RuleSet(rules)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear = [match_rules(p, rules) for p in profiles]
+    linear_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [match_rules(p, ruleset) for p in profiles]
+    indexed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = match_rules_batch(profiles, ruleset)
+    batch_s = time.perf_counter() - start
+
+    if linear != indexed:
+        raise SystemExit("❌ RuleSet results differ from the linear scan")
+    if linear != batch:
+        raise SystemExit("❌ Batch results differ from the linear scan")
+
+    avg_matches = sum(len(r["matches"]) for r in linear) / len(linear)
+    print(f"rules={args.rules} profiles={args.profiles} avg_matches={avg_matches:.1f}")
+    print(f"RuleSet build:   {build_s * 1000:9.2f} ms (once)")
+    print(f"linear scan:     {linear_s / len(profiles) * 1000:9.3f} ms/profile")
+    print(f"indexed RuleSet: {indexed_s / len(profiles) * 1000:9.3f} ms/profile")
+    print(f"batch (NumPy):   {batch_s / len(profiles) * 1000:9.3f} ms/profile")
+    print(f"speedup:         {linear_s / indexed_s:9.1f}x indexed, {linear_s / batch_s:.1f}x batch")
+
+
+if __name__ == "__main__":
+    main()
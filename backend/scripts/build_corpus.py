@@ -0,0 +1,224 @@
+# backend/scripts/build_corpus.py
+"""
+Build regdocs for a whole corpus of regulation documents in parallel.
+
+Takes a directory of PDF/DOCX files, or a JSON manifest listing them, and runs
+extraction + parsing for each document in a process pool. Writes one regdoc
+(with its feature index and change set, see regdoc_ingest) per document and a
+corpus manifest with the doc id, source hash and per-stage timings of every
+document. Documents whose source hash matches the previous manifest are skipped.
+
+Manifest input format (JSON list; only "path" is required):
+    [{"path": "data/rew/18-07-2022_4.2A.pdf", "doc_id": "reg-4.2A-2022", "title": "..."}]
+
+Usage:
+    python -m backend.scripts.build_corpus data/rew --output data/processed/corpus --workers 4
+    python -m backend.scripts.build_corpus corpus.json --output data/processed/corpus --force
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.core.file_cache import file_sha256
+from backend.core.regdoc_ingest import ingest_regdoc
+from backend.scripts.extract_regulations import extract_text
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "corpus_manifest.json"
+SOURCE_SUFFIXES = (".pdf", ".docx")
+
+
+def discover_sources(source: Path) -> List[Dict[str, str]]:
+    """
+    List the documents of a corpus.
+
+    Args:
+        source: Directory of PDF/DOCX files, or a JSON manifest file.
+
+    Returns:
+        One dict per document with 'path', 'doc_id' and 'title'.
+
+    Raises:
+        ValueError: If two documents end up with the same doc id.
+    """
+    if source.is_dir():
+        entries = [{"path": str(p)} for p in sorted(source.iterdir()) if p.suffix.lower() in SOURCE_SUFFIXES]
+        base = source
+    else:
+        with open(source, encoding="utf-8") as f:
+            entries = json.load(f)
+        base = source.parent
+
+    paths = []
+    for entry in entries:
+        path = Path(entry["path"])
+        if not path.is_absolute() and not path.exists():
+            path = base / path  # manifest paths may be relative to the manifest
+        paths.append(path)
+
+    # Derived ids are file stems; "x.pdf" and "x.docx" become "x-pdf" and "x-docx"
+    stems = [p.stem for p in paths]
+    documents = []
+    for entry, path in zip(entries, paths):
+        doc_id = entry.get("doc_id")
+        if not doc_id:
+            doc_id = path.stem if stems.count(path.stem) == 1 else f"{path.stem}-{path.suffix.lower()[1:]}"
+        documents.append({
+            "path": str(path),
+            "doc_id": doc_id,
+            "title": entry.get("title") or path.stem,
+        })
+
+    ids = [doc["doc_id"] for doc in documents]
+    duplicates = sorted({doc_id for doc_id in ids if ids.count(doc_id) > 1})
+    if duplicates:
+        raise ValueError(f"❌ Duplicate doc ids in corpus: {', '.join(duplicates)}")
+    return documents
+
+
+def build_document(document: Dict[str, str], output_dir: str, source_sha256: str) -> Dict[str, Any]:
+    """
+    Extract, parse and store one document (runs in a worker process).
+
+    Args:
+        document: Entry from `discover_sources`.
+        output_dir: Directory for the regdoc files.
+        source_sha256: Hash of the source file, recorded in the manifest.
+
+    Returns:
+        Manifest entry for the document.
+    """
+    timings = {}
+    start = time.perf_counter()
+    regdoc_path = Path(output_dir) / f"{document['doc_id']}.json"
+
+    # extract_text prints progress; keep worker output quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        text = extract_text(document["path"])
+    timings["extract_s"] = time.perf_counter() - start
+
+    ingest_start = time.perf_counter()
+    changes = ingest_regdoc(text, regdoc_path, doc_id=document["doc_id"], title=document["title"])
+    timings["parse_and_save_s"] = time.perf_counter() - ingest_start
+    timings["total_s"] = time.perf_counter() - start
+
+    return {
+        **document,
+        "status": "built" if changes["written"] else "unchanged",
+        "source_sha256": source_sha256,
+        "regdoc": str(regdoc_path),
+        "chars": len(text),
+        "changes": {key: len(changes[key]) for key in ("added", "removed", "modified")},
+        "timings": {key: round(value, 4) for key, value in timings.items()},
+        "pid": os.getpid(),
+    }
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Return the previous corpus manifest in `output_dir` (empty if missing or unreadable)."""
+    try:
+        with open(output_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"documents": []}
+
+
+def build_corpus(
+    documents: List[Dict[str, str]],
+    output_dir: Path,
+    workers: Optional[int] = None,
+    force: bool = False
+) -> Dict[str, Any]:
+    """
+    Build every document of a corpus in a process pool and write the corpus manifest.
+
+    Args:
+        documents: Entries from `discover_sources`.
+        output_dir: Directory for the regdocs and the manifest.
+        workers: Worker processes (defaults to the CPU count).
+        force: Rebuild documents even if their source hash is unchanged.
+
+    Returns:
+        The corpus manifest.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = {doc["doc_id"]: doc for doc in load_manifest(output_dir)["documents"]}
+    start = time.perf_counter()
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    pending = []
+    for document in documents:
+        try:
+            source_sha256 = file_sha256(Path(document["path"]))
+        except OSError as e:
+            logger.error(f"❌ {document['doc_id']}: cannot read source: {e}")
+            entries[document["doc_id"]] = {**document, "status": "failed", "error": str(e)}
+            continue
+        old = previous.get(document["doc_id"])
+        if (not force and old and old.get("source_sha256") == source_sha256
+                and old.get("status") != "failed" and Path(old["regdoc"]).exists()):
+            entries[document["doc_id"]] = {**old, "status": "skipped"}
+        else:
+            pending.append((document, source_sha256))
+
+    logger.info(f"📚 {len(documents)} documents: {len(pending)} to build, {len(documents) - len(pending)} skipped")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(build_document, document, str(output_dir), source_sha256): (document, source_sha256)
+                for document, source_sha256 in pending
+            }
+            for future in as_completed(futures):
+                document, source_sha256 = futures[future]
+                try:
+                    entry = future.result()
+                    logger.info(f"✅ {entry['doc_id']}: {entry['status']} in {entry['timings']['total_s']:.2f}s")
+                except Exception as e:
+                    # One broken document must not abort the corpus
+                    logger.error(f"❌ {document['doc_id']} failed: {e}")
+                    entry = {**document, "status": "failed", "source_sha256": source_sha256, "error": str(e)}
+                entries[document["doc_id"]] = entry
+
+    manifest = {
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "workers": workers or os.cpu_count(),
+        "wall_time_s": round(time.perf_counter() - start, 4),
+        # Keep the input order, whatever order the workers finished in
+        "documents": [entries[document["doc_id"]] for document in documents],
+    }
+    with open(output_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Directory of PDF/DOCX files, or a JSON manifest")
+    parser.add_argument("--output", default="data/processed/corpus", help="Directory for regdocs and the corpus manifest")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild documents whose source is unchanged")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    manifest = build_corpus(discover_sources(Path(args.source)), Path(args.output), args.workers, args.force)
+
+    statuses = [doc["status"] for doc in manifest["documents"]]
+    print(
+        f"📦 Corpus built in {manifest['wall_time_s']:.2f}s: "
+        + ", ".join(f"{statuses.count(s)} {s}" for s in ("built", "unchanged", "skipped", "failed") if s in statuses)
+    )
+
+
+if __name__ == "__main__":
+    main()
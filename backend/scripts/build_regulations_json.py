@@ -7,21 +7,23 @@ Steps:
 1. Extract text from the document.
 2. Parse the text into a hierarchical structure (chapters, subsections, content).
 3. Save the result as JSON for downstream processing.
+
+Usage:
+    python -m backend.scripts.build_regulations_json
+    python -m backend.scripts.build_regulations_json data/rew/18-07-2022_4.2A.pdf --incremental
+    python -m backend.scripts.build_regulations_json new.pdf --output data/processed/new.json --doc-id reg-new --title "..."
 """
 
+import argparse
 import json
 from pathlib import Path
-import sys
 import logging
 
-# Add project root to sys.path for absolute imports
-sys.path.append(str(Path(__file__).resolve().parent.parent))
-
-from scripts.extract_regulations import extract_text
-from core.regulation_parser import parse_to_json
+from backend.core.regdoc_features import save_regdoc
+from backend.core.regdoc_ingest import changes_path, ingest_regdoc
+from backend.core.regulation_parser import parse_to_json
+from backend.scripts.extract_regulations import extract_text
 
-# Setup logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Define base directory
@@ -32,7 +34,8 @@ def build_json_from_file(
     input_path: str,
     output_path: str,
     doc_id: str,
-    title: str
+    title: str,
+    incremental: bool = False
 ):
     """
     Full pipeline for converting a regulation file to structured JSON.
@@ -42,6 +45,8 @@ def build_json_from_file(
         output_path: Path where structured JSON should be saved.
         doc_id: Unique identifier for the regulation document.
         title: Human-readable title of the regulation.
+        incremental: Diff against the regdoc already at `output_path` and only
+            update what changed (see regdoc_ingest); writes a change set.
     """
     input_path = Path(input_path)
     output_path = Path(output_path)
@@ -53,30 +58,45 @@ def build_json_from_file(
     logger.info("💬 Extracted text preview:")
     print(text[:2000])  # Optional for manual debugging
 
+    if incremental:
+        logger.info(f"🔁 Re-ingesting against the stored edition: {output_path.name}")
+        changes = ingest_regdoc(text, output_path, doc_id=doc_id, title=title)
+        logger.info(f"🧾 Change set saved to: {changes_path(output_path).resolve()}")
+        return changes
+
     # Step 2 – Parse into structured JSON
     logger.info(f"🧠 Parsing text into structured format...")
     parsed = parse_to_json(text, doc_id=doc_id, title=title)
 
-    # Step 3 – Save to file
+    # Step 3 – Save to file (with the matcher's feature index next to it)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(parsed, f, ensure_ascii=False, indent=2)
+    index_path = save_regdoc(parsed, output_path)
 
     logger.info(f"✅ Saved structured JSON to: {output_path.resolve()}")
-
-
-if __name__ == "__main__":
-    # === Configuration for this run ===
-    input_file = BASE_DIR / "data" / "rew" / "18-07-2022_4.2A.pdf"
-    output_file = BASE_DIR / "data" / "processed" / "reg-4.2A-2022.json"
-    doc_id = "reg-4.2A-2022"
-    title = "מפרט אחיד לפריט 4.2א – בית אוכל"
-
-    # Execute transformation
+    logger.info(f"🗂️ Saved feature index to: {index_path.resolve()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", default=str(BASE_DIR / "data" / "rew" / "18-07-2022_4.2A.pdf"),
+                        help="Regulation document (PDF or DOCX)")
+    parser.add_argument("--output", default=str(BASE_DIR / "data" / "processed" / "reg-4.2A-2022.json"),
+                        help="Destination of the structured JSON")
+    parser.add_argument("--doc-id", default="reg-4.2A-2022", help="Document identifier")
+    parser.add_argument("--title", default="מפרט אחיד לפריט 4.2א – בית אוכל", help="Document title")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Diff against the regdoc already at --output and only update what changed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
     build_json_from_file(
-        input_path=input_file,
-        output_path=output_file,
-        doc_id=doc_id,
-        title=title
+        input_path=args.input,
+        output_path=args.output,
+        doc_id=args.doc_id,
+        title=args.title,
+        incremental=args.incremental
     )
 
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# backend/scripts/convert_storage.py
+"""
+Convert regdocs, compiled rulesets and match files between JSON and the
+binary store layout (see core/binary_store.py), and time loading both.
+
+Usage:
+    python -m backend.scripts.convert_storage to-binary data/processed/reg-4.2A-2022.json
+    python -m backend.scripts.convert_storage to-json data/processed/reg-4.2A-2022.rstb
+    python -m backend.scripts.convert_storage bench data/processed/reg-4.2A-2022.json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from backend.core.binary_store import BinaryStore, binary_to_json, json_to_binary, load_document
+
+
+def bench(json_path: Path, repeat: int) -> None:
+    """Compare full JSON loading with binary loading (full and single-record)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        binary_path = json_to_binary(json_path, Path(tmp) / "doc.rstb")
+        assert load_document(binary_path) == load_document(json_path), "round trip mismatch"
+
+        def timed(fn):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            return (time.perf_counter() - start) / repeat * 1000
+
+        def one_record():
+            with BinaryStore(binary_path) as store:
+                store[len(store) // 2]
+
+        json_ms = timed(lambda: json.loads(json_path.read_text(encoding="utf-8")))
+        binary_ms = timed(lambda: load_document(binary_path))
+        record_ms = timed(one_record)
+
+        print(f"📦 {json_path.name}: {json_path.stat().st_size:,} bytes JSON, {binary_path.stat().st_size:,} bytes binary")
+        print(f"🐢 json.load:              {json_ms:8.3f} ms")
+        print(f"📖 binary, full document:  {binary_ms:8.3f} ms")
+        print(f"🚀 binary, one record:     {record_ms:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["to-binary", "to-json", "bench"])
+    parser.add_argument("source", help="Input file")
+    parser.add_argument("--output", default=None, help="Output file (default: same name, other suffix)")
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per measurement (bench)")
+    args = parser.parse_args()
+
+    if args.command == "to-binary":
+        print(f"✅ Wrote {json_to_binary(args.source, args.output)}")
+    elif args.command == "to-json":
+        print(f"✅ Wrote {binary_to_json(args.source, args.output)}")
+    else:
+        bench(Path(args.source), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
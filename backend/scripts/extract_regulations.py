@@ -1,58 +1,213 @@
 # scripts/extract_regulations.py
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Iterator, List, Optional, Tuple, Union
 import fitz  # PyMuPDF
 from docx import Document
 
+# Below this many pages per worker, process start-up costs more than it saves
+MIN_PAGES_PER_WORKER = 16
 
-def extract_text_from_pdf(path: Union[str, Path]) -> str:
-    """Extracts clean text from a PDF using PyMuPDF (fitz)."""
+# How `extract_text` joins the chunks yielded by `iter_pages`
+PAGE_SEPARATORS = {".pdf": "\n\n", ".docx": "\n"}
+
+PageRange = Tuple[int, int]
+
+
+def _open_pdf(path: Union[str, Path]) -> "fitz.Document":
     try:
-        doc = fitz.open(str(path))
+        return fitz.open(str(path))
     except Exception as e:
         raise RuntimeError(f"❌ Failed to open PDF file '{path}': {e}")
 
-    texts = []
-    for page_num, page in enumerate(doc, start=1):
-        try:
-            text = page.get_text().strip()
+
+def _iter_pdf_pages(doc: "fitz.Document", path: Union[str, Path], start: int, stop: int) -> Iterator[str]:
+    """Yield the stripped, non-empty text of pages [start, stop) (0-based) and close the document."""
+    try:
+        for index in range(start, stop):
+            try:
+                text = doc[index].get_text().strip()
+            except Exception as e:
+                raise RuntimeError(f"❌ Failed to extract text from page {index + 1} in '{path}': {e}")
             if text:
-                texts.append(text)
-        except Exception as e:
-            raise RuntimeError(f"❌ Failed to extract text from page {page_num} in '{path}': {e}")
+                yield text
+    finally:
+        doc.close()
 
-    return "\n\n".join(texts)
 
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """
+    Extract the non-empty page texts of pages [start, stop) (0-based) from a PDF.
 
-def extract_text_from_docx(path: Union[str, Path]) -> str:
-    """Extracts clean text from a DOCX file using python-docx."""
+    Runs in worker processes: each call opens its own fitz document.
+    """
+    return list(_iter_pdf_pages(_open_pdf(path), path, start, stop))
+
+
+def _resolve_pages(page_count: int, pages: Optional[PageRange]) -> Tuple[int, int]:
+    """Turn a 1-based inclusive (first, last) page range into 0-based [start, stop)."""
+    if pages is None:
+        return 0, page_count
+    first, last = pages
+    if not 1 <= first <= last <= page_count:
+        raise ValueError(f"❌ Invalid page range {first}-{last} (document has {page_count} pages)")
+    return first - 1, last
+
+
+def iter_pdf_pages(path: Union[str, Path], pages: Optional[PageRange] = None) -> Iterator[str]:
+    """
+    Lazily yield the text of each non-empty PDF page; only one page is held at a time.
+
+    Args:
+        path: Path to the PDF file.
+        pages: Optional 1-based inclusive (first, last) page range.
+
+    Returns:
+        Iterator over stripped page texts, in page order.
+    """
+    doc = _open_pdf(path)
+    try:
+        start, stop = _resolve_pages(doc.page_count, pages)
+    except ValueError:
+        doc.close()
+        raise
+    return _iter_pdf_pages(doc, path, start, stop)
+
+
+def extract_text_from_pdf(
+    path: Union[str, Path],
+    pages: Optional[PageRange] = None,
+    workers: Optional[int] = None
+) -> str:
+    """
+    Extracts clean text from a PDF using PyMuPDF (fitz).
+
+    Args:
+        path: Path to the PDF file.
+        pages: Optional 1-based inclusive (first, last) page range.
+        workers: Worker processes; with more than one, page ranges are
+            extracted in parallel and reassembled in page order.
+
+    Returns:
+        Text of the non-empty pages, separated by blank lines.
+    """
+    separator = PAGE_SEPARATORS[".pdf"]
+    doc = _open_pdf(path)
+    try:
+        start, stop = _resolve_pages(doc.page_count, pages)
+    except ValueError:
+        doc.close()
+        raise
+
+    # Contiguous, evenly sized page ranges, one per worker
+    workers = min(workers or 1, max(1, (stop - start) // MIN_PAGES_PER_WORKER))
+    if workers == 1:
+        return separator.join(_iter_pdf_pages(doc, path, start, stop))
+
+    doc.close()
+    bounds = [start + (stop - start) * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(_extract_page_range, [str(path)] * workers, bounds[:-1], bounds[1:])
+        return separator.join(text for chunk in chunks for text in chunk)
+
+
+def iter_docx_paragraphs(path: Union[str, Path]) -> Iterator[str]:
+    """
+    Lazily yield the stripped, non-empty paragraphs of a DOCX file.
+
+    A DOCX has no fixed pages, so paragraphs are its extraction unit.
+
+    Args:
+        path: Path to the DOCX file.
+
+    Returns:
+        Iterator over paragraph texts, in document order.
+    """
     try:
         doc = Document(path)
     except Exception as e:
         raise RuntimeError(f"❌ Failed to open DOCX file '{path}': {e}")
 
-    try:
-        return "\n".join(p.text.strip() for p in doc.paragraphs if p.text.strip())
-    except Exception as e:
-        raise RuntimeError(f"❌ Failed to extract text from DOCX file '{path}': {e}")
+    def paragraphs() -> Iterator[str]:
+        try:
+            for p in doc.paragraphs:
+                text = p.text.strip()
+                if text:
+                    yield text
+        except Exception as e:
+            raise RuntimeError(f"❌ Failed to extract text from DOCX file '{path}': {e}")
 
+    return paragraphs()
 
 
+def extract_text_from_docx(path: Union[str, Path]) -> str:
+    """Extracts clean text from a DOCX file using python-docx."""
+    return PAGE_SEPARATORS[".docx"].join(iter_docx_paragraphs(path))
+
 
-def extract_text(path: Union[str, Path]) -> str:
-    """Detects file type and extracts clean text accordingly."""
+def _check_source(path: Union[str, Path], pages: Optional[PageRange]) -> Path:
+    """Resolve a source path and reject missing files, unsupported types and DOCX page ranges."""
     path = Path(path).resolve()
     print(f"🔍 Looking for file at: {path}")  # DEBUG
 
     if not path.exists():
         raise FileNotFoundError(f"❌ File not found: {path}")
 
+    if path.suffix.lower() not in PAGE_SEPARATORS:
+        raise ValueError(f"❌ Unsupported file type: {path.suffix} (only .pdf / .docx)")
+
+    if pages is not None and path.suffix.lower() != ".pdf":
+        raise ValueError("❌ Page ranges are only supported for PDF files")
+    return path
+
+
+def iter_pages(path: Union[str, Path], pages: Optional[PageRange] = None) -> Iterator[str]:
+    """
+    Detects file type and lazily yields its text page by page (paragraph by paragraph for DOCX).
+
+    Joining the chunks with `PAGE_SEPARATORS[suffix]` gives exactly `extract_text(path)`.
+    The parser accepts the iterator directly, so memory stays bounded by one page.
+
+    Args:
+        path: Path to the PDF or DOCX file.
+        pages: Optional 1-based inclusive page range (PDF only).
+
+    Returns:
+        Iterator over text chunks, in document order.
+    """
+    path = _check_source(path, pages)
     if path.suffix.lower() == ".pdf":
-        return extract_text_from_pdf(path)
+        return iter_pdf_pages(path, pages)
+    return iter_docx_paragraphs(path)
 
-    elif path.suffix.lower() == ".docx":
-        return extract_text_from_docx(path)
 
-    else:
-        raise ValueError(f"❌ Unsupported file type: {path.suffix} (only .pdf / .docx)")
+def iter_lines(path: Union[str, Path], pages: Optional[PageRange] = None) -> Iterator[str]:
+    """
+    Lazily yields the text lines of a PDF or DOCX file (see `iter_pages`).
+
+    Args:
+        path: Path to the PDF or DOCX file.
+        pages: Optional 1-based inclusive page range (PDF only).
 
+    Returns:
+        Iterator over lines, in document order.
+    """
+    chunks = iter_pages(path, pages)
+    return (line for chunk in chunks for line in chunk.splitlines())
+
+
+def extract_text(
+    path: Union[str, Path],
+    pages: Optional[PageRange] = None,
+    workers: Optional[int] = None
+) -> str:
+    """
+    Detects file type and extracts clean text accordingly.
+
+    `pages` (1-based inclusive range) and `workers` apply to PDFs only.
+    """
+    path = _check_source(path, pages)
+
+    if path.suffix.lower() == ".pdf":
+        return extract_text_from_pdf(path, pages=pages, workers=workers)
+    return extract_text_from_docx(path)
@@ -0,0 +1,50 @@
+# backend/scripts/manage_source_cache.py
+"""
+List, fill and purge the content-addressed cache of extracted/parsed sources.
+
+The pipeline stores the extracted text and parsed regdoc of every source
+document under <output_dir>/cache/sources (see backend/core/source_cache.py).
+
+Usage:
+    python -m backend.scripts.manage_source_cache list
+    python -m backend.scripts.manage_source_cache build data/rew/18-07-2022_4.2A.pdf
+    python -m backend.scripts.manage_source_cache purge [--key <key>]
+"""
+
+import argparse
+import logging
+from datetime import datetime
+
+from backend.core.source_cache import source_cache_for
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["list", "build", "purge"])
+    parser.add_argument("source", nargs="?", help="Source document (build only)")
+    parser.add_argument("--cache-dir", default="data/cache/sources", help="Cache directory")
+    parser.add_argument("--key", default=None, help="Entry to purge (default: all entries)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    cache = source_cache_for(args.cache_dir)
+
+    if args.command == "list":
+        entries = cache.entries()
+        for entry in entries:
+            last_used = datetime.fromtimestamp(entry["last_used"]).isoformat(timespec="seconds")
+            print(f"📄 {entry['key']}  {entry['bytes'] / 1024:.0f} KB  last used {last_used}  {entry['source_path']}")
+        print(f"📦 {len(entries)} entries, {sum(e['bytes'] for e in entries) / 1024:.0f} KB")
+
+    elif args.command == "build":
+        if not args.source:
+            parser.error("build needs a source document")
+        cached = cache.get_or_build(args.source)
+        print(f"{'♻️ Already cached' if cached.hit else '✅ Cached'}: {cached.regdoc_path}")
+
+    else:
+        print(f"🗑️ Purged {cache.purge(args.key)} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# backend/scripts/register_document.py
+"""
+Register regulation documents in the document registry, or list them.
+
+A registered document is ingested once and referenced by doc id (and
+version) from pipeline runs, see backend/core/document_registry.py.
+
+Usage:
+    python -m backend.scripts.register_document register data/rew/18-07-2022_4.2A.pdf --doc-id reg-4.2A-2022
+    python -m backend.scripts.register_document list
+"""
+
+import argparse
+import logging
+
+from backend.core.document_registry import DOCUMENT_REGISTRY
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["register", "list"])
+    parser.add_argument("source", nargs="?", help="PDF/DOCX source or parsed regdoc (register only)")
+    parser.add_argument("--doc-id", help="Document identifier (register only)")
+    parser.add_argument("--title", default=None, help="Document title")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "register":
+        if not args.source or not args.doc_id:
+            parser.error("register needs a source and --doc-id")
+        record = DOCUMENT_REGISTRY.register(args.source, args.doc_id, args.title)
+        print(f"{'✅ Registered' if record['status'] == 'registered' else '♻️ Unchanged'}: "
+              f"{args.doc_id} v{record['version']} → {record['regdoc_path']}")
+    else:
+        for document in DOCUMENT_REGISTRY.documents():
+            print(f"📄 {document['doc_id']}  v{document['latest_version']}  {document['title']}")
+
+
+if __name__ == "__main__":
+    main()
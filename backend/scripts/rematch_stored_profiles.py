@@ -0,0 +1,51 @@
+# backend/scripts/rematch_stored_profiles.py
+"""
+Re-run every stored profile (data/matches/match_*.json) against the current
+compiled ruleset in one vectorized batch and save fresh match results.
+
+Usage:
+    python -m backend.scripts.rematch_stored_profiles --rules data/processed/compiled_rules.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from backend.core.batch_matcher import match_rules_batch
+from backend.core.matcher import COMPILED_RULES_PATH, get_ruleset, save_match_result
+
+
+def load_stored_profiles(folder: Path) -> dict:
+    """Return {profile_id: profile} for every match file in `folder`."""
+    profiles = {}
+    for match_file in sorted(folder.glob("match_*.json")):
+        with open(match_file, encoding="utf-8") as f:
+            data = json.load(f)
+        if "profile" in data:
+            profiles[match_file.stem.replace("match_", "", 1)] = data["profile"]
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", default="data/matches", help="Folder with stored match_*.json files")
+    parser.add_argument("--rules", default=COMPILED_RULES_PATH, help="Compiled rules JSON file")
+    parser.add_argument("--output", default="data/matches/rematched", help="Folder for the new match results")
+    args = parser.parse_args()
+
+    profiles = load_stored_profiles(Path(args.matches))
+    ruleset = get_ruleset(args.rules)
+
+    start = time.perf_counter()
+    results = match_rules_batch(list(profiles.values()), ruleset)
+    duration = time.perf_counter() - start
+
+    for profile_id, result in zip(profiles, results):
+        save_match_result(profile_id, result, folder=args.output)
+
+    print(f"🔁 Re-matched {len(results)} profiles against {len(ruleset)} rules in {duration:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# backend/tests/test_batch_pipeline.py
+"""
+Tests for the batch pipeline command (many profiles against one regdoc / ruleset).
+"""
+
+import json
+
+from backend.core.matcher_from_regdoc import iter_regdoc_matches
+from backend.core.regdoc_features import save_regdoc
+from backend.scripts.batch_pipeline import read_profiles, run_batch
+
+REGDOC = {
+    "docId": "reg-batch-test",
+    "title": "Test",
+    "sections": [
+        {"id": "1", "title": "משטרה", "subsections": [
+            {"id": "1.1", "title": "", "content": "בית אוכל עד 50 מקומות ישיבה"},
+            {"id": "1.2", "title": "", "content": "רישיון משקאות באישור המשטרה"},
+        ]},
+    ],
+}
+
+
+def test_profiles_are_read_from_jsonl_and_csv(tmp_path):
+    jsonl = tmp_path / "profiles.jsonl"
+    jsonl.write_text('{"id": "a", "num_seats": 40}\n\nnot json\n[1]\n{"profile_id": "b", "id": 7}\n', encoding="utf-8")
+    entries = read_profiles(jsonl)
+    assert entries[0] == ("a", {"num_seats": 40}, None)
+    assert entries[1][:2] == ("3", None) and entries[1][2].startswith("invalid JSON")
+    assert entries[2] == ("4", None, "profile is not a JSON object")
+    assert entries[3] == ("b", {}, None)  # the other id key is not a profile attribute
+
+    csv_path = tmp_path / "profiles.csv"
+    csv_path.write_text(
+        "profile_id,num_seats,has_alcohol,business_name,phone\nb,40,true,,0521234567\nc,,False,1948,\n", encoding="utf-8"
+    )
+    # Only known numeric / boolean fields are typed; free text that looks numeric stays text
+    assert read_profiles(csv_path) == [
+        ("b", {"num_seats": 40, "has_alcohol": True, "phone": "0521234567"}, None),
+        ("c", {"has_alcohol": False, "business_name": "1948"}, None),
+    ]
+
+
+def test_batch_matches_like_single_runs_and_reports_failures(tmp_path, monkeypatch):
+    regdoc_path = tmp_path / "reg.json"
+    save_regdoc(REGDOC, regdoc_path)
+    profiles = [{"id": f"p{i}", "num_seats": 10 * i, "has_alcohol": i % 2 == 0} for i in range(7)]
+    profiles_path = tmp_path / "profiles.jsonl"
+    profiles_path.write_text("\n".join(map(json.dumps, profiles)) + "\n{broken\n", encoding="utf-8")
+
+    def fake_report(profile, rules):
+        if profile["num_seats"] == 0:
+            raise ConnectionError("LLM unavailable")
+        return f"{len(rules)} rules"
+
+    monkeypatch.setattr("backend.core.report_generator.generate_llm_report", fake_report)
+    output = tmp_path / "out" / "results.json"
+    summary = run_batch(profiles_path, output, "regdoc", str(regdoc_path), workers=1, reports=True, chunk_size=3)
+
+    assert json.loads(output.read_text(encoding="utf-8")) == summary
+    stats = summary["stats"]
+    assert (stats["profiles"], stats["matched"], stats["failed"]) == (8, 7, 1)
+    assert stats["reports"]["generated"] == 6 and stats["reports"]["failed"] == 1
+
+    for profile, result in zip(profiles, summary["results"]):
+        expected = [m["rule_id"] for m in iter_regdoc_matches({k: v for k, v in profile.items() if k != "id"}, str(regdoc_path))]
+        assert result["id"] == profile["id"] and result["rule_ids"] == expected
+        assert "matches" not in result
+    assert summary["results"][0]["report_error"] == "LLM unavailable"
+    assert summary["results"][-1]["status"] == "failed"
+
+    # A process pool gives the same results
+    pooled = run_batch(profiles_path, output, "regdoc", str(regdoc_path), workers=2, chunk_size=3)
+    assert [r.get("rule_ids") for r in pooled["results"]] == [r.get("rule_ids") for r in summary["results"]]
@@ -0,0 +1,65 @@
+# backend/tests/test_binary_store.py
+"""
+Tests for the binary regdoc / ruleset / match storage layout.
+"""
+
+import json
+
+import pytest
+
+from backend.core.binary_store import (
+    BinaryStore,
+    binary_to_json,
+    is_binary,
+    json_to_binary,
+    load_document,
+    write_binary,
+)
+from backend.core.matcher import load_compiled_rules
+from backend.core.regdoc_registry import RegdocRegistry
+from backend.core.regulation_parser import parse_to_json
+
+REGDOC = parse_to_json("פרק 1 - כללי\n1.1 רישוי\nרישיון משקאות\nפרק 2 - כבאות\n2.1 ציוד\nעד 50 מקומות", "d", "t")
+RULES = [{"id": "R1", "applies_if": {"uses_gas": True}}, {"id": "R2", "applies_if": {}}]
+MATCH = {"profile": {"uses_gas": True}, "matches": [{"rule_id": "1-1.1"}], "total_matches": 1}
+
+
+@pytest.mark.parametrize("document", [REGDOC, RULES, MATCH, {"profile": {}}])
+def test_round_trip_through_json_converters(tmp_path, document):
+    json_path = tmp_path / "doc.json"
+    json_path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    binary_path = json_to_binary(json_path)
+    assert binary_path.suffix == ".rstb" and is_binary(binary_path) and not is_binary(json_path)
+    assert load_document(binary_path) == document
+
+    back = binary_to_json(binary_path, tmp_path / "back.json")
+    assert back.read_text(encoding="utf-8") == json_path.read_text(encoding="utf-8")
+
+
+def test_records_are_read_lazily(tmp_path):
+    path = write_binary(REGDOC, tmp_path / "reg.rstb")
+    with BinaryStore(path) as store:
+        assert store.key == "sections"
+        assert store.document["docId"] == "d"
+        assert len(store) == 2 and store.ids == ["1", "2"]
+        assert store[-1] == REGDOC["sections"][1]
+        assert store.get("1")["subsections"][0]["title"] == "רישוי"
+        with pytest.raises(KeyError):
+            store.get("9")
+
+
+def test_loaders_accept_binary_files(tmp_path):
+    rules_path = write_binary(RULES, tmp_path / "rules.rstb")
+    assert load_compiled_rules(str(rules_path)) == RULES
+
+    json_path = tmp_path / "reg.json"
+    json_path.write_text(json.dumps(REGDOC, ensure_ascii=False), encoding="utf-8")
+    registry = RegdocRegistry()
+    from_json = registry.get(json_path)
+    from_binary = registry.get(write_binary(REGDOC, tmp_path / "reg.rstb"))
+    assert from_binary.regdoc == from_json.regdoc
+    assert (tmp_path / "reg.rstb.features.json").exists()
+
+    with pytest.raises(ValueError):
+        BinaryStore(json_path)
@@ -0,0 +1,41 @@
+# backend/tests/test_build_corpus.py
+"""
+Tests for the parallel corpus builder.
+"""
+
+import json
+
+from docx import Document
+
+from backend.scripts.build_corpus import MANIFEST_NAME, build_corpus, discover_sources
+
+
+def _write_docx(path, lines):
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def test_build_corpus_builds_then_skips_unchanged(tmp_path):
+    sources = tmp_path / "sources"
+    sources.mkdir()
+    _write_docx(sources / "a.docx", ["פרק 1 - כללי", "1.1 רישוי", "רישיון משקאות"])
+    _write_docx(sources / "b.docx", ["פרק 1 - כבאות", "1.1 ציוד", "מטפי כיבוי"])
+    (sources / "notes.txt").write_text("ignored", encoding="utf-8")
+    output = tmp_path / "corpus"
+
+    documents = discover_sources(sources)
+    assert [doc["doc_id"] for doc in documents] == ["a", "b"]
+
+    manifest = build_corpus(documents, output, workers=2)
+    assert [doc["status"] for doc in manifest["documents"]] == ["built", "built"]
+    regdoc = json.loads((output / "a.json").read_text(encoding="utf-8"))
+    assert regdoc["sections"][0]["subsections"][0]["content"] == "רישיון משקאות "
+    assert set(manifest["documents"][0]["timings"]) == {"extract_s", "parse_and_save_s", "total_s"}
+
+    _write_docx(sources / "b.docx", ["פרק 1 - כבאות", "1.1 ציוד", "מטפי כיבוי וגלגלון"])
+    manifest = build_corpus(discover_sources(sources), output, workers=2)
+    assert [doc["status"] for doc in manifest["documents"]] == ["skipped", "built"]
+    assert manifest["documents"][1]["changes"] == {"added": 0, "removed": 0, "modified": 1}
+    assert json.loads((output / MANIFEST_NAME).read_text(encoding="utf-8")) == manifest
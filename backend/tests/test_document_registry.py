@@ -0,0 +1,85 @@
+# backend/tests/test_document_registry.py
+"""
+Tests for the regulation document registry and its API routes.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from docx import Document
+
+from backend.core import document_registry
+from backend.core.document_registry import DocumentRegistry
+from backend.routes import documents as documents_route
+
+
+def _write_source(path, *lines):
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+    return path
+
+
+def test_documents_are_ingested_once_per_version(tmp_path, monkeypatch):
+    registry = DocumentRegistry(tmp_path / "documents")
+    source = _write_source(tmp_path / "reg.docx", "פרק 1 - כללי", "1.1 רישוי", "רישיון משקאות")
+
+    first = registry.register(source, "reg-test", "תקנות")
+    assert first["status"] == "registered" and first["version"] == 1
+
+    # Unchanged content: nothing is parsed again
+    monkeypatch.setattr(document_registry, "iter_pages", lambda path: 1 / 0)
+    assert registry.register(source, "reg-test")["status"] == "unchanged"
+    monkeypatch.undo()
+
+    _write_source(source, "פרק 1 - כללי", "1.1 רישוי", "רישיון משקאות", "1.2 שילוט")
+    second = registry.register(source, "reg-test")
+    assert second["version"] == 2 and second["changes"] == {"added": 1, "removed": 0, "modified": 0}
+
+    assert registry.resolve("reg-test")["version"] == 2
+    assert registry.load("reg-test", 1).regdoc["title"] == "תקנות"
+    assert [d["latest_version"] for d in registry.documents()] == [2]
+    with pytest.raises(KeyError):
+        registry.resolve("reg-test", 3)
+    for doc_id in ("../escape", "..", ".", ".hidden", "a..b"):
+        with pytest.raises(ValueError):
+            registry.register(source, doc_id)
+
+
+def test_concurrent_writers_do_not_lose_documents(tmp_path):
+    # Separate instances share nothing in memory, like the API and a CLI process
+    sources = [_write_source(tmp_path / f"reg{i}.docx", f"פרק {i} - כללי", f"{i}.1 סעיף") for i in range(6)]
+    root = tmp_path / "documents"
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda i: DocumentRegistry(root).register(sources[i], f"reg-{i}"), range(6)))
+    assert [d["doc_id"] for d in DocumentRegistry(root).documents()] == [f"reg-{i}" for i in range(6)]
+
+
+def test_document_routes(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(document_registry.DOCUMENT_REGISTRY, "root", tmp_path / "documents")
+    monkeypatch.setattr(documents_route, "SOURCE_DIRS", [tmp_path / "sources"])
+    (tmp_path / "sources").mkdir()
+    source = _write_source(tmp_path / "sources" / "reg.docx", "פרק 1 - כללי", "1.1 רישוי")
+
+    response = client.post("/api/v1/documents", json={"source_path": str(source), "doc_id": "reg-api"})
+    assert response.status_code == 200 and response.json()["version"] == 1
+
+    # Only files under the source roots are read, and only real regdocs are stored
+    secret = tmp_path / "secret.json"
+    secret.write_text('{"api_key": "x"}', encoding="utf-8")
+    for outside in (str(secret), str(tmp_path / "sources" / ".." / "secret.json"), "/etc/passwd"):
+        assert client.post("/api/v1/documents", json={"source_path": outside, "doc_id": "leak"}).status_code == 400
+    not_regdoc = tmp_path / "sources" / "settings.json"
+    not_regdoc.write_text('{"api_key": "x"}', encoding="utf-8")
+    assert client.post("/api/v1/documents", json={"source_path": str(not_regdoc), "doc_id": "leak"}).status_code == 422
+    assert client.post("/api/v1/documents", json={"source_path": str(tmp_path / "sources" / "nope.pdf"),
+                                                  "doc_id": "leak"}).status_code == 404
+    assert "leak" not in [d["doc_id"] for d in client.get("/api/v1/documents").json()["documents"]]
+    assert client.get("/api/v1/documents").json()["documents"][0]["doc_id"] == "reg-api"
+    assert client.get("/api/v1/documents/reg-api", params={"version": 2}).status_code == 404
+
+    # Pipeline requests name exactly one regulation source; unknown ids are rejected up front
+    body = {"profile_path": "p.json", "output_dir": str(tmp_path)}
+    assert client.post("/api/v1/pipeline/run", json=body).status_code == 422
+    assert client.post("/api/v1/pipeline/run", json={**body, "doc_id": "missing"}).status_code == 404
@@ -55,4 +55,55 @@ def test_extract_text_docx_valid(tmp_path):
     doc.save(file_path)
 
     result = extract_text(file_path)
-    assert "Regulation Check" in result
\ No newline at end of file
+    assert "Regulation Check" in result
+
+def test_extract_pdf_parallel_keeps_page_order(tmp_path, monkeypatch):
+    """Checks that page-parallel extraction and page ranges keep the serial page order."""
+    import fitz
+    from backend.scripts import extract_regulations
+
+    file_path = tmp_path / "pages.pdf"
+    doc = fitz.open()
+    for number in range(1, 9):
+        page = doc.new_page()
+        if number != 4:  # one empty page, skipped in the output
+            page.insert_text((72, 72), f"Page {number}")
+    doc.save(file_path)
+
+    monkeypatch.setattr(extract_regulations, "MIN_PAGES_PER_WORKER", 2)
+    serial = extract_text_from_pdf(file_path)
+    assert serial.split("\n\n") == [f"Page {n}" for n in (1, 2, 3, 5, 6, 7, 8)]
+    assert extract_text_from_pdf(file_path, workers=3) == serial
+    assert extract_text_from_pdf(file_path, pages=(3, 5), workers=2) == "Page 3\n\nPage 5"
+
+    with pytest.raises(ValueError):
+        extract_text_from_pdf(file_path, pages=(5, 9))
+
+
+def test_iter_pages_streams_the_same_text(tmp_path):
+    """Checks that iter_pages/iter_lines yield what extract_text returns, for PDF and DOCX."""
+    import fitz
+    from docx import Document
+    from backend.scripts.extract_regulations import PAGE_SEPARATORS, iter_lines, iter_pages
+
+    pdf_path = tmp_path / "pages.pdf"
+    doc = fitz.open()
+    for number in range(1, 4):
+        doc.new_page().insert_text((72, 72), f"Page {number}\nline")
+    doc.save(pdf_path)
+
+    docx_path = tmp_path / "sample.docx"
+    docx = Document()
+    for text in ("first", "  ", "second"):
+        docx.add_paragraph(text)
+    docx.save(docx_path)
+
+    for path in (pdf_path, docx_path):
+        pages = iter_pages(path)
+        assert not isinstance(pages, (list, str))
+        assert PAGE_SEPARATORS[path.suffix].join(pages) == extract_text(path)
+        assert list(iter_lines(path)) == [line for line in extract_text(path).splitlines() if line]
+
+    assert list(iter_pages(pdf_path, pages=(2, 2))) == ["Page 2\nline"]
+    with pytest.raises(ValueError):
+        iter_pages(docx_path, pages=(1, 1))
@@ -0,0 +1,87 @@
+# backend/tests/test_incremental.py
+import random
+
+from backend.core.incremental import IncrementalRegdocMatcher, IncrementalRuleMatcher
+from backend.core.matcher import match_rules
+from backend.core.matcher_from_regdoc import match_conditions
+from backend.core.ruleset import RuleSet
+
+RULES = [
+    {"id": "GAS", "severity": "mandatory", "applies_if": {"uses_gas": True}},
+    {"id": "SMALL", "severity": "info", "applies_if": {"area_sqm": {"max": 80}}},
+    {"id": "BAR", "severity": "info", "applies_if": {"has_alcohol": True, "num_seats": {"min": 50}}},
+]
+
+REGDOC = {
+    "docId": "test",
+    "title": "Test regulation",
+    "sections": [
+        {"id": "1", "title": "כבאות", "subsections": [
+            {"id": "1.1", "title": "גז", "content": "עסק המשתמש בבלוני גז יתקין מערכת גז תקנית"},
+            {"id": "1.2", "title": "שטח", "content": "עסק ששטחו עד 100 מ\"ר"},
+        ]},
+        {"id": "2", "title": "משטרה", "subsections": [
+            {"id": "2.1", "title": "אלכוהול", "content": "מכירת אלכוהול בעסק מעל 50 מקומות ישיבה"},
+            {"id": "2.2", "title": "ריק", "content": "   "},
+            {"id": "2.3", "title": "משלוחים", "content": "שירות משלוחים"},
+        ]},
+    ],
+}
+
+PROFILE = {"uses_gas": False, "area_sqm": 60, "num_seats": 20, "has_alcohol": False, "delivers": True}
+
+
+def _regdoc_matches(profile):
+    matches = []
+    for section in REGDOC["sections"]:
+        for sub in section["subsections"]:
+            content = sub["content"].strip()
+            reasons = match_conditions(content, profile) if content else []
+            if reasons:
+                matches.append({
+                    "rule_id": f"{section['id']}-{sub['id']}",
+                    "title": sub["title"],
+                    "authority": section["title"],
+                    "applies_because": reasons,
+                    "requirement_text": content,
+                })
+    return matches
+
+
+def test_incremental_rules_delta():
+    ruleset = RuleSet(RULES)
+    matcher = IncrementalRuleMatcher(ruleset, PROFILE)
+    assert [m["id"] for m in matcher.result()["matches"]] == ["SMALL"]
+
+    delta = matcher.update({"uses_gas": True, "area_sqm": 120})
+    assert [m["id"] for m in delta["added"]] == ["GAS"]
+    assert [m["id"] for m in delta["removed"]] == ["SMALL"]
+    assert matcher.result() == match_rules(matcher.profile, RULES)
+
+
+def test_incremental_regdoc_delta():
+    matcher = IncrementalRegdocMatcher(REGDOC, PROFILE)
+    assert matcher.result()["matches"] == _regdoc_matches(PROFILE)
+
+    delta = matcher.update({"uses_gas": True})
+    assert [m["rule_id"] for m in delta["added"]] == ["1-1.1"]
+    assert delta["removed"] == []
+
+    delta = matcher.update({"delivers": False})
+    assert [m["rule_id"] for m in delta["removed"]] == ["2-2.3"]
+
+
+def test_incremental_matchers_follow_random_toggles():
+    rng = random.Random(3)
+    ruleset = RuleSet(RULES)
+    rules_matcher = IncrementalRuleMatcher(ruleset, PROFILE)
+    regdoc_matcher = IncrementalRegdocMatcher(REGDOC, PROFILE)
+
+    for _ in range(50):
+        key = rng.choice(list(PROFILE))
+        value = rng.choice([10, 50, 51, 100, 120]) if key in ("area_sqm", "num_seats") else rng.random() < 0.5
+        rules_matcher.update({key: value})
+        regdoc_matcher.update({key: value})
+
+        assert rules_matcher.result() == match_rules(rules_matcher.profile, ruleset)
+        assert regdoc_matcher.result()["matches"] == _regdoc_matches(regdoc_matcher.profile)
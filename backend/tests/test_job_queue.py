@@ -0,0 +1,178 @@
+# backend/tests/test_job_queue.py
+"""
+Tests for the SQLite-backed background job queue and its API routes.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from backend.core.job_queue import JobQueue
+from backend.routes import jobs as jobs_route
+
+
+def _wait_for(queue, job_id, statuses=("completed", "failed", "cancelled"), timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {queue.get(job_id)['status']}")
+
+
+class GatedRunner:
+    """Fake pipeline: reports two stages, waiting for the test between them."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.proceed = threading.Event()
+        self.calls = []
+
+    def __call__(self, job_id, params, on_stage):
+        self.calls.append(job_id)
+        on_stage("match")
+        self.started.set()
+        self.proceed.wait(5)
+        on_stage("report")
+        if params.get("fail"):
+            raise RuntimeError("LLM unavailable")
+        return {"run_id": job_id, "report": f"report for {params['name']}"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    runner = GatedRunner()
+    queue = JobQueue(tmp_path / "jobs.sqlite3", workers=1, runner=runner, poll_interval=0.05)
+    queue.runner_under_test = runner
+    yield queue
+    runner.proceed.set()
+    queue.stop(timeout=5)
+
+
+def test_jobs_run_in_the_background_and_dedupe(queue):
+    runner = queue.runner_under_test
+    job, created = queue.submit({"name": "a"})
+    assert created
+    runner.started.wait(5)
+    assert queue.get(job["id"])["status"] == "running" and queue.get(job["id"])["stage"] == "match"
+
+    # Same parameters while in flight: same job; different ones: a new queued job
+    assert queue.submit({"name": "a"}) == (queue.get(job["id"]), False)
+    other, created = queue.submit({"name": "b", "fail": True})
+    assert created and other["status"] == "queued"
+
+    runner.proceed.set()
+    done = _wait_for(queue, job["id"])
+    assert done["status"] == "completed" and done["stage"] == "report"
+    assert done["result"] == {"run_id": job["id"], "report": "report for a"}
+    failed = _wait_for(queue, other["id"])
+    assert failed["status"] == "failed" and failed["error"] == "LLM unavailable"
+    assert runner.calls == [job["id"], other["id"]]
+
+    # Finished jobs no longer absorb submissions
+    assert queue.submit({"name": "a"})[1]
+
+
+def test_cancellation(queue):
+    runner = queue.runner_under_test
+    running, _ = queue.submit({"name": "a"})
+    queued, _ = queue.submit({"name": "b"})
+    runner.started.wait(5)
+
+    assert queue.cancel(queued["id"])["status"] == "cancelled"
+    assert queue.cancel(running["id"])["cancel_requested"]
+    runner.proceed.set()
+    job = _wait_for(queue, running["id"])
+    assert job["status"] == "cancelled" and job["stage"] == "match"  # stopped before the report stage
+    assert runner.calls == [running["id"]]
+    assert queue.cancel("missing") is None
+
+
+def test_jobs_with_an_expired_lease_are_taken_over(tmp_path):
+    db = tmp_path / "jobs.sqlite3"
+    crashed = JobQueue(db, workers=1, runner=GatedRunner(), poll_interval=0.05)
+    live_runner = GatedRunner()
+    live = JobQueue(db, workers=1, runner=live_runner, poll_interval=0.05, lease_seconds=0.3)
+    dead, _ = crashed.submit({"name": "dead"})
+    alive, _ = live.submit({"name": "alive"})
+    live_runner.started.wait(5)
+    crashed.stop(timeout=0)
+
+    # The first pool dies mid-job: its lease runs out without being renewed
+    with crashed._connect() as conn:
+        conn.execute("UPDATE jobs SET owner = 'dead-host:1:x', lease_until = ? WHERE id = ?", (time.time() - 1, dead["id"]))
+
+    # A new pool takes the dead job over (job id = run id is kept) but leaves the live pool's job alone
+    second = JobQueue(db, workers=1, runner=lambda job_id, params, on_stage: {"run_id": job_id}, poll_interval=0.05)
+    try:
+        second.start()
+        assert _wait_for(second, dead["id"])["result"] == {"run_id": dead["id"]}
+        time.sleep(0.6)  # twice the live pool's lease: only its heartbeat keeps the job
+        assert second.get(alive["id"])["status"] == "running"
+        assert alive["id"] not in [job["result"]["run_id"] for job in second.jobs("completed")]
+    finally:
+        second.stop(timeout=5)
+        crashed.runner.proceed.set()
+        live_runner.proceed.set()
+        assert _wait_for(live, alive["id"])["result"]["report"] == "report for alive"
+        live.stop(timeout=5)
+        crashed.stop(timeout=5)
+
+
+def test_jobs_api(client, tmp_path, monkeypatch):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", workers=1, poll_interval=0.05,
+                     runner=lambda job_id, params, on_stage: on_stage("match") or {"profile": params["profile"]})
+    monkeypatch.setattr(jobs_route, "JOB_QUEUE", queue)
+    monkeypatch.setattr(jobs_route, "EVENTS_POLL_INTERVAL", 0.01)
+    body = {"profile": {"business_name": "פלאפל", "area_sqm": 60, "num_seats": 20}, "source_doc_path": "reg.pdf", "output_dir": str(tmp_path)}
+    try:
+        response = client.post("/api/v1/jobs", json=body)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        events = client.get(f"/api/v1/jobs/{job_id}/events").text
+        assert "event: progress" in events and events.rstrip().split("\n")[-2] == "event: done"
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        assert job["status"] == "completed" and job["result"]["profile"]["business_name"] == "פלאפל"
+        assert client.get("/api/v1/jobs/nope").status_code == 404
+        assert client.post("/api/v1/jobs/nope/cancel").status_code == 404
+    finally:
+        queue.stop(timeout=5)
+
+
+def test_database_errors_do_not_stop_the_workers_or_the_heartbeat(tmp_path, monkeypatch):
+    runner = GatedRunner()
+    queue = JobQueue(tmp_path / "jobs.sqlite3", workers=1, runner=runner, poll_interval=0.05, lease_seconds=0.3)
+    connect, failures = queue._connect, {"claim": 1, "renew": 0}
+
+    def flaky_claim(original=queue._claim):
+        if failures["claim"]:
+            failures["claim"] -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return original()
+
+    def flaky_connect():
+        if failures["renew"] and threading.current_thread().name == "job-heartbeat":
+            failures["renew"] -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return connect()
+
+    monkeypatch.setattr(queue, "_claim", flaky_claim)
+    monkeypatch.setattr(queue, "_connect", flaky_connect)
+    try:
+        job, _ = queue.submit({"name": "a"})
+        assert runner.started.wait(5)  # the worker survived a failing claim
+        failures["renew"] = 2
+        time.sleep(0.6)  # twice the lease: renewals fail first, then succeed
+        assert failures["renew"] == 0
+        with connect() as conn:
+            lease_until = conn.execute("SELECT lease_until FROM jobs WHERE id = ?", (job["id"],)).fetchone()[0]
+        assert lease_until > time.time()
+        runner.proceed.set()
+        assert _wait_for(queue, job["id"])["status"] == "completed"
+    finally:
+        runner.proceed.set()
+        queue.stop(timeout=5)
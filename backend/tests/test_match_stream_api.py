@@ -0,0 +1,83 @@
+# backend/tests/test_match_stream_api.py
+"""
+Tests for the /match/stream API endpoint.
+Matches are streamed as NDJSON lines or SSE events, in document order.
+"""
+
+import json
+
+import pytest
+
+from backend.core import document_registry
+from backend.core.matcher_from_regdoc import match_from_regdoc
+from backend.core.regdoc_features import save_regdoc
+from backend.routes import matches
+
+REGDOC = {
+    "docId": "reg-stream-test",
+    "title": "Test",
+    "sections": [
+        {"id": "1", "title": "משטרה", "subsections": [
+            {"id": "1.1", "title": "", "content": "בית אוכל עד 50 מקומות ישיבה"},
+            {"id": "1.2", "title": "", "content": "רישיון משקאות באישור המשטרה"},
+            {"id": "1.3", "title": "", "content": "כללי"},
+        ]},
+    ],
+}
+PROFILE = {"has_alcohol": True, "num_seats": 40}
+
+
+@pytest.fixture(autouse=True)
+def regdoc_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(matches, "REGDOC_DIR", tmp_path)
+
+
+def test_stream_ndjson_matches_file_output(client, tmp_path):
+    regdoc_path = tmp_path / "reg.json"
+    save_regdoc(REGDOC, regdoc_path)
+
+    response = client.post("/api/v1/match/stream", json={"profile": PROFILE, "regdoc_path": str(regdoc_path)})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1] == {"type": "done", "total_matches": 2}
+
+    outfile = match_from_regdoc(PROFILE, str(regdoc_path), str(tmp_path), "stream")
+    with open(outfile, encoding="utf-8") as f:
+        expected = json.load(f)["matches"]
+    assert [line["match"] for line in lines[:-1]] == expected
+
+
+def test_stream_sse_events(client, tmp_path):
+    regdoc_path = tmp_path / "reg.json"
+    save_regdoc(REGDOC, regdoc_path)
+
+    response = client.post(
+        "/api/v1/match/stream",
+        json={"profile": PROFILE, "regdoc_path": str(regdoc_path), "format": "sse"}
+    )
+
+    assert response.status_code == 200
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    assert [event[0] for event in events] == ["event: match", "event: match", "event: done"]
+    assert json.loads(events[0][1][len("data: "):])["rule_id"] == "1-1.1"
+
+
+def test_stream_unknown_regdoc_returns_404(client, tmp_path):
+    response = client.post("/api/v1/match/stream", json={"profile": PROFILE, "regdoc_path": str(tmp_path / "missing.json")})
+    assert response.status_code == 404
+
+
+def test_stream_only_reads_registered_or_processed_regdocs(client, tmp_path, monkeypatch):
+    outside = tmp_path.parent / f"{tmp_path.name}-outside.json"
+    save_regdoc(REGDOC, outside)
+    for ref in (str(outside), str(tmp_path / ".." / outside.name), "/etc/passwd"):
+        response = client.post("/api/v1/match/stream", json={"profile": PROFILE, "regdoc_path": ref})
+        assert response.status_code == 400
+
+    # A registered doc id is resolved through the registry, wherever its regdoc lives
+    monkeypatch.setattr(document_registry.DOCUMENT_REGISTRY, "root", tmp_path.parent / f"{tmp_path.name}-documents")
+    document_registry.DOCUMENT_REGISTRY.register(outside, "reg-stream")
+    response = client.post("/api/v1/match/stream", json={"profile": PROFILE, "regdoc_path": "reg-stream"})
+    assert response.status_code == 200 and json.loads(response.text.splitlines()[-1])["total_matches"] == 2
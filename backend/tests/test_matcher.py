@@ -1,7 +1,17 @@
 # backend/tests/test_matcher.py
 import json
+import os
 from pathlib import Path
-from backend.core.matcher import match_rules, save_match_result, run_full_match
+from backend.core.file_cache import FileCache
+from backend.core.batch_matcher import match_rules_batch
+from backend.core.matcher import (
+    match_rules,
+    save_match_result,
+    run_full_match,
+    load_compiled_rules,
+    get_ruleset,
+)
+from backend.core.ruleset import RuleSet
 
 EXAMPLE_RULES = [
     {
@@ -10,7 +20,7 @@ EXAMPLE_RULES = [
         "authority": "Ministry of Health",
         "severity": "mandatory",
         "applies_if": {"uses_gas": True},
-        "requirements": [{"name": "Connect to certified water system"}, {"name": "Periodic disinfection"}],
+        "requirements": [{"name": "Connect to certified water system"}, {"name": "חיטוי תקופתי"}],
         "source": {"section": "4", "sub": "4.6"},
         "tags": ["water"]
     },
@@ -46,3 +56,176 @@ def test_gap_detection_exists():
 
 def test_save_match_result_creates_file(tmp_path):
     dummy_result = {"profile": {"seats": 100}, "matches": [], "gaps": []}
+
+
+def test_ruleset_matches_same_as_list():
+    ruleset = RuleSet(EXAMPLE_RULES)
+    profiles = [
+        {"uses_gas": True, "seats": 120, "serves_alcohol": False},
+        {"uses_gas": False, "seats": 250, "serves_alcohol": True},
+        {"uses_gas": True, "seats": 200, "serves_alcohol": False},
+        {"uses_gas": True},
+        {},
+    ]
+    for profile in profiles:
+        assert match_rules(profile, ruleset) == match_rules(profile, EXAMPLE_RULES)
+
+
+def test_ruleset_falls_back_for_unhashable_conditions():
+    rules = EXAMPLE_RULES + [{
+        "id": "LIST_VALUE",
+        "title": "Condition with a list value",
+        "severity": "info",
+        "applies_if": {"uses_gas": True, "zones": ["A", "B"]},
+    }]
+    ruleset = RuleSet(rules)
+    profile = {"uses_gas": True, "zones": ["A", "B"], "seats": 10, "serves_alcohol": False}
+    result = match_rules(profile, ruleset)
+    assert [m["id"] for m in result["matches"]] == ["MOH_WATER", "POLICE_CCTV_EXEMPT", "LIST_VALUE"]
+    assert result == match_rules(profile, rules)
+
+
+def test_ruleset_cache_reuses_parsed_rules(tmp_path):
+    rules_path = tmp_path / "compiled_rules.json"
+    rules_path.write_text(json.dumps(EXAMPLE_RULES), encoding="utf-8")
+    cache = FileCache(lambda path: RuleSet(load_compiled_rules(path)))
+
+    first = cache.get(rules_path)
+    assert cache.get(str(rules_path)) is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    # Same content with a new timestamp keeps the parsed ruleset
+    os.utime(rules_path, ns=(0, 0))
+    assert cache.get(rules_path) is first
+    assert cache.stats()["revalidations"] == 1
+
+    rules_path.write_text(json.dumps(EXAMPLE_RULES[:1]), encoding="utf-8")
+    assert len(cache.get(rules_path)) == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_file_cache_evicts_least_recently_used(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.json"
+        path.write_text("x" * 100, encoding="utf-8")
+        paths.append(path)
+    cache = FileCache(lambda path: object(), max_bytes=250)
+
+    a = cache.get(paths[0])
+    cache.get(paths[1])
+    assert cache.get(paths[0]) is a  # "a" is now the most recently used
+    cache.get(paths[2])
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 200
+    assert stats["evictions"] == 1
+    assert cache.get(paths[0]) is a
+    assert cache.stats()["misses"] == 3
+
+    cache.get(paths[1])  # evicted: loaded again
+    assert cache.stats()["misses"] == 4
+
+
+def test_get_ruleset_is_shared(tmp_path):
+    rules_path = tmp_path / "compiled_rules.json"
+    rules_path.write_text(json.dumps(EXAMPLE_RULES), encoding="utf-8")
+    assert get_ruleset(str(rules_path)) is get_ruleset(str(rules_path))
+
+
+def test_match_rules_batch_equals_single_matches():
+    rules = EXAMPLE_RULES + [{
+        "id": "LIST_VALUE",
+        "title": "Condition with a list value",
+        "severity": "mandatory",
+        "applies_if": {"zones": ["A"]},
+        "requirements": [{"name": "חיטוי תקופתי"}],
+    }]
+    profiles = [
+        {"uses_gas": True, "seats": 120, "serves_alcohol": False, "zones": ["A"]},
+        {"uses_gas": False, "seats": 250, "serves_alcohol": True},
+        {"uses_gas": True, "seats": None, "serves_alcohol": False},
+        {"uses_gas": 1, "seats": 200.0},
+        {},
+    ]
+    batch = match_rules_batch(profiles, rules, block_size=2)
+    assert batch == [match_rules(p, rules) for p in profiles]
+    assert [g["rule_id"] for g in batch[0]["gaps"]] == ["MOH_WATER", "LIST_VALUE"]
+
+
+OPERATOR_RULES = [
+    {"id": "SMALL", "severity": "info", "applies_if": {"business_area_sqm": {"max": 80}}},
+    {"id": "LARGE_HALL", "severity": "mandatory", "applies_if": {"seating_capacity": {"min": 100}}},
+    {"id": "MID", "severity": "info", "applies_if": {"seating_capacity": {"range": [20, 50]}}},
+    {"id": "MID_MINMAX", "severity": "info", "applies_if": {"seating_capacity": {"min": 20, "max": 50}}},
+    {"id": "TYPES", "severity": "info", "applies_if": {"business_type": {"in": ["cafe", "pub"]}}},
+    # Not a threshold: like any plain key, it is compared by equality on the full key
+    {"id": "MIN_SUFFIX_KEY", "severity": "info", "applies_if": {"business_area_sqm_min": 100}},
+]
+
+
+def test_operator_conditions_match():
+    profile = {"business_area_sqm": 60, "seating_capacity": 40, "business_type": "cafe"}
+    result = match_rules(profile, OPERATOR_RULES)
+    assert [m["id"] for m in result["matches"]] == ["SMALL", "MID", "MID_MINMAX", "TYPES"]
+    assert result["matches"][0]["applies_because"] == ["business_area_sqm ≤ 80"]
+    assert result["matches"][1]["applies_because"] == ["20 ≤ seating_capacity ≤ 50"]
+
+    profile = {"business_area_sqm": 150, "seating_capacity": 120, "business_type": "restaurant"}
+    result = match_rules(profile, OPERATOR_RULES)
+    assert [m["id"] for m in result["matches"]] == ["LARGE_HALL"]
+    assert result["matches"][0]["applies_because"] == ["seating_capacity ≥ 100"]
+
+    result = match_rules({"business_area_sqm_min": 100}, OPERATOR_RULES)
+    assert [m["id"] for m in result["matches"]] == ["MIN_SUFFIX_KEY"]
+
+
+def test_operator_conditions_identical_across_engines():
+    ruleset = RuleSet(OPERATOR_RULES)
+    profiles = [
+        {"business_area_sqm": a, "seating_capacity": s, "business_type": t}
+        for a in (None, 0, 80, 80.5, 100, 150)
+        for s in (None, 19, 20, 50, 51, 100)
+        for t in ("cafe", "pub", "restaurant", None)
+    ]
+    expected = [match_rules(p, OPERATOR_RULES) for p in profiles]
+    assert [match_rules(p, ruleset) for p in profiles] == expected
+    assert match_rules_batch(profiles, ruleset) == expected
+
+
+def test_gap_rules_are_pluggable():
+    gap_rules = [{
+        "terms": ["CCTV"],
+        "gap": "Missing CCTV exemption letter",
+        "suggested_action": "Request the exemption letter from the police",
+    }]
+    profile = {"uses_gas": True, "seats": 120, "serves_alcohol": False}
+    result = match_rules(profile, RuleSet(EXAMPLE_RULES, gap_rules=gap_rules))
+    assert result["gaps"] == [{
+        "rule_id": "POLICE_CCTV_EXEMPT",
+        "gap": "Missing CCTV exemption letter",
+        "suggested_action": "Request the exemption letter from the police",
+    }]
+
+
+def test_list_matching_uses_the_precomputed_gap_table(monkeypatch):
+    from backend.core import ruleset as ruleset_module
+
+    calls = []
+    detect_gaps = ruleset_module.detect_gaps
+
+    def counting_detect_gaps(match, gap_rules=None):
+        calls.append(match["id"])
+        return detect_gaps(match, gap_rules)
+
+    monkeypatch.setattr(ruleset_module, "detect_gaps", counting_detect_gaps)
+    rules = [dict(rule) for rule in EXAMPLE_RULES]
+    profile = {"uses_gas": True, "seats": 120, "serves_alcohol": False}
+    first = match_rules(profile, rules)
+    assert match_rules(profile, rules) == first == match_rules(profile, RuleSet(rules))
+    assert len(calls) == 2 * len(rules)  # once for the list, once for the explicit RuleSet
+
+    rules.append({"id": "NEW", "severity": "info", "applies_if": {"uses_gas": True}})
+    assert [m["id"] for m in match_rules(profile, rules)["matches"]][-1] == "NEW"
@@ -0,0 +1,165 @@
+# backend/tests/test_matcher_from_regdoc.py
+import hashlib
+import json
+import random
+
+from backend.core.hebrew_text import normalize_hebrew
+from backend.core.keywords import extract_thresholds
+from backend.core.matcher_from_regdoc import SYNONYMS, _keyword_match, keys_mentioned, match_conditions, match_from_regdoc
+from backend.core.regdoc_features import (
+    ThresholdIndex,
+    feature_index_path,
+    features_for,
+    iter_subsections,
+    load_feature_index,
+    save_regdoc,
+)
+from backend.core.regdoc_registry import RegdocRegistry
+from backend.core.regulation_parser import parse_to_json
+from backend.core.text_search import AhoCorasick
+
+REGDOC = {
+    "docId": "reg-test",
+    "title": "Test",
+    "sections": [
+        {"id": "1", "title": "כללי", "subsections": [
+            {"id": "1.1", "title": "", "content": "בית אוכל עד 50 מקומות ישיבה"},
+            {"id": "1.2", "title": "", "content": "רישיון משקאות באישור המשטרה"},
+            {"id": "1.3", "title": "", "content": "שטח העסק מעל 120.5 מ\"ר"},
+        ]},
+    ],
+}
+
+
+def _reference_keys(content):
+    return {key for key in SYNONYMS if _keyword_match(key, content)}
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    assert automaton.labels_in("ushers") == {1, 2, 4}
+    assert automaton.labels_in("this") == {3}
+    assert automaton.labels_in("xyz") == set()
+
+
+def test_keys_mentioned_matches_reference_on_synonyms():
+    for words in SYNONYMS.values():
+        for word in words:
+            content = f"סעיף כללי: {word} בעסק"
+            assert keys_mentioned(content) == _reference_keys(content)
+
+
+def test_keys_mentioned_matches_reference_on_random_text():
+    rng = random.Random(11)
+    vocabulary = [w for words in SYNONYMS.values() for w in words] + ["עסק", "תנאי", "רישיון", "מטבח", " ", "."]
+    for _ in range(300):
+        content = "".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+        # Cut words in half now and then to exercise partial matches
+        if content and rng.random() < 0.3:
+            content = content[rng.randint(0, len(content) - 1):]
+        assert keys_mentioned(content) == _reference_keys(content)
+
+
+def test_feature_index_is_saved_and_refreshed_with_regdoc(tmp_path):
+    regdoc_path = tmp_path / "reg.json"
+    index_path = save_regdoc(REGDOC, regdoc_path)
+    assert index_path == feature_index_path(regdoc_path) == tmp_path / "reg.features.json"
+
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    assert [entry["rule_id"] for entry in index["subsections"]] == ["1-1.1", "1-1.2", "1-1.3"]
+    assert "has_alcohol" in index["subsections"][1]["keys"]
+
+    # Regdoc edited by hand: the stale index is rebuilt on the next match
+    regdoc = json.loads(regdoc_path.read_text(encoding="utf-8"))
+    regdoc["sections"][0]["subsections"][0]["content"] = "כל עסק"
+    regdoc_path.write_text(json.dumps(regdoc, ensure_ascii=False), encoding="utf-8")
+
+    profile = {"has_alcohol": True, "num_seats": 50}
+    outfile = match_from_regdoc(profile, str(regdoc_path), str(tmp_path), "p1")
+    matches = json.loads(open(outfile, encoding="utf-8").read())["matches"]
+    assert [m["rule_id"] for m in matches] == ["1-1.2"]
+    assert json.loads(index_path.read_text(encoding="utf-8"))["subsections"][0]["keys"] == []
+
+
+def test_stored_feature_index_matches_like_fresh_features(tmp_path):
+    regdoc_path = tmp_path / "reg.json"
+    save_regdoc(REGDOC, regdoc_path)
+    raw = regdoc_path.read_bytes()
+    stored = load_feature_index(regdoc_path, REGDOC, hashlib.sha256(raw).hexdigest())
+
+    rng = random.Random(5)
+    profiles = [
+        {"has_alcohol": rng.random() < 0.5, "num_seats": rng.choice([20, 50, 51, 120]),
+         "area_sqm": rng.choice([5, 0.5, 120.5, 12]), "uses_gas": rng.random() < 0.5, "flag": False}
+        for _ in range(40)
+    ]
+    for (_, _, content), features in zip(iter_subsections(REGDOC), stored):
+        for profile in profiles:
+            assert match_conditions(content, profile, features) == match_conditions(content, profile, features_for(content))
+
+
+def test_regdoc_registry_shares_and_reloads_documents(tmp_path):
+    regdoc_path = tmp_path / "reg.json"
+    save_regdoc(REGDOC, regdoc_path)
+    registry = RegdocRegistry()
+
+    loaded = registry.get(regdoc_path)
+    assert registry.get(str(regdoc_path)) is loaded
+    assert registry.get_by_id("reg-test") is loaded
+    assert [content for _, _, content in loaded.subsections][1] == "רישיון משקאות באישור המשטרה"
+    assert len(loaded.features) == len(loaded.subsections) == 3
+
+    stats = registry.stats()
+    assert (stats["hits"], stats["misses"], stats["doc_ids"]) == (2, 1, ["reg-test"])
+    assert stats["bytes"] > 0
+
+    regdoc = dict(REGDOC, sections=REGDOC["sections"][:0])
+    save_regdoc(regdoc, regdoc_path)
+    assert registry.get(regdoc_path).subsections == []
+
+
+def test_threshold_clauses_are_read_per_unit():
+    content = 'עסק עד 50 מקומות ישיבה, ששטחו מעל200 " מ"ר'
+    assert extract_thresholds(content) == [("upto", 50.0, "seats"), ("above", 200.0, "sqm")]
+
+    # Previously both fields were compared with the first number (50)
+    assert match_conditions(content, {"num_seats": 40, "area_sqm": 100}) == ["✔ num_seats ≤ 40"]
+    assert match_conditions(content, {"num_seats": 60, "area_sqm": 250}) == ["✔ area_sqm > 250"]
+    assert match_conditions("סגירה עד 48 שעות", {"area_sqm": 10}) == []
+
+
+def test_threshold_index_agrees_with_subsection_features():
+    contents = [
+        "עד 50 מקומות", "מעל 50 מקומות", "עד 100 מ\"ר ומעל 20 איש", "עד 10 ומעל 30",
+        "מעל 300 מ\"ר", "כללי", "עד 1,000 מ״ר", "עד 80 מקומות ישיבה ועד 120 מקומות",
+    ]
+    features = [features_for(content) for content in contents]
+    index = ThresholdIndex(features)
+    rng = random.Random(3)
+    values = [0, 10, 20, 30, 50, 80, 100, 120, 300, 1000, 1001, float("inf"), float("nan")]
+    values += [rng.uniform(0, 1200) for _ in range(50)]
+    for key in ("num_seats", "area_sqm", "employees"):
+        for value in values:
+            expected = {i for i, f in enumerate(features) if f.threshold(key, value) is not None}
+            assert index.subsections(key, value) == expected
+
+
+def test_normalize_hebrew_canonical_form():
+    assert normalize_hebrew("שָׁלוֹם  עוֹלָם\u200f") == "שלומ עולמ"
+    assert normalize_hebrew("100 מ״ר") == normalize_hebrew("100 מ''ר") == '100 מ"ר'
+    text = " רישיון\u00a0 משקאות׳ "
+    assert normalize_hebrew(normalize_hebrew(text)) == normalize_hebrew(text) == "רישיונ משקאות'"
+
+
+def test_matching_ignores_spelling_variants():
+    # Niqqud, broken spacing and a non-final mem inside a longer word
+    assert "has_alcohol" in keys_mentioned("רִישְׁיוֹן   משקאות")
+    assert "has_meat" in keys_mentioned("בשר אדומים")
+    assert match_conditions("בעסק עד 120 מ''ר", {"area_sqm": 100}) == ["✔ area_sqm ≤ 100"]
+
+
+def test_parse_to_json_stores_normalized_content():
+    regdoc = parse_to_json("פרק 1 - כללי\n1.1 רישוי\nרִישְׁיוֹן  משקאות", doc_id="d", title="t")
+    sub = regdoc["sections"][0]["subsections"][0]
+    assert sub["content"] == "רִישְׁיוֹן  משקאות "
+    assert sub["content_norm"] == "רישיונ משקאות"
@@ -0,0 +1,70 @@
+# backend/tests/test_regdoc_ingest.py
+"""
+Tests for incremental regdoc re-ingestion.
+"""
+
+import json
+
+from backend.core.regdoc_features import build_feature_index, feature_index_path
+from backend.core.regdoc_ingest import changes_path, diff_regdocs, ingest_regdoc
+from backend.core.regulation_parser import parse_to_json
+
+EDITION_1 = """פרק 1 - כללי
+1.1 הגדרות
+עסק עד 50 מקומות
+1.2 רישוי
+רישיון משקאות
+פרק 2 - כבאות
+2.1 ציוד
+מטפי כיבוי
+"""
+
+# 1.2 modified, 1.3 added, chapter 2 unchanged
+EDITION_2 = """פרק 1 - כללי
+1.1 הגדרות
+עסק עד 50 מקומות
+1.2 רישוי
+רישיון משקאות בתוקף
+1.3 שילוט
+שלט בכניסה
+פרק 2 - כבאות
+2.1 ציוד
+מטפי כיבוי
+"""
+
+
+def test_diff_regdocs_reports_subsection_and_chapter_changes():
+    old = parse_to_json(EDITION_1, doc_id="d", title="t")
+    new = parse_to_json(EDITION_2, doc_id="d", title="t")
+
+    changes = diff_regdocs(old, new)
+    assert (changes["added"], changes["removed"], changes["modified"]) == (["1-1.3"], [], ["1-1.2"])
+    assert changes["unchanged"] == 2
+    assert changes["sections"] == {"added": [], "removed": [], "modified": ["1"]}
+
+    assert diff_regdocs(new, old)["removed"] == ["1-1.3"]
+
+
+def test_ingest_rewrites_only_when_changed(tmp_path):
+    regdoc_path = tmp_path / "reg.json"
+
+    first = ingest_regdoc(EDITION_1, regdoc_path, doc_id="d", title="t")
+    assert first["written"] and not first["previous_edition"]
+    assert first["added"] == ["1-1.1", "1-1.2", "2-2.1"]
+
+    # Same edition again: nothing is rewritten
+    mtime = regdoc_path.stat().st_mtime_ns
+    again = ingest_regdoc(EDITION_1, regdoc_path, doc_id="d", title="t")
+    assert not again["written"]
+    assert again["unchanged"] == 3
+    assert regdoc_path.stat().st_mtime_ns == mtime
+
+    second = ingest_regdoc(EDITION_2, regdoc_path, doc_id="d", title="t")
+    assert second["written"]
+    assert json.loads(changes_path(regdoc_path).read_text(encoding="utf-8"))["modified"] == ["1-1.2"]
+
+    # The stored files are what a full rebuild would produce
+    stored = json.loads(regdoc_path.read_text(encoding="utf-8"))
+    assert stored == parse_to_json(EDITION_2, doc_id="d", title="t")
+    index = json.loads(feature_index_path(regdoc_path).read_text(encoding="utf-8"))
+    assert index["subsections"] == build_feature_index(stored)["subsections"]
@@ -0,0 +1,44 @@
+# backend/tests/test_regulation_parser.py
+"""
+Tests for the streaming regulation parser.
+"""
+
+from backend.core.regulation_parser import iter_sections, parse_to_json
+
+TEXT = """מבוא שאינו שייך לפרק
+פרק 1 - כללי
+1.1 הגדרות
+שורה ראשונה
+   שורה שנייה
+1.2.3 שורת תוכן ממוספרת
+פרק 2 - כבאות
+שורה בלי סעיף
+2.1 - ציוד כיבוי
+עד 50 מקומות
+"""
+
+
+def test_parse_to_json_structure():
+    regdoc = parse_to_json(TEXT, doc_id="d", title="t")
+    assert [s["id"] for s in regdoc["sections"]] == ["1", "2"]
+
+    first, second = regdoc["sections"]
+    # "1.2.3 ..." is read as subsection "1.2" (the subsection pattern comes first)
+    assert [(sub["id"], sub["title"], sub["content"]) for sub in first["subsections"]] == [
+        ("1.1", "הגדרות", "שורה ראשונה שורה שנייה "),
+        ("1.2", "3 שורת תוכן ממוספרת", ""),
+    ]
+    assert second["subsections"] == [{
+        "id": "2.1", "title": "ציוד כיבוי", "content": "עד 50 מקומות ", "content_norm": "עד 50 מקומות"
+    }]
+
+
+def test_sections_stream_from_pages():
+    pages = TEXT.split("פרק 2")
+    pages[1] = "פרק 2" + pages[1]
+    sections = iter_sections(iter(pages))
+
+    # The first section is complete as soon as the next one starts
+    assert next(sections)["id"] == "1"
+    assert [s["id"] for s in sections] == ["2"]
+    assert parse_to_json(pages, doc_id="d", title="t") == parse_to_json(TEXT, doc_id="d", title="t")
@@ -0,0 +1,48 @@
+# backend/tests/test_report_generator.py
+"""
+Tests for report generation from match files and the /report-from-file route.
+"""
+
+import json
+
+from backend.core import report_generator
+from backend.routes import report as report_route
+from backend.utils import llm_client
+from backend.utils.llm_client import resolve_model
+
+
+def test_resolve_model():
+    assert resolve_model(None, "google") == ("google", None)
+    assert resolve_model("openai", "google") == ("openai", None)
+    assert resolve_model("gpt-4", "google") == ("openai", "gpt-4")
+    assert resolve_model("gemini-1.5-flash", "ollama") == ("google", "gemini-1.5-flash")
+    assert resolve_model("llama3.2", "google") == ("ollama", "llama3.2")
+
+
+def test_chain_reports_the_model_it_calls(tmp_path, monkeypatch):
+    prompt = tmp_path / "prompt.yaml"
+    prompt.write_text("system: s\nuser: '{json_input}'\n", encoding="utf-8")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    for provider, model, expected in (("ollama", "mistral", "mistral"), ("ollama", None, llm_client.OLLAMA_MODEL),
+                                      ("openai", "gpt-4", "gpt-4"), ("openai", None, llm_client.OPENAI_MODEL)):
+        chain, _ = llm_client._build_chain(prompt, {}, provider, model, verbose=False)
+        assert llm_client._model_name(chain) == expected
+
+
+def test_report_from_file_uses_the_requested_model(client, tmp_path, monkeypatch):
+    (tmp_path / "match_cafe.json").write_text(
+        json.dumps({"profile": {"business_name": "קפה"}, "matches": []}, ensure_ascii=False), encoding="utf-8"
+    )
+    monkeypatch.setattr(report_route, "DATA_DIR", tmp_path)
+    calls = []
+
+    async def fake_llm(yaml_path, json_input, provider, verbose, model):
+        calls.append((provider, model))
+        return f"דוח עבור {json_input['business_profile']['business_name']}"
+
+    monkeypatch.setattr(report_generator, "acall_llm_with_yaml_prompt", fake_llm)
+    response = client.post("/api/v1/report-from-file", json={"filename": "match_cafe.json", "model": "gpt-4"})
+    assert response.status_code == 200 and response.json()["report"] == "דוח עבור קפה"
+    assert client.post("/api/v1/report-from-file", json={"filename": "match_cafe.json"}).status_code == 200
+    assert calls == [("openai", "gpt-4"), (report_generator.REPORT_PROVIDER, None)]
+    assert client.post("/api/v1/report-from-file", json={"filename": "missing.json"}).status_code == 404
@@ -0,0 +1,62 @@
+# backend/tests/test_source_cache.py
+"""
+Tests for the content-addressed cache of extracted and parsed sources.
+"""
+
+import json
+import shutil
+
+from docx import Document
+
+from backend.core import source_cache
+from backend.core.source_cache import SourceCache
+
+
+def _write_source(path, *lines):
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+    return path
+
+
+def test_sources_are_extracted_and_parsed_once(tmp_path, monkeypatch):
+    source = _write_source(tmp_path / "reg.docx", "פרק 1 - כללי", "1.1 רישוי", "רישיון משקאות")
+    cache = SourceCache(tmp_path / "cache")
+
+    first = cache.get_or_build(source)
+    assert not first.hit
+    regdoc = json.loads(first.regdoc_path.read_text(encoding="utf-8"))
+    assert regdoc["sections"][0]["id"] == "1"
+    assert regdoc["docId"] == f"src-{first.key[:16]}"  # distinct per source content
+    assert first.text_path.read_text(encoding="utf-8") == "פרק 1 - כללי\n1.1 רישוי\nרישיון משקאות"
+
+    # Same content under another name: no extraction at all
+    monkeypatch.setattr(source_cache, "iter_pages", lambda path: 1 / 0)
+    copy = shutil.copy(source, tmp_path / "renamed.docx")
+    meta = (cache.root / first.key / "meta.json").read_bytes()
+    again = cache.get_or_build(copy)
+    assert again.hit and again.regdoc_path == first.regdoc_path
+    assert (cache.root / first.key / "meta.json").read_bytes() == meta  # hits only bump the mtime
+
+    # A parser change invalidates the entry
+    monkeypatch.setattr(source_cache, "PARSER_VERSION", "test")
+    assert cache.key(source) != first.key
+    assert [entry["key"] for entry in cache.entries()] == [first.key]
+
+
+def test_least_recently_used_entries_are_evicted_and_purged(tmp_path):
+    sources = [_write_source(tmp_path / f"reg{i}.docx", f"פרק {i} - כללי", f"{i}.1 סעיף") for i in range(3)]
+    cache = SourceCache(tmp_path / "cache", max_bytes=None)
+    keys = [cache.get_or_build(source).key for source in sources]
+    cache.get_or_build(sources[0])  # most recently used
+
+    # One entry over budget
+    entries = cache.entries()
+    cache.max_bytes = sum(entry["bytes"] for entry in entries) - entries[0]["bytes"]
+    cache._evict(keep=keys[0])
+    assert [entry["key"] for entry in cache.entries()] == [keys[2], keys[0]]
+    assert cache.stats()["evictions"] == 1
+
+    assert cache.purge(keys[2]) == 1
+    assert cache.purge() == 1 and cache.entries() == []
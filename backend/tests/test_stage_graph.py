@@ -0,0 +1,158 @@
+# backend/tests/test_stage_graph.py
+"""
+Tests for the stage graph executor and the checkpointed pipeline built on it.
+"""
+
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from backend.core import full_pipeline
+from backend.core.regdoc_features import save_regdoc
+from backend.core.stage_graph import Stage, StageFailed, StageGraph, read_run
+
+
+class Number(BaseModel):
+    value: int
+
+
+def _graph(calls, fail=()):
+    def stage(name, compute):
+        def run(params, deps):
+            calls.append(name)
+            if name in fail:
+                raise RuntimeError(f"{name} broke")
+            return Number(value=compute(params, deps))
+        return run
+
+    return StageGraph([
+        Stage("total", Number, stage("total", lambda p, d: d["a"].value + d["b"].value), ["a", "b"]),
+        Stage("a", Number, stage("a", lambda p, d: p["a"])),
+        Stage("b", Number, stage("b", lambda p, d: p["b"])),
+    ])
+
+
+def test_failed_runs_resume_from_checkpoints(tmp_path):
+    calls = []
+    with pytest.raises(StageFailed) as failure:
+        _graph(calls, fail={"total"}).run(tmp_path, {"a": 1, "b": 2})
+    assert failure.value.stage == "total" and calls == ["a", "b", "total"]
+    summary = read_run(tmp_path)
+    assert summary["status"] == "failed" and summary["stages"]["total"]["status"] == "failed"
+
+    calls.clear()
+    outputs = _graph(calls).run(tmp_path, {"a": 1, "b": 2})
+    assert outputs["total"].value == 3 and calls == ["total"]
+    stages = read_run(tmp_path)["stages"]
+    assert [stages[name]["status"] for name in ("a", "b", "total")] == ["reused", "reused", "completed"]
+    assert {"wall_s", "cpu_s"} <= set(stages["total"])
+
+    # Re-running a stage re-runs everything downstream of it, from the new parameters
+    calls.clear()
+    assert _graph(calls).run(tmp_path, {"a": 10, "b": 2}, resume_from="a")["total"].value == 12
+    assert calls == ["a", "total"]
+
+
+def test_async_run_awaits_async_stages_and_checkpoints(tmp_path):
+    calls = []
+
+    async def atotal(params, deps):
+        calls.append("atotal")
+        await asyncio.sleep(0)
+        return Number(value=deps["a"].value * deps["b"].value)
+
+    graph = _graph(calls)
+    graph.stages["total"].arun = atotal
+    outputs = asyncio.run(graph.arun(tmp_path, {"a": 3, "b": 4}))
+    assert outputs["total"].value == 12 and sorted(calls) == ["a", "atotal", "b"]
+    assert read_run(tmp_path)["status"] == "completed"
+
+    # Checkpoints are shared with the synchronous executor
+    calls.clear()
+    assert _graph(calls).run(tmp_path, {"a": 3, "b": 4})["total"].value == 12 and calls == []
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", Number, None, ["b"]), Stage("b", Number, None, ["a"])])
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", Number, None, ["missing"])])
+
+
+def test_pipeline_retries_only_the_report(client, tmp_path, monkeypatch):
+    regdoc_path = tmp_path / "reg.json"
+    save_regdoc({"docId": "d", "title": "t", "sections": [{"id": "1", "title": "משטרה", "subsections": [
+        {"id": "1.1", "title": "", "content": "רישיון משקאות"}]}]}, regdoc_path)
+    monkeypatch.setattr(full_pipeline.DOCUMENT_REGISTRY, "root", tmp_path / "documents")
+    full_pipeline.DOCUMENT_REGISTRY.register(regdoc_path, "reg-test")
+    monkeypatch.setattr(full_pipeline, "REPORT_DIR", tmp_path / "reports")
+
+    def llm_down(profile, rules):
+        raise ConnectionError("LLM unavailable")
+
+    monkeypatch.setattr(full_pipeline, "generate_llm_report", llm_down)
+    with pytest.raises(ConnectionError):
+        full_pipeline.run_pipeline(profile={"has_alcohol": True}, doc_id="reg-test", output_dir=str(tmp_path),
+                                   run_id="run1")
+    assert not (tmp_path / "matches").exists()  # side outputs are only written for complete runs
+
+    matched = []
+    monkeypatch.setattr(full_pipeline, "iter_regdoc_matches", lambda *args: matched.append(args) or [])
+
+    def report(profile, rules):
+        return f"{len(rules)} rules for {sorted(profile)}"
+
+    monkeypatch.setattr(full_pipeline, "generate_llm_report", report)
+    result = full_pipeline.resume_pipeline("run1", output_dir=str(tmp_path))
+    assert not matched  # regulation, profile and match came from checkpoints
+    assert result.report_text == "1 rules for ['has_alcohol']"
+    assert read_run(tmp_path / "runs" / "run1")["stages"]["match"]["status"] == "reused"
+    saved = json.loads((tmp_path / "matches" / "match_run1.json").read_text(encoding="utf-8"))
+    assert saved["matches"] == result.matches and saved["total_matches"] == 1
+    assert (tmp_path / "reports" / "report_run1.txt").read_text(encoding="utf-8") == result.report_text
+
+    summary = client.get("/api/v1/pipeline/runs/run1", params={"output_dir": str(tmp_path)}).json()
+    assert summary["status"] == "completed" and summary["stages"]["report"]["status"] == "completed"
+    assert client.get("/api/v1/pipeline/runs/nope", params={"output_dir": str(tmp_path)}).status_code == 404
+
+    # The API resumes through the async pipeline, awaiting the report stage
+    async def areport(profile, rules):
+        return "async " + report(profile, rules)
+
+    monkeypatch.setattr(full_pipeline, "agenerate_llm_report", areport)
+    response = client.post("/api/v1/pipeline/resume",
+                           json={"run_id": "run1", "resume_from": "report", "output_dir": str(tmp_path)})
+    assert response.status_code == 200 and response.json()["run_id"] == "run1"
+    assert not matched
+    # The returned report path already holds the new report
+    with open(response.json()["report_path"], encoding="utf-8") as f:
+        assert f.read().startswith("async ")
+
+
+def test_json_route_keeps_stage_outputs_in_memory(client, tmp_path, monkeypatch):
+    regdoc_path = tmp_path / "reg.json"
+    save_regdoc({"docId": "d", "title": "t", "sections": [{"id": "1", "title": "משטרה", "subsections": [
+        {"id": "1.1", "title": "", "content": "רישיון משקאות"}]}]}, regdoc_path)
+    monkeypatch.setattr(full_pipeline.DOCUMENT_REGISTRY, "root", tmp_path / "documents")
+    full_pipeline.DOCUMENT_REGISTRY.register(regdoc_path, "reg-test")
+    monkeypatch.setattr(full_pipeline, "REPORT_DIR", tmp_path / "reports")
+
+    async def areport(profile, rules):
+        return f"{profile['business_name']}: {[rule['authority'] for rule in rules]}"
+
+    monkeypatch.setattr(full_pipeline, "agenerate_llm_report", areport)
+    profile = {"business_name": "בר", "area_sqm": 50, "num_seats": 20, "has_alcohol": True}
+    body = {"profile": profile, "doc_id": "reg-test", "output_dir": str(tmp_path), "save_outputs": False}
+    response = client.post("/api/v1/pipeline/run_json", json=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["report_text"] == "בר: ['משטרה']" and data["report_path"] is None
+    # Nothing is written by default: no side outputs, no checkpoints
+    assert not (tmp_path / "matches").exists() and not (tmp_path / "reports").exists()
+    assert not (tmp_path / "runs").exists()
+
+    # Checkpoints are opt-in, e.g. to resume the run later
+    data = client.post("/api/v1/pipeline/run_json", json={**body, "checkpoint": True}).json()
+    assert read_run(tmp_path / "runs" / data["run_id"])["status"] == "completed"
@@ -1,8 +1,11 @@
+import asyncio
 import os
 import json
 import yaml
 import time
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
 from langchain_core.prompts import ChatPromptTemplate
@@ -22,6 +25,10 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 GOOGLE_MODEL = os.getenv("GOOGLE_MODEL", "gemini-pro")
 
+PROVIDERS = ("ollama", "openai", "google")
+# Provider of a model, by model-name prefix; other names are taken to be local Ollama models
+MODEL_PREFIXES = {"gpt-": "openai", "o1": "openai", "o3": "openai", "gemini": "google"}
+
 
 def load_prompt_from_yaml(yaml_path: Path) -> dict:
     """Load system & user prompts from YAML file."""
@@ -32,66 +39,114 @@ def load_prompt_from_yaml(yaml_path: Path) -> dict:
     return prompt_data
 
 
-def get_llm(provider: str):
-    """Return the right LLM object based on provider name."""
+def resolve_model(model: Optional[str], provider: str = PROVIDER) -> Tuple[str, Optional[str]]:
+    """
+    Turn a requested "provider or model name" into (provider, model name).
+
+    None keeps `provider` with its default model; a provider name selects that
+    provider's default model; a model name selects its provider (see MODEL_PREFIXES).
+    """
+    if model is None:
+        return provider, None
+    if model in PROVIDERS:
+        return model, None
+    for prefix, model_provider in MODEL_PREFIXES.items():
+        if model.startswith(prefix):
+            return model_provider, model
+    return "ollama", model
+
+
+def get_llm(provider: str, model: Optional[str] = None):
+    """Return the right LLM object based on provider name (and model name, default: from .env)."""
     if provider == "ollama":
-        return ChatOllama(model=OLLAMA_MODEL, temperature=0.7)
+        return ChatOllama(model=model or OLLAMA_MODEL, temperature=0.7)
     elif provider == "openai":
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise EnvironmentError("❌ Missing OPENAI_API_KEY in .env")
-        return ChatOpenAI(model=OPENAI_MODEL, temperature=0.7, api_key=api_key)
+        return ChatOpenAI(model=model or OPENAI_MODEL, temperature=0.7, api_key=api_key)
     elif provider == "google":
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise EnvironmentError("❌ Missing GOOGLE_API_KEY in .env")
-        return ChatGoogleGenerativeAI(model=GOOGLE_MODEL, temperature=0.7, google_api_key=api_key)
+        return ChatGoogleGenerativeAI(model=model or GOOGLE_MODEL, temperature=0.7, google_api_key=api_key)
     else:
         raise ValueError(f"❌ Unsupported provider: {provider}")
 
 
-def call_llm_with_yaml_prompt(
-    yaml_path: Path,
-    json_input: dict,
-    provider: str = PROVIDER,
-    verbose: bool = True
-) -> str:
-    """Call chosen provider LLM using LangChain prompt."""
-
-    # נבנה JSON יפה
-    formatted_input = json.dumps(json_input, ensure_ascii=False, indent=2)
-    prompt_data = load_prompt_from_yaml(yaml_path)
-
-    system_prompt = prompt_data["system"]
-    user_prompt = prompt_data["user"]  # נשאיר את {json_input} בלי להחליף
+@lru_cache(maxsize=32)
+def _cached_chain(yaml_path: str, mtime_ns: int, provider: str, model: Optional[str]):
+    """Build the prompt | llm | parser chain once per prompt file version, provider and model."""
+    prompt_data = load_prompt_from_yaml(Path(yaml_path))
 
     # בונים את ה־prompt עם placeholder אמיתי
     prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        ("user", user_prompt),
+        ("system", prompt_data["system"]),
+        ("user", prompt_data["user"]),  # נשאיר את {json_input} בלי להחליף
     ])
+    return prompt | get_llm(provider, model) | StrOutputParser(), prompt_data
+
+
+def _model_name(chain) -> str:
+    """Name of the model the chain's LLM object actually calls."""
+    llm = chain.steps[1]
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or "Unknown"
+
 
-    llm = get_llm(provider)
-    chain = prompt | llm | StrOutputParser()
+def _build_chain(yaml_path: Path, json_input: dict, provider: str, model: Optional[str], verbose: bool):
+    """Return the (cached) chain and its input for a YAML prompt; an edited prompt file is reloaded."""
+
+    # נבנה JSON יפה
+    formatted_input = json.dumps(json_input, ensure_ascii=False, indent=2)
+    chain, prompt_data = _cached_chain(str(yaml_path), os.stat(yaml_path).st_mtime_ns, provider, model)
+    system_prompt = prompt_data["system"]
+    user_prompt = prompt_data["user"]
 
     if verbose:
         print("🔧 Debug: Provider =", provider)
-        print("🔧 Debug: Using model =",
-              OLLAMA_MODEL if provider == "ollama" else
-              OPENAI_MODEL if provider == "openai" else
-              GOOGLE_MODEL if provider == "google" else "Unknown")
+        print("🔧 Debug: Using model =", _model_name(chain))
         print("🔧 Debug: Final System Prompt:\n", system_prompt)
         print("🔧 Debug: Final User Prompt Template:\n", user_prompt)
         print("🔧 Debug: Injected JSON Input:\n", formatted_input)
 
-    # מעבירים את המשתנה ל־invoke
-    start_time = time.time()
-    result = chain.invoke({"json_input": formatted_input})
-    duration = time.time() - start_time
+    return chain, {"json_input": formatted_input}
+
 
+def _log_result(provider: str, result: str, duration: float, verbose: bool) -> str:
     if verbose:
         print(f"✅ LLM call successful via {provider}")
         print(f"⏱️ Duration: {duration:.2f}s")
         print("📄 LLM Raw Output:\n", result)
-
     return result.strip()
+
+
+def call_llm_with_yaml_prompt(
+    yaml_path: Path,
+    json_input: dict,
+    provider: str = PROVIDER,
+    verbose: bool = True,
+    model: Optional[str] = None
+) -> str:
+    """Call chosen provider LLM (and model, default: from .env) using LangChain prompt."""
+    chain, inputs = _build_chain(yaml_path, json_input, provider, model, verbose)
+
+    # מעבירים את המשתנה ל־invoke
+    start_time = time.time()
+    result = chain.invoke(inputs)
+    return _log_result(provider, result, time.time() - start_time, verbose)
+
+
+async def acall_llm_with_yaml_prompt(
+    yaml_path: Path,
+    json_input: dict,
+    provider: str = PROVIDER,
+    verbose: bool = True,
+    model: Optional[str] = None
+) -> str:
+    """Async variant of `call_llm_with_yaml_prompt` (LangChain `ainvoke`; does not block the event loop)."""
+    # Only the first call per prompt and provider builds the chain (file read, client set-up): do it off the loop
+    chain, inputs = await asyncio.to_thread(_build_chain, yaml_path, json_input, provider, model, verbose)
+
+    start_time = time.time()
+    result = await chain.ainvoke(inputs)
+    return _log_result(provider, result, time.time() - start_time, verbose)